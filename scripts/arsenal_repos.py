@@ -0,0 +1,21 @@
+"""
+The Arsenal repositories and their local clones, shared by the README
+updater and the link audit. Repos with a marker get the ecosystem section
+in their README; the others are only scanned for links.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict
+
+# Configuration
+REPOS_CONFIG_FILE = Path(__file__).with_name('ecosystem-repos.json')
+
+def load_repos_config(path: Path = REPOS_CONFIG_FILE) -> Dict:
+    """Load {'owner': ..., 'repos': {name: {'path': ..., 'marker': ...}}}; marker is optional."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def readme_repos(config: Dict) -> Dict[str, Dict]:
+    """The repositories whose README carries the ecosystem section (those with a marker)."""
+    return {name: repo for name, repo in config['repos'].items() if repo.get('marker')}
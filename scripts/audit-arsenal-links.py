@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Audit markdown links across the local Arsenal clones: backlinks, orphans
+and dangling links from an incrementally updated link graph.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from arsenal_repos import REPOS_CONFIG_FILE, load_repos_config
+from link_graph import LinkGraph, LinkResolver, load_graph_index, save_graph_index, update_graph
+from output_writer import OutputWriter
+
+# Configuration
+GRAPH_INDEX_FILE = Path(__file__).with_name('link-graph-index.json')
+
+output_writer = OutputWriter()
+
+def print_report(graph: LinkGraph, repos: List[str]) -> None:
+    """Summary counts and the repo-to-repo link matrix."""
+    matrix = graph.repo_matrix()
+    print("🕸️  LINK GRAPH")
+    print("=" * 70)
+    print(f"📄 Markdown files:  {len(graph.files)}")
+    print(f"🔗 Internal links:  {sum(len(entry['links']) for entry in graph.files.values())}")
+    print(f"🌐 External links:  {sum(entry['external'] for entry in graph.files.values())}")
+    print(f"🏝️  Orphans:         {len(graph.orphans())}")
+    print(f"💔 Dangling links:  {len(graph.dangling())}")
+    print()
+    
+    print("🔀 REPO → REPO LINKS")
+    print("=" * 70)
+    for source in repos:
+        row = matrix.get(source, {})
+        targets = ', '.join(f"{target} {count}" for target, count in sorted(row.items(), key=lambda x: -x[1]))
+        print(f"{source:28s} {targets or '(none)'}")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Audit links across the Arsenal repositories.")
+    parser.add_argument('--config', default=REPOS_CONFIG_FILE, metavar='PATH',
+                        help="JSON file listing the repositories (default: %(default)s)")
+    parser.add_argument('--index', default=GRAPH_INDEX_FILE, metavar='PATH',
+                        help="saved link graph, rescanned incrementally (default: %(default)s)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('scan', help="update the graph and print a summary (default)")
+    backlinks = commands.add_parser('backlinks', help="list the files that link to a file")
+    backlinks.add_argument('target', help="repo:path, a GitHub URL or a local file path")
+    commands.add_parser('orphans', help="list markdown files nothing links to")
+    commands.add_parser('dangling', help="list links to files that do not exist")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """Rescan changed files, then run the requested report."""
+    args = parse_args(argv)
+    config = load_repos_config(Path(args.config))
+    repos = {name: repo['path'] for name, repo in config['repos'].items()}
+    index_path = Path(args.index)
+    
+    start = time.perf_counter()
+    index = load_graph_index(index_path)
+    counts = update_graph(index, repos, config['owner'])
+    save_graph_index(index_path, index, output_writer)
+    graph = LinkGraph(index)
+    elapsed = time.perf_counter() - start
+    
+    if not args.json:
+        print(f"📂 Scanned {counts['files']} files in {len(repos) - counts['missing_repos']}/{len(repos)} repos "
+              f"({counts['parsed']} markdown files re-parsed, {counts['removed']} removed) in {elapsed:.2f}s")
+        if counts['missing_repos']:
+            missing = [name for name, path in repos.items() if name not in index['paths']]
+            print(f"⚠️  Not found locally: {', '.join(missing)}")
+        print()
+    
+    if args.command == 'backlinks':
+        target = LinkResolver(repos, config['owner']).lookup(args.target)
+        if target is None:
+            raise SystemExit(f"❌ {args.target} is not in any configured repository")
+        results = [{'source': source, 'line': line} for source, line in graph.backlinks(target)]
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+        print(f"↩️  {len(results)} backlinks to {target}")
+        for r in results:
+            print(f"   {r['source']}:{r['line']}")
+    elif args.command == 'orphans':
+        results = graph.orphans()
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+        print(f"🏝️  {len(results)} orphaned markdown files")
+        for node in results:
+            print(f"   {node}")
+    elif args.command == 'dangling':
+        results = [{'source': source, 'line': line, 'target': target} for source, line, target in graph.dangling()]
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+        print(f"💔 {len(results)} dangling links")
+        for r in results:
+            print(f"   {r['source']}:{r['line']} → {r['target']}")
+    else:
+        if args.json:
+            print(json.dumps({'counts': counts, 'orphans': len(graph.orphans()),
+                              'dangling': len(graph.dangling()), 'matrix': graph.repo_matrix()}, indent=2))
+            return
+        print_report(graph, list(repos))
+        print()
+        print(f"💾 Link graph saved to: {index_path}")
+
+if __name__ == "__main__":
+    main()
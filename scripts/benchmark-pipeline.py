@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Benchmark the extraction and generation pipeline on a synthetic corpus.
+Reports per-stage throughput and peak memory as JSON.
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from keyword_taxonomy import compile_classifier, load_taxonomy
+from output_writer import OutputWriter
+from pattern_index import PatternIndex
+from script_loader import load_script
+from synthetic_corpus import ADVERSARIAL_UNITS, write_adversarial, write_corpus
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Configuration
+BENCH_DIR = Path(tempfile.gettempdir()) / 'arsenal-benchmarks'
+RESULTS_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\scripts\benchmark-results.json"
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+STAGES = ['extract', 'dedup', 'classify', 'generate']
+DEFAULT_ADVERSARIAL_SIZES = [10000, 100000, 1000000]
+# Adversarial growth exponent above which parsing counts as superlinear
+MAX_GROWTH = 1.3
+# Keyword counts of the synthetic taxonomies in the classify stage
+DEFAULT_TAXONOMY_SIZES = [400, 800]
+TAXONOMY_CATEGORIES = 20
+
+def process_peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the whole process so far, in MB (None where unavailable).
+
+    This only ever grows across stages and sizes, so it is not a per-stage
+    figure; peak_traced_mb is.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+def measure(stage: Callable[[], int], trace_memory: bool, input_bytes: int = 0) -> Dict:
+    """Run one stage with its output silenced; return timing and memory figures.
+
+    stage returns the number of items it processed and must be safe to run
+    twice. The timed pass runs untraced; with trace_memory, a second pass
+    under tracemalloc gives peak_traced_mb, the stage's own peak of Python
+    allocations, without its overhead landing in the timings.
+    """
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        items = stage()
+        seconds = time.perf_counter() - start
+        
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                stage()
+                peak_traced = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    
+    result = {
+        'items': items,
+        'seconds': round(seconds, 4),
+        'items_per_second': round(items / seconds, 1) if seconds else None,
+        'process_peak_rss_mb': process_peak_rss_mb()
+    }
+    if input_bytes:
+        result['mb_per_second'] = round(input_bytes / (1 << 20) / seconds, 2) if seconds else None
+    if trace_memory:
+        result['peak_traced_mb'] = round(peak_traced / (1 << 20), 2)
+    return result
+
+def keyword_chains(categories: Dict[str, List[str]], fallback: str) -> Callable[[str], str]:
+    """The per-category `any(kw in text ...)` chains compile_classifier replaced."""
+    ordered = [(name, [kw.lower() for kw in keywords]) for name, keywords in categories.items()]
+    
+    def classify(text: str) -> str:
+        text = text.lower()
+        for name, keywords in ordered:
+            if any(kw in text for kw in keywords):
+                return name
+        return fallback
+    
+    return classify
+
+def synthetic_taxonomy(keyword_count: int, seed: int) -> Dict[str, List[str]]:
+    """Categories of random keywords, the real domain keywords spread among them."""
+    rng = random.Random(seed)
+    keywords = [kw for kws in load_taxonomy()['domains']['categories'].values() for kw in kws]
+    while len(keywords) < keyword_count:
+        keywords.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 10))))
+    rng.shuffle(keywords)
+    return {f"category-{i}": keywords[i::TAXONOMY_CATEGORIES] for i in range(TAXONOMY_CATEGORIES)}
+
+def run_classify(records: List[Dict], args: argparse.Namespace) -> Dict:
+    """Time the compiled keyword classifier against the any() chains.
+
+    Texts are what the pipeline classifies: title plus tags of every record
+    and each quick-win pattern. Every taxonomy in keyword-taxonomy.json runs
+    at its current size, plus synthetic ones of args.taxonomy_sizes keywords.
+    """
+    texts = [f"{r.get('title', '')} {', '.join(r.get('tags') or ())}" for r in records]
+    texts.extend(qw['pattern'] for r in records for qw in r.get('quick_wins') or ())
+    taxonomies = {name: (t['categories'], t['fallback']) for name, t in load_taxonomy().items()}
+    for count in args.taxonomy_sizes:
+        taxonomies[f"synthetic-{count}"] = (synthetic_taxonomy(count, args.seed), 'none')
+    
+    results = {'items': len(texts), 'taxonomies': {}}
+    for name, (categories, fallback) in taxonomies.items():
+        timings = {}
+        labels = {}
+        for variant, build in [('chains', keyword_chains), ('compiled', compile_classifier)]:
+            classify = build(categories, fallback)
+            start = time.perf_counter()
+            labels[variant] = [classify(text) for text in texts]
+            timings[variant] = time.perf_counter() - start
+        results['taxonomies'][name] = {
+            'keywords': sum(len(kws) for kws in categories.values()),
+            'chains_seconds': round(timings['chains'], 4),
+            'compiled_seconds': round(timings['compiled'], 4),
+            'speedup': round(timings['chains'] / timings['compiled'], 2) if timings['compiled'] else None,
+            'same_labels': labels['chains'] == labels['compiled']
+        }
+    results['seconds'] = round(sum(t['compiled_seconds'] for t in results['taxonomies'].values()), 4)
+    results['items_per_second'] = (round(len(texts) * len(taxonomies) / results['seconds'], 1)
+                                   if results['seconds'] else None)
+    return results
+
+def run_size(count: int, args: argparse.Namespace, extractor, generator) -> Dict:
+    """Benchmark every selected stage on a corpus of count files."""
+    corpus_dir = Path(args.corpus_dir) / f"seed{args.seed}-n{count}"
+    print(f"📁 Preparing {count} files in {corpus_dir}...")
+    start = time.perf_counter()
+    paths = write_corpus(corpus_dir, count, args.seed)
+    corpus_seconds = time.perf_counter() - start
+    corpus_bytes = sum(path.stat().st_size for path in paths)
+    
+    run = {
+        'files': count,
+        'corpus_bytes': corpus_bytes,
+        'corpus_seconds': round(corpus_seconds, 2),
+        'stages': {}
+    }
+    records: List[Dict] = []
+    
+    # Later stages consume the extracted records, so extraction always runs
+    def extract() -> int:
+        records.clear()
+        records.extend(extractor.iter_extract_files(paths))
+        return len(records)
+    stats = measure(extract, args.trace_memory, corpus_bytes)
+    if 'extract' in args.stages:
+        run['stages']['extract'] = stats
+    
+    if 'dedup' in args.stages:
+        def dedup() -> int:
+            pattern_index = PatternIndex()
+            for record in records:
+                if record.get('extraction_success'):
+                    pattern_index.merge_file(record['filename'], record.get('quick_wins', []))
+            return len(generator.deduplicate_quick_wins(pattern_index, args.similarity))
+        run['stages']['dedup'] = measure(dedup, args.trace_memory)
+        run['stages']['dedup']['patterns_in'] = sum(len(r.get('quick_wins', [])) for r in records)
+    
+    if 'classify' in args.stages:
+        run['stages']['classify'] = run_classify(records, args)
+    
+    if 'generate' in args.stages:
+        prompts = [r for r in records if r.get('quality_score') == 'HIGH' and r.get('super_prompt')]
+        with tempfile.TemporaryDirectory(dir=args.corpus_dir) as output_dir:
+            def generate() -> int:
+                for record in prompts:
+                    generator.create_prompt_file(record, Path(output_dir))
+                return len(prompts)
+            run['stages']['generate'] = measure(generate, args.trace_memory)
+    
+    for name, stats in run['stages'].items():
+        peak = f"  peak {stats['peak_traced_mb']:.1f} MB" if 'peak_traced_mb' in stats else ''
+        print(f"   {name:10s} {stats['items']:>9d} items  {stats['seconds']:>9.2f}s  "
+              f"{stats['items_per_second'] or 0:>10.1f}/s{peak}")
+        for taxonomy, timing in stats.get('taxonomies', {}).items():
+            print(f"      {taxonomy:22s} {timing['keywords']:>5d} keywords  chains {timing['chains_seconds']:.4f}s  "
+                  f"compiled {timing['compiled_seconds']:.4f}s  ×{timing['speedup']}"
+                  f"{'' if timing['same_labels'] else '  ⚠️ labels differ'}")
+    return run
+
+def run_adversarial(sizes: List[int], args: argparse.Namespace, extractor) -> Dict:
+    """Time process_file on the adversarial super-prompts at each size.
+
+    growth is the fitted exponent of time against size between the smallest
+    and largest input: about 1 for linear parsing, 2 for quadratic. Cases
+    above MAX_GROWTH are flagged superlinear.
+    """
+    paths = write_adversarial(Path(args.corpus_dir) / 'adversarial', sizes)
+    cases = {}
+    
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        for path in paths:
+            case, size = path.stem[len('adversarial-'):].rsplit('-', 1)
+            start = time.perf_counter()
+            result = extractor.process_file(path, extractor.FILE_TIME_BUDGET)
+            seconds = time.perf_counter() - start
+            cases.setdefault(case, {'sizes': {}})['sizes'][size] = {
+                'seconds': round(seconds, 5),
+                'over_budget': bool(result.get('time_budget_exceeded'))
+            }
+    
+    for case, data in cases.items():
+        timings = [(int(size), stats['seconds']) for size, stats in data['sizes'].items()]
+        (small, t_small), (large, t_large) = min(timings), max(timings)
+        if large > small and t_small > 0 and t_large > 0:
+            data['growth'] = round(math.log(t_large / t_small) / math.log(large / small), 2)
+        data['max_seconds'] = max(t for _, t in timings)
+        data['superlinear'] = data.get('growth', 0) > MAX_GROWTH
+        print(f"   {case:24s} max {data['max_seconds']:8.4f}s  growth {data.get('growth', 'n/a')}"
+              f"{'  ⚠️ superlinear' if data['superlinear'] else ''}")
+    
+    return {
+        'time_budget': extractor.FILE_TIME_BUDGET,
+        'max_growth': MAX_GROWTH,
+        'bounded': all(not s['over_budget'] for d in cases.values() for s in d['sizes'].values()),
+        'linear': not any(d['superlinear'] for d in cases.values()),
+        'cases': cases
+    }
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Benchmark extraction, dedup and prompt generation on a synthetic corpus.")
+    parser.add_argument('--sizes', default=','.join(str(n) for n in DEFAULT_SIZES[:2]), metavar='N[,N...]',
+                        help="corpus sizes to run (default: %(default)s; up to 1000000; empty to skip)")
+    parser.add_argument('--stages', default=','.join(STAGES), metavar='STAGE[,STAGE...]',
+                        help="stages to time: extract, dedup, classify, generate (default: all)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="corpus generator seed (default: %(default)s)")
+    parser.add_argument('--similarity', type=float, metavar='T',
+                        help="also merge near-duplicate quick wins at this threshold in the dedup stage")
+    parser.add_argument('--taxonomy-sizes', default=','.join(str(n) for n in DEFAULT_TAXONOMY_SIZES),
+                        metavar='N[,N...]',
+                        help="keyword counts of the synthetic taxonomies in the classify stage (default: %(default)s)")
+    parser.add_argument('--corpus-dir', default=BENCH_DIR, metavar='PATH',
+                        help="where generated corpora are kept and reused (default: %(default)s)")
+    parser.add_argument('--adversarial', nargs='?', const=','.join(str(n) for n in DEFAULT_ADVERSARIAL_SIZES),
+                        metavar='CHARS[,CHARS...]',
+                        help="also time the adversarial super-prompt set at these prompt sizes (default: %(const)s)")
+    parser.add_argument('--no-trace-memory', dest='trace_memory', action='store_false',
+                        help="skip the second, traced pass of each stage that measures its memory peak")
+    parser.add_argument('--output', default=RESULTS_FILE, metavar='PATH',
+                        help="JSON results file (default: %(default)s)")
+    args = parser.parse_args(argv)
+    args.sizes = [int(n) for n in args.sizes.split(',') if n]
+    args.taxonomy_sizes = [int(n) for n in args.taxonomy_sizes.split(',') if n]
+    if args.adversarial:
+        args.adversarial = [int(n) for n in args.adversarial.split(',')]
+    if args.similarity is not None and not 0 < args.similarity <= 1:
+        parser.error(f"--similarity must be in (0, 1], got {args.similarity}")
+    args.stages = [s for s in args.stages.split(',') if s]
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+    return args
+
+def main(argv: Optional[List[str]] = None):
+    """Run the benchmark for each corpus size and write the results."""
+    args = parse_args(argv)
+    
+    print("⏱️  PIPELINE BENCHMARK")
+    print("=" * 70)
+    
+    extractor = load_script('extract-all-insights.py')
+    generator = load_script('generate-arsenal-items.py')
+    Path(args.corpus_dir).mkdir(parents=True, exist_ok=True)
+    
+    results = {
+        'benchmark': 'pipeline',
+        'date': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'similarity': args.similarity,
+        'runs': []
+    }
+    
+    for count in args.sizes:
+        results['runs'].append(run_size(count, args, extractor, generator))
+        print()
+    
+    if args.adversarial:
+        print(f"🧨 Adversarial super-prompts ({len(ADVERSARIAL_UNITS)} cases)...")
+        results['adversarial'] = run_adversarial(args.adversarial, args, extractor)
+        print(f"   Bounded within the per-file time budget: {'yes' if results['adversarial']['bounded'] else 'NO'}")
+        print(f"   Growth at most {MAX_GROWTH} in every case: {'yes' if results['adversarial']['linear'] else 'NO'}")
+        print()
+    
+    OutputWriter().write_text(args.output, json.dumps(results, indent=2))
+    
+    print(f"💾 Results saved to: {args.output}")
+    
+    adversarial = results.get('adversarial')
+    if adversarial and not (adversarial['bounded'] and adversarial['linear']):
+        raise SystemExit("❌ Adversarial inputs exceeded the time budget or grew superlinearly")
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,28 @@
 Enhance auto-generated prompts with richer cross-links and related items.
 """
 
-import re
+import argparse
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from insights_core import RELATED_SECTION_PATTERN, RESULT_FOOTER_PATTERN
+from metrics import Metrics
+from output_writer import OutputWriter
+from prompt_recommender import HAVE_NUMPY, RELATED_TOP_K, build_related_index
 
 PROMPT_ARSENAL = Path(r"C:\Users\theca\CascadeProjects\prompt-arsenal")
 
+output_writer = OutputWriter()
+
+# Optional per-prompt timing (--metrics); nothing is wrapped unless enabled
+metrics = Metrics()
+METRICS_FILE = Path(__file__).with_name('enhance-prompt-links.metrics.json')
+
+# Saved TF-IDF related-prompt index (see prompt_recommender.py)
+RELATED_INDEX_FILE = Path(__file__).with_name('related-prompts-index.npz')
+# Set by main when related prompts come from the TF-IDF index
+related_index = None
+
 # Prompts to enhance (12 auto-generated ones)
 AUTO_GENERATED_PROMPTS = [
     "automation/workflow/prompt-insights-zapier-mcp-tools-thread.md",
@@ -25,7 +41,7 @@ AUTO_GENERATED_PROMPTS = [
     "ai-prompting/analysis/super-prompt-forensics-opportunity-audit.md",
 ]
 
-# Related prompts by category
+# Related prompts by category (static fallback without NumPy, or --related static)
 RELATED_PROMPTS = {
     "automation": [
         ("Zapier MCP Tools", "automation/workflow/prompt-insights-zapier-mcp-tools-thread.md"),
@@ -46,7 +62,10 @@ RELATED_PROMPTS = {
 }
 
 def get_related_prompts(prompt_path: str) -> List[tuple]:
-    """Get related prompts based on the prompt's category."""
+    """Get related prompts from the TF-IDF index, or by category without one."""
+    if related_index is not None:
+        return [(title, path) for title, path, _ in related_index.related(prompt_path)]
+    
     related = []
     
     if "automation" in prompt_path:
@@ -59,7 +78,7 @@ def get_related_prompts(prompt_path: str) -> List[tuple]:
     # Remove self from related
     related = [(name, path) for name, path in related if path != prompt_path]
     
-    return related[:4]  # Max 4 related prompts
+    return related[:RELATED_TOP_K]  # Max 4 related prompts
 
 def create_enhanced_related_section(prompt_path: str) -> str:
     """Create enhanced 'Related Arsenal Items' section."""
@@ -72,7 +91,7 @@ def create_enhanced_related_section(prompt_path: str) -> str:
 
 ### 📝 Related Prompts
 """
-    
+
     for name, path in related_prompts:
         section += f"- **[{name}](https://github.com/ChrisTansey007/prompt-arsenal/blob/main/{path})** - Complementary prompt pattern\n"
     
@@ -90,7 +109,7 @@ def create_enhanced_related_section(prompt_path: str) -> str:
 - **[Arsenal CLI](https://github.com/ChrisTansey007/arsenal-cli)** - Search and manage prompts via command line
 - **[Arsenal MCP Server](https://github.com/ChrisTansey007/arsenal-mcp-server)** - Access prompts via Model Context Protocol
 """
-    
+
     return section
 
 def enhance_prompt(prompt_path: Path) -> bool:
@@ -108,29 +127,56 @@ def enhance_prompt(prompt_path: Path) -> bool:
         return False
     
     # Find the existing "Related Arsenal Items" section
-    pattern = r'## 🔗 Related Arsenal Items.*?(?=\n---|\n## |\Z)'
-    match = re.search(pattern, content, re.DOTALL)
+    match = RELATED_SECTION_PATTERN.search(content)
     
     if not match:
         # No existing section, add at end before final notes
-        pattern = r'(---\n\n\*\*Result:.*?\*\* 🚀)'
-        replacement = create_enhanced_related_section(str(prompt_path.relative_to(PROMPT_ARSENAL))) + r'\n\n---\n\n\1'
-        content = re.sub(pattern, replacement, content)
+        replacement = create_enhanced_related_section(prompt_path.relative_to(PROMPT_ARSENAL).as_posix()) + r'\n\n---\n\n\1'
+        content = RESULT_FOOTER_PATTERN.sub(replacement, content)
     else:
         # Replace existing section
-        enhanced_section = create_enhanced_related_section(str(prompt_path.relative_to(PROMPT_ARSENAL)))
-        content = re.sub(pattern, enhanced_section.strip(), content, flags=re.DOTALL)
+        enhanced_section = create_enhanced_related_section(prompt_path.relative_to(PROMPT_ARSENAL).as_posix())
+        content = RELATED_SECTION_PATTERN.sub(enhanced_section.strip(), content)
     
-    # Write back
-    with open(prompt_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    return True
+    # Write back (atomically, skipped if nothing changed)
+    return output_writer.write_text(prompt_path, content)
+
+def enable_metrics() -> None:
+    """Time section building and each prompt enhancement."""
+    metrics.instrument(globals(), ['get_related_prompts', 'create_enhanced_related_section', 'enhance_prompt'],
+                       items={'enhance_prompt': lambda prompt_path: prompt_path.name})
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Enhance auto-generated prompts with richer cross-links.")
+    parser.add_argument('--metrics', nargs='?', const=str(METRICS_FILE), metavar='PATH',
+                        help="record per-prompt timings to PATH (default: %(const)s)")
+    parser.add_argument('--related', choices=['auto', 'tfidf', 'static'], default='auto',
+                        help="related prompts from the TF-IDF index over the whole arsenal (needs NumPy) "
+                             "or the static RELATED_PROMPTS lists; auto uses TF-IDF when NumPy is installed")
+    parser.add_argument('--index', default=str(RELATED_INDEX_FILE), metavar='PATH',
+                        help="saved TF-IDF index, updated incrementally (default: %(default)s)")
+    parser.add_argument('--refit', action='store_true',
+                        help="rebuild the TF-IDF vocabulary and index from scratch")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     """Enhance all auto-generated prompts."""
+    global related_index
+    args = parse_args(argv)
+    if args.related == 'tfidf' and not HAVE_NUMPY:
+        raise SystemExit("❌ --related tfidf needs NumPy (pip install numpy)")
+    if args.metrics:
+        enable_metrics()
+    
     print("🔗 ENHANCING AUTO-GENERATED PROMPTS")
     print("=" * 70)
+    if args.related == 'static' or not HAVE_NUMPY:
+        print("🗂️  Related prompts: static RELATED_PROMPTS lists")
+    else:
+        related_index, stats = build_related_index(PROMPT_ARSENAL, Path(args.index), output_writer, refit=args.refit)
+        action = "refitted" if stats['refit'] else f"{stats['changed']} new or changed, {stats['removed']} removed"
+        print(f"🧮 Related prompts: TF-IDF over {stats['prompts']} prompts ({action}, {stats['rescored']} rescored)")
     print(f"📁 Processing {len(AUTO_GENERATED_PROMPTS)} prompts...\n")
     
     enhanced_count = 0
@@ -150,6 +196,10 @@ def main():
     print("=" * 70)
     print(f"✅ Enhanced: {enhanced_count}")
     print(f"⏭️  Skipped: {skipped_count}")
+    print(f"💾 {output_writer.summary()}")
+    if metrics.enabled:
+        metrics.write(Path(args.metrics), 'enhance-prompt-links', output_writer)
+        print(f"⏱️  Timing metrics saved to: {args.metrics}")
     print(f"\n📋 Next steps:")
     print(f"1. Review enhanced prompts in prompt-arsenal")
     print(f"2. Commit changes:")
@@ -4,301 +4,196 @@ Comprehensive extraction of super-prompts and quick wins from all insights files
 Phase 2: Full automated extraction with quality scoring.
 """
 
+import argparse
+import bisect
+import hashlib
+import heapq
+import io
 import os
-import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import json
 from datetime import datetime
 
+from insights_core import (
+    LESSONS_HEADINGS, NUMBERED_ITEM_PATTERN, PROMPT_FENCE_LANGUAGES, SUPER_PROMPT_HEADINGS,
+    Document, TimeBudgetExceeded, check_deadline, count_words, extract_section, find_code_block, find_section, frontmatter_text,
+    iter_extraction_records, iter_json_array, open_document, parse_document, parse_quick_wins,
+    parse_super_prompt_fields, parse_tags, slice_text, tokenize_document,
+)
+import insights_core
+from extraction_records import FileRecord, compact_record, json_default
+from feature_store import (
+    HAVE_NUMPY, FeatureStore, feature_row, features_path, quality_features, quality_tier, score_features,
+)
+from file_watcher import POLL_INTERVAL, iter_batches, open_watcher, scan, wait_for_directory
+from keyword_taxonomy import TAXONOMY_FILE, load_classifier
+from metrics import Metrics, metrics_path
+from output_writer import OutputWriter
+
 # Configuration
 INSIGHTS_DIR = r"C:\Users\theca\CascadeProjects\chriscreateswithai-nextjs\content\prompt-insights"
 OUTPUT_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\scripts\all-extracted-data.json"
+# Per-file extraction time budget in seconds (0 = unlimited); see --time-budget
+FILE_TIME_BUDGET = 10.0
+CACHE_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\scripts\.extraction-cache.json"
 
-def extract_frontmatter(content: str) -> Dict:
-    """Extract YAML frontmatter."""
-    match = re.search(r'^---\s*\n(.*?)\n---', content, re.DOTALL)
-    if not match:
-        return {}
-    
-    frontmatter = {}
-    for line in match.group(1).split('\n'):
-        if ':' in line:
-            key, value = line.split(':', 1)
-            frontmatter[key.strip()] = value.strip().strip("'\"")
-    
-    return frontmatter
+# Source files whose contents determine extraction results (cache fingerprint)
+EXTRACTOR_SOURCES = [
+    Path(__file__),
+    Path(__file__).with_name('insights_core.py'),
+    Path(__file__).with_name('extraction_records.py'),
+    Path(__file__).with_name('feature_store.py'),
+    Path(__file__).with_name('keyword_taxonomy.py'),
+    TAXONOMY_FILE,
+]
 
-def extract_super_prompt(content: str) -> Optional[Dict]:
+# Domain keywords in priority order (see keyword-taxonomy.json)
+classify_domain = load_classifier('domains')
+
+# Atomic write-if-changed output for every file this script produces
+output_writer = OutputWriter()
+
+# Optional per-stage timing (--metrics); nothing is wrapped unless enabled
+metrics = Metrics()
+
+def extract_super_prompt(content: Document, tokens: Optional[List] = None,
+                         deadline: Optional[float] = None) -> Optional[Dict]:
     """Extract super-prompt with structure parsing."""
-    # Try different section heading patterns
-    patterns = [
-        r'## Section 4: Super-Prompt.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-        r'## 4\) Super-Prompt.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-        r'## 4\. Super-Prompt.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-        r'## Super-Prompt \(Reusable\).*?\n(.*?)(?=\n## |\n---\n|\Z)',
-        r'## Super‑Prompt.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-    ]
-    
-    section_content = None
-    for pattern in patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            section_content = match.group(1).strip()
-            break
+    if tokens is None:
+        tokens = tokenize_document(content)
     
+    section = find_section(tokens, SUPER_PROMPT_HEADINGS, len(content))
+    if not section:
+        return None
+    
+    section_content = slice_text(content, section[1], section[2]).strip()
     if not section_content:
         return None
     
     # Extract code block if present
-    code_match = re.search(r'```(?:markdown|text|yaml|)?\s*\n(.*?)```', section_content, re.DOTALL)
-    if code_match:
-        prompt_text = code_match.group(1).strip()
+    code_block = find_code_block(content, tokens, section, PROMPT_FENCE_LANGUAGES)
+    if code_block is not None:
+        prompt_text = code_block.strip()
     else:
         prompt_text = section_content
     
-    # Try to parse structure
-    structure = {
-        'full_text': prompt_text,
-        'role': None,
-        'task': None,
-        'inputs': [],
-        'process': [],
-        'output': None,
-        'quality_checks': []
-    }
-    
-    # Extract ROLE
-    role_match = re.search(r'(?:ROLE|Role):\s*(.+?)(?=\n\n|\n[A-Z]+:|\Z)', prompt_text, re.DOTALL)
-    if role_match:
-        structure['role'] = role_match.group(1).strip()
-    
-    # Extract TASK
-    task_match = re.search(r'(?:TASK|Task|Objective|OBJECTIVE):\s*(.+?)(?=\n\n|\n[A-Z]+:|\Z)', prompt_text, re.DOTALL)
-    if task_match:
-        structure['task'] = task_match.group(1).strip()
-    
-    # Extract INPUTS (often a list)
-    inputs_match = re.search(r'(?:INPUTS|Inputs|INPUT):\s*\n(.*?)(?=\n\n[A-Z]+:|\n[A-Z]+ [A-Z]+:|\Z)', prompt_text, re.DOTALL)
-    if inputs_match:
-        inputs_text = inputs_match.group(1)
-        # Extract bullet points or variables
-        for line in inputs_text.split('\n'):
-            line = line.strip()
-            if line.startswith('-') or line.startswith('•') or re.match(r'^\d+\.', line):
-                structure['inputs'].append(line)
-    
-    # Extract PROCESS/CHECKLIST
-    process_match = re.search(r'(?:PROCESS|Process|CHECKLIST|Checklist).*?:\s*\n(.*?)(?=\n\n[A-Z]+:|\n[A-Z]+ [A-Z]+:|\Z)', prompt_text, re.DOTALL)
-    if process_match:
-        process_text = process_match.group(1)
-        for line in process_text.split('\n'):
-            line = line.strip()
-            if line.startswith('-') or line.startswith('•') or re.match(r'^\d+[\.\)]', line):
-                structure['process'].append(line)
-    
-    # Extract OUTPUT
-    output_match = re.search(r'(?:OUTPUT|Output|OUTPUT SPEC|Output Format).*?:\s*\n(.*?)(?=\n\n[A-Z]+:|\n[A-Z]+ [A-Z]+:|\Z)', prompt_text, re.DOTALL)
-    if output_match:
-        structure['output'] = output_match.group(1).strip()
-    
-    # Extract QUALITY CHECKS
-    quality_match = re.search(r'(?:QUALITY|Quality).*?:\s*\n(.*?)(?=\n\n|\Z)', prompt_text, re.DOTALL)
-    if quality_match:
-        quality_text = quality_match.group(1)
-        for line in quality_text.split('\n'):
-            line = line.strip()
-            if line.startswith('-') or line.startswith('•'):
-                structure['quality_checks'].append(line)
+    # Parse ROLE/TASK/INPUTS/PROCESS/OUTPUT/QUALITY structure
+    structure = {'full_text': prompt_text}
+    structure.update(parse_super_prompt_fields(prompt_text, deadline))
     
     return structure
 
-def extract_quick_wins(content: str) -> List[Dict]:
+def extract_quick_wins(content: Document, tokens: Optional[List] = None,
+                       deadline: Optional[float] = None) -> List[Dict]:
     """Extract quick wins with categorization."""
-    # Find Section 9
-    patterns = [
-        r'## Section 9: Quick Wins.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-        r'## 9\) Quick Wins.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-        r'## 9\. Quick Wins.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-        r'## Quick Wins Library.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-    ]
-    
-    section_content = None
-    for pattern in patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            section_content = match.group(1).strip()
-            break
-    
-    if not section_content:
-        return []
-    
-    quick_wins = []
+    if tokens is None:
+        tokens = tokenize_document(content)
     
-    # Extract from code block
-    code_match = re.search(r'```[^\n]*\n(.*?)```', section_content, re.DOTALL)
-    if code_match:
-        text = code_match.group(1)
-    else:
-        text = section_content
-    
-    # Parse patterns
-    for line in text.split('\n'):
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
-        
-        # Detect category (if present)
-        category = None
-        pattern_text = line
-        
-        # Format: "Category → pattern"
-        if '→' in line:
-            parts = line.split('→', 1)
-            category = parts[0].strip().strip('-•').strip()
-            pattern_text = parts[1].strip()
-        # Format: "Category: pattern"
-        elif ':' in line and not line.startswith('"'):
-            parts = line.split(':', 1)
-            potential_category = parts[0].strip().strip('-•').strip()
-            # Check if it looks like a category
-            if len(potential_category.split()) <= 3 and potential_category[0].isupper():
-                category = potential_category
-                pattern_text = parts[1].strip()
-        
-        # Remove leading bullets
-        pattern_text = pattern_text.lstrip('-•').strip()
-        
-        if pattern_text:
-            quick_wins.append({
-                'category': category,
-                'pattern': pattern_text,
-                'original': line
-            })
-    
-    return quick_wins
+    return parse_quick_wins(content, tokens, deadline)
 
-def extract_lessons(content: str) -> List[str]:
+def extract_lessons(content: Document, tokens: Optional[List] = None,
+                    deadline: Optional[float] = None) -> List[str]:
     """Extract lessons learned from Section 8."""
-    patterns = [
-        r'## Section 8: Lessons.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-        r'## 8\) Lessons.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-        r'## 8\. Lessons.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-    ]
-    
-    section_content = None
-    for pattern in patterns:
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-        if match:
-            section_content = match.group(1).strip()
-            break
+    if tokens is None:
+        tokens = tokenize_document(content)
     
+    section_content = extract_section(content, tokens, LESSONS_HEADINGS)
     if not section_content:
         return []
     
     lessons = []
     for line in section_content.split('\n'):
+        check_deadline(deadline)
         line = line.strip()
-        if line.startswith('-') or line.startswith('•') or re.match(r'^\d+\.', line):
+        if line.startswith('-') or line.startswith('•') or NUMBERED_ITEM_PATTERN.match(line):
             lesson = line.lstrip('-•0123456789.').strip()
             if lesson:
                 lessons.append(lesson)
     
     return lessons
 
-def detect_domain(frontmatter: Dict, content: str) -> str:
+def detect_domain(frontmatter: Dict, content: Document) -> str:
     """Detect primary domain/topic."""
-    title = frontmatter.get('title', '').lower()
-    tags = str(frontmatter.get('tags', '')).lower()
+    title = frontmatter_text(frontmatter, 'title').lower()
+    tags = ', '.join(parse_tags(frontmatter.get('tags'))).lower()
     combined = f"{title} {tags}".lower()
     
-    # Check in priority order
-    if any(kw in combined for kw in ['zapier', 'automation', 'workflow', 'process']):
-        return 'automation'
-    elif any(kw in combined for kw in ['api', 'rest', 'fastapi', 'endpoint', 'backend']):
-        return 'api-development'
-    elif any(kw in combined for kw in ['nextjs', 'next.js', 'react', 'frontend', 'ui', 'web']):
-        return 'web-development'
-    elif any(kw in combined for kw in ['database', 'chroma', 'sql', 'postgres', 'persistence']):
-        return 'database'
-    elif any(kw in combined for kw in ['documentation', 'docs', 'readme', 'agents.md']):
-        return 'documentation'
-    elif any(kw in combined for kw in ['business', 'consulting', 'interview', 'process-automation']):
-        return 'business-process'
-    elif any(kw in combined for kw in ['data', 'analysis', 'viz', 'chart', 'visualization']):
-        return 'data-analysis'
-    elif any(kw in combined for kw in ['docker', 'deployment', 'devops', 'ci/cd', 'infrastructure']):
-        return 'devops'
-    elif any(kw in combined for kw in ['ai', 'ml', 'llm', 'model', 'prompt', 'meta-prompting']):
-        return 'ai-ml'
-    elif any(kw in combined for kw in ['test', 'tdd', 'testing', 'quality']):
-        return 'testing'
-    else:
-        return 'general'
+    return classify_domain(combined)
 
 def score_quality(super_prompt: Optional[Dict], quick_wins: List[Dict], lessons: List[str]) -> str:
-    """Score extraction quality: HIGH, MEDIUM, or LOW."""
-    score = 0
-    
-    # Super-prompt scoring
-    if super_prompt:
-        score += 3
-        if super_prompt.get('role') and super_prompt.get('task'):
-            score += 2
-        if len(super_prompt.get('inputs', [])) >= 3:
-            score += 1
-        if len(super_prompt.get('process', [])) >= 3:
-            score += 1
-        if super_prompt.get('quality_checks'):
-            score += 1
-    
-    # Quick wins scoring
-    if len(quick_wins) >= 5:
-        score += 2
-    elif len(quick_wins) >= 3:
-        score += 1
-    
-    # Lessons scoring
-    if len(lessons) >= 3:
-        score += 1
-    
-    if score >= 8:
-        return 'HIGH'
-    elif score >= 4:
-        return 'MEDIUM'
-    else:
-        return 'LOW'
+    """Score extraction quality: HIGH, MEDIUM, or LOW.
+
+    Points come from SCORING_RULES and tiers from TIER_THRESHOLDS (see
+    feature_store.py), the same rules rescore-insights.py applies to the
+    saved feature columns.
+    """
+    return quality_tier(score_features(quality_features(super_prompt, quick_wins, lessons)))
 
-def process_file(filepath: Path) -> Dict:
-    """Process a single insights file."""
+def process_file(filepath: Path, time_budget: float = FILE_TIME_BUDGET) -> Dict:
+    """Process a single insights file.
+
+    The time budget is checked between extraction stages and inside their
+    parsing loops: a stage still running when it is spent is abandoned, it
+    and the remaining stages get empty results, and the file is flagged
+    with time_budget_exceeded instead of holding up the run.
+    """
     print(f"  Processing: {filepath.name}")
+    deadline = time.perf_counter() + time_budget if time_budget > 0 else None
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open_document(filepath) as content:
+            # Extract all components
+            parsed = parse_document(content)
+            frontmatter = parsed['frontmatter']
+            tokens = parsed['tokens']
+            stages = [
+                ('super_prompt', lambda: extract_super_prompt(content, tokens, deadline), None),
+                ('quick_wins', lambda: extract_quick_wins(content, tokens, deadline), []),
+                ('lessons', lambda: extract_lessons(content, tokens, deadline), []),
+                ('domain', lambda: detect_domain(frontmatter, content), 'general'),
+                ('word_count', lambda: count_words(content), 0),
+            ]
+            extracted = {}
+            skipped = []
+            for name, stage, default in stages:
+                try:
+                    check_deadline(deadline)
+                    extracted[name] = stage()
+                except TimeBudgetExceeded:
+                    skipped.append(name)
+                    extracted[name] = default
+            super_prompt = extracted['super_prompt']
+            quick_wins = extracted['quick_wins']
+            lessons = extracted['lessons']
+            domain = extracted['domain']
+            quality = score_quality(super_prompt, quick_wins, lessons)
+            word_count = extracted['word_count']
         
-        # Extract all components
-        frontmatter = extract_frontmatter(content)
-        super_prompt = extract_super_prompt(content)
-        quick_wins = extract_quick_wins(content)
-        lessons = extract_lessons(content)
-        domain = detect_domain(frontmatter, content)
-        quality = score_quality(super_prompt, quick_wins, lessons)
+        if skipped:
+            print(f"    ⏱️  Time budget exceeded, skipped: {', '.join(skipped)}")
         
-        return {
+        data = {
             'filename': filepath.name,
-            'file_id': frontmatter.get('thread_fingerprint', filepath.stem),
-            'title': frontmatter.get('title', 'Unknown'),
-            'date': frontmatter.get('date', 'Unknown'),
-            'tags': frontmatter.get('tags', []),
+            'file_id': frontmatter_text(frontmatter, 'thread_fingerprint', filepath.stem),
+            'title': frontmatter_text(frontmatter, 'title', 'Unknown'),
+            'date': frontmatter_text(frontmatter, 'date', 'Unknown'),
+            'tags': parse_tags(frontmatter.get('tags')),
             'domain': domain,
             'quality_score': quality,
             'super_prompt': super_prompt,
             'quick_wins': quick_wins,
             'lessons': lessons,
             'extraction_success': True,
-            'word_count': len(content.split())
+            'word_count': word_count
         }
+        if skipped:
+            data['time_budget_exceeded'] = True
+            data['skipped_stages'] = skipped
+        return data
     
     except Exception as e:
         print(f"    ⚠️  Error: {str(e)}")
@@ -308,109 +203,622 @@ def process_file(filepath: Path) -> Dict:
             'error': str(e)
         }
 
-def main():
-    """Main extraction pipeline."""
-    print("🔄 FULL EXTRACTION PIPELINE")
-    print("=" * 70)
-    print()
-    
-    insights_path = Path(INSIGHTS_DIR)
-    md_files = sorted(list(insights_path.glob("*.md")))
+def enable_metrics() -> None:
+    """Time the parsing and extraction stages, and process_file per file."""
+    metrics.instrument(vars(insights_core), ['extract_frontmatter', 'tokenize_document'])
+    metrics.instrument(globals(), [
+        'extract_super_prompt', 'extract_quick_wins', 'extract_lessons',
+        'detect_domain', 'count_words', 'process_file'
+    ], items={'process_file': lambda filepath, *args, **kwargs: filepath.name})
+
+def process_file_measured(filepath: Path, time_budget: float = FILE_TIME_BUDGET) -> Tuple[Dict, Dict]:
+    """Worker entry point: process_file plus the metrics it recorded."""
+    if not metrics.enabled:
+        enable_metrics()
+    result = process_file(filepath, time_budget)
+    return result, metrics.drain()
+
+def iter_extract_files(md_files: List[Path], workers: int = 1,
+                       time_budget: float = FILE_TIME_BUDGET) -> Iterator[Dict]:
+    """Yield process_file results in input order as they complete.
+
+    With more than one worker the files are spread across a process pool in
+    chunks; results are still yielded in the same order as a serial run.
+    """
+    if workers <= 1 or len(md_files) < 2:
+        for filepath in md_files:
+            yield process_file(filepath, time_budget)
+        return
+    
+    # A few chunks per worker keeps the pool balanced without per-file IPC
+    chunksize = max(1, len(md_files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if not metrics.enabled:
+            yield from executor.map(process_file, md_files, repeat(time_budget), chunksize=chunksize)
+            return
+        for result, worker_metrics in executor.map(process_file_measured, md_files, repeat(time_budget),
+                                                     chunksize=chunksize):
+            metrics.merge(worker_metrics)
+            yield result
+
+def extract_files(md_files: List[Path], workers: int = 1,
+                  time_budget: float = FILE_TIME_BUDGET) -> List[Dict]:
+    """Run process_file over all files, in input order."""
+    return list(iter_extract_files(md_files, workers, time_budget))
+
+def extractor_fingerprint() -> str:
+    """Hash the extractor code so cached results expire when it changes."""
+    digest = hashlib.sha256()
+    for source in EXTRACTOR_SOURCES:
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+def load_cache(cache_file: Path, fingerprint: str) -> Dict[str, Dict]:
+    """Load cached entries, discarding them if the extractor has changed."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
     
-    print(f"📁 Found {len(md_files)} files to process")
-    print(f"📂 Directory: {INSIGHTS_DIR}")
-    print()
+    if cache.get('fingerprint') != fingerprint:
+        return {}
+    entries = cache.get('entries', {})
+    for entry in entries.values():
+        entry['result'] = compact_record(entry['result'])
+    return entries
+
+def save_cache(cache_file: Path, fingerprint: str, entries: Dict[str, Dict]) -> None:
+    """Write the cache atomically so an interrupted run cannot corrupt it."""
+    with output_writer.open(cache_file) as f:
+        json.dump({'fingerprint': fingerprint, 'entries': entries}, f, default=json_default)
+
+def plan_cached_extraction(md_files: List[Path], entries: Dict[str, Dict]
+                           ) -> Tuple[Dict[int, Dict], List[Tuple[int, str, Dict]], Dict[str, Dict]]:
+    """Split files into cache hits and files that need extracting.
+
+    A file is reused without being read when its size and mtime match the
+    cache entry; otherwise its content hash decides. Returns cached results
+    by file index, the pending (index, key, signature) list and the cache
+    entries carried over for the hits.
+    """
+    cached = {}
+    pending = []
+    new_entries = {}
+    
+    for i, filepath in enumerate(md_files):
+        key = str(filepath)
+        stat = filepath.stat()
+        entry = entries.get(key)
+        signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        
+        if entry and entry['size'] == signature['size'] and entry['mtime_ns'] == signature['mtime_ns']:
+            cached[i] = entry['result']
+            new_entries[key] = entry
+            continue
+        
+        signature['sha256'] = hashlib.sha256(filepath.read_bytes()).hexdigest()
+        if entry and entry['sha256'] == signature['sha256']:
+            cached[i] = entry['result']
+            new_entries[key] = dict(entry, **signature)
+            continue
+        
+        pending.append((i, key, signature))
     
-    # Process all files
-    print("⚙️  Extracting content...\n")
+    return cached, pending, new_entries
+
+def iter_extract_files_cached(md_files: List[Path], workers: int, cached: Dict[int, Dict],
+                              pending: List[Tuple[int, str, Dict]],
+                              new_entries: Dict[str, Dict],
+                              time_budget: float = FILE_TIME_BUDGET) -> Iterator[Dict]:
+    """Yield cached and freshly extracted results in input order.
+
+    Fresh results are recorded in new_entries as they are produced; both
+    kinds are yielded as compact records, shared with the cache entries.
+    """
+    extracted = iter_extract_files([md_files[i] for i, _, _ in pending], workers, time_budget)
+    pending_iter = iter(pending)
+    
+    for i in range(len(md_files)):
+        if i in cached:
+            yield cached.pop(i)
+            continue
+        
+        _, key, signature = next(pending_iter)
+        result = compact_record(next(extracted))
+        # Failed and over-budget extractions are retried on the next run
+        if result.get('extraction_success') and not result.get('time_budget_exceeded'):
+            new_entries[key] = dict(signature, result=result)
+        yield result
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """'i/N' from the command line: shard i (1-based) of N."""
+    index, _, count = text.partition('/')
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {text!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {text!r} out of range (1 <= i <= N)")
+    return index, count
+
+def shard_of(name: str, count: int) -> int:
+    """Shard (1-based) of a file, from a hash of its name so every machine agrees."""
+    digest = hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count + 1
+
+def shard_path(path: Path, shard: Tuple[int, int]) -> Path:
+    """Per-shard variant of a file: data.json -> data.shard-2-of-4.json."""
+    return path.with_name(f"{path.stem}.shard-{shard[0]}-of-{shard[1]}{path.suffix}")
+
+def read_shard(path: Path) -> Optional[Tuple[int, int]]:
+    """The (i, N) a shard output was written for, or None for a whole-corpus output."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.jsonl':
+            # The shard is recorded in the trailer, the last line
+            f.seek(max(0, os.fstat(f.fileno()).st_size - (1 << 16)))
+            trailer = json.loads(f.read().rstrip('\n').rsplit('\n', 1)[-1])
+            shard = trailer.get('shard')
+        else:
+            # 'shard' directly follows extraction_date, so the head of the file is enough
+            head = io.StringIO(f.read(1 << 16))
+            try:
+                shard = list(islice(iter_json_array(head, 'shard'), 2))
+            except ValueError:
+                shard = None
+    return tuple(shard) if shard else None
+
+def iter_merged_shards(paths: List[Path]) -> Iterator[Dict]:
+    """Records of a complete set of shard outputs, in single-run file order.
+
+    Each shard is already in file order, so they are merged as streams.
+    Raises SystemExit if shards are missing, repeated or overlap.
+    """
+    shards = {}
+    for path in paths:
+        shard = read_shard(path)
+        if shard is None:
+            raise SystemExit(f"❌ {path} is not a shard output (no shard recorded)")
+        if shard in shards:
+            raise SystemExit(f"❌ {path} and {shards[shard]} are both shard {shard[0]}/{shard[1]}")
+        shards[shard] = path
+    counts = {count for _, count in shards}
+    if len(counts) != 1:
+        raise SystemExit(f"❌ Shards from different splits: {', '.join(f'{i}/{n}' for i, n in sorted(shards))}")
+    count = counts.pop()
+    missing = [str(i) for i in range(1, count + 1) if (i, count) not in shards]
+    if missing:
+        raise SystemExit(f"❌ Missing shard(s) {', '.join(missing)} of {count}")
+    
+    streams = [iter_extraction_records(str(shards[shard])) for shard in sorted(shards)]
+    previous = None
+    for record in heapq.merge(*streams, key=lambda record: Path(record['filename'])):
+        if record['filename'] == previous:
+            raise SystemExit(f"❌ {previous} appears in more than one shard")
+        previous = record['filename']
+        yield record
+
+def new_statistics() -> Dict:
+    """Create an empty running-statistics accumulator."""
+    return {
+        'total_files': 0,
+        'successful': 0,
+        'with_super_prompts': 0,
+        'with_quick_wins': 0,
+        'total_quick_wins': 0,
+        'total_lessons': 0,
+        'over_budget': [],
+        'quality_tiers': {'high': [], 'medium': [], 'low': []},
+        'domains': {}
+    }
+
+def update_name_list(names: List[str], name: str, delta: int) -> None:
+    """Insert or remove a file name, keeping the list in file order."""
+    if delta > 0:
+        bisect.insort(names, name)
+    else:
+        names.remove(name)
+
+def update_statistics(stats: Dict, data: Dict, delta: int = 1) -> None:
+    """Fold one process_file result into the running statistics.
+
+    delta=-1 takes a previously folded result back out, so watch mode can
+    replace a file's result without recounting the rest.
+    """
+    stats['total_files'] += delta
+    if not data.get('extraction_success'):
+        return
+    if data.get('time_budget_exceeded'):
+        update_name_list(stats['over_budget'], data['filename'], delta)
+    
+    stats['successful'] += delta
+    if data.get('super_prompt'):
+        stats['with_super_prompts'] += delta
+    if data.get('quick_wins'):
+        stats['with_quick_wins'] += delta
+    stats['total_quick_wins'] += delta * len(data.get('quick_wins', []))
+    stats['total_lessons'] += delta * len(data.get('lessons', []))
+    
+    tier = stats['quality_tiers'].get(str(data.get('quality_score')).lower())
+    if tier is not None:
+        update_name_list(tier, data['filename'], delta)
+    
+    domain = data.get('domain', 'unknown')
+    stats['domains'][domain] = stats['domains'].get(domain, 0) + delta
+    if not stats['domains'][domain]:
+        del stats['domains'][domain]
+
+def statistics_record(stats: Dict) -> Dict:
+    """Build the summary, quality_tiers and domains output sections."""
+    tiers = stats['quality_tiers']
+    record = {
+        'summary': {
+            'total_files': stats['total_files'],
+            'successful': stats['successful'],
+            'with_super_prompts': stats['with_super_prompts'],
+            'with_quick_wins': stats['with_quick_wins'],
+            'total_quick_wins': stats['total_quick_wins'],
+            'high_quality_count': len(tiers['high']),
+            'medium_quality_count': len(tiers['medium']),
+            'low_quality_count': len(tiers['low'])
+        },
+        'quality_tiers': tiers,
+        'domains': stats['domains']
+    }
+    if stats['over_budget']:
+        record['over_budget_files'] = stats['over_budget']
+    return record
+
+def collect_feature_rows(results: Iterable[Dict], rows: List[Tuple]) -> Iterator[Dict]:
+    """Pass results through, recording each one's feature row for the feature store."""
+    for data in results:
+        rows.append(feature_row(data))
+        yield data
+
+def save_features(path: Path, rows: Iterable[Tuple]) -> None:
+    """Write the feature store (needs NumPy)."""
+    FeatureStore.from_rows(rows).save(path, output_writer)
+
+def write_json(output_path: Path, results: Iterator[Dict], stats: Dict, count: bool = True,
+               shard: Optional[Tuple[int, int]] = None) -> None:
+    """Write all results as one indented JSON document.
+
+    The statistics come first in the document, so results are held until
+    the end, as compact records. With count=False stats already covers
+    results and is written as is; a shard output records its (i, N).
+    """
     all_data = []
+    for data in results:
+        if count:
+            update_statistics(stats, data)
+        all_data.append(compact_record(data))
     
-    for filepath in md_files:
-        data = process_file(filepath)
-        all_data.append(data)
+    output_data = {
+        'extraction_date': datetime.now().isoformat(),
+        **({'shard': list(shard)} if shard else {}),
+        **statistics_record(stats),
+        'files': all_data
+    }
     
-    print()
+    with output_writer.open(output_path) as f:
+        json.dump(output_data, f, indent=2, default=json_default)
+
+def write_jsonl(output_path: Path, results: Iterator[Dict], stats: Dict, count: bool = True,
+                shard: Optional[Tuple[int, int]] = None) -> None:
+    """Stream one result per line, then a trailer record with the statistics."""
+    with output_writer.open(output_path) as f:
+        for data in results:
+            if count:
+                update_statistics(stats, data)
+            f.write(json.dumps(data, default=json_default) + '\n')
+        
+        trailer = {
+            'record_type': 'summary',
+            'extraction_date': datetime.now().isoformat(),
+            **({'shard': list(shard)} if shard else {}),
+            **statistics_record(stats)
+        }
+        f.write(json.dumps(trailer) + '\n')
+
+def apply_changes(insights_path: Path, names: Iterable[str], records: Dict[str, FileRecord], stats: Dict,
+                  entries: Dict[str, Dict], workers: int = 1,
+                  time_budget: float = FILE_TIME_BUDGET) -> Dict[str, List[str]]:
+    """Re-extract changed files and drop deleted ones.
+
+    records (by filename), stats and the cache entries are updated in place;
+    a file whose content hash is unchanged (e.g. only touched) keeps its
+    result. Returns the added, changed and deleted file names.
+    """
+    changes = {'added': [], 'changed': [], 'deleted': []}
+    pending = []
+    
+    for name in sorted(names):
+        filepath = insights_path / name
+        key = str(filepath)
+        try:
+            stat = filepath.stat()
+            content = filepath.read_bytes()
+        except FileNotFoundError:
+            if name in records:
+                update_statistics(stats, records.pop(name), -1)
+                entries.pop(key, None)
+                changes['deleted'].append(name)
+            continue
+        
+        signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                     'sha256': hashlib.sha256(content).hexdigest()}
+        entry = entries.get(key)
+        if name in records and entry and entry['sha256'] == signature['sha256']:
+            entries[key] = dict(entry, **signature)
+            continue
+        pending.append((filepath, key, signature))
+    
+    extracted = iter_extract_files([filepath for filepath, _, _ in pending], workers, time_budget)
+    for (filepath, key, signature), result in zip(pending, extracted):
+        result = compact_record(result)
+        previous = records.get(filepath.name)
+        # Without a cache entry to compare, a rescan re-extracts files that did not change
+        if previous is None or previous != result:
+            if previous is not None:
+                update_statistics(stats, previous, -1)
+            changes['changed' if previous is not None else 'added'].append(filepath.name)
+            records[filepath.name] = result
+            update_statistics(stats, result)
+        if result.get('extraction_success') and not result.get('time_budget_exceeded'):
+            entries[key] = dict(signature, result=result)
+        else:
+            entries.pop(key, None)
+    
+    return changes
+
+def watch_insights(insights_path: Path, output_path: Path, write: Callable, records: Dict[str, FileRecord],
+                   stats: Dict, entries: Dict[str, Dict], cache: Optional[Tuple[Path, str]],
+                   features_file: Optional[Path], args: argparse.Namespace, workers: int, watcher) -> None:
+    """Keep the output up to date as insights files are added, edited or deleted.
+
+    watcher is opened before the initial extraction, so changes made while
+    it ran are in its first batch. Only changed files are re-extracted; the
+    output (and the cache, unless disabled) is rewritten after each settled
+    batch of changes. If the directory is deleted or moved away, watching
+    resumes with a full rescan once it is back.
+    """
+    def refresh(names: Set[str]) -> None:
+        start = time.perf_counter()
+        changes = apply_changes(insights_path, names, records, stats, entries,
+                                workers, args.time_budget)
+        if not any(changes.values()):
+            return
+        
+        write(output_path, (records[name] for name in sorted(records)), stats, count=False)
+        if features_file is not None:
+            save_features(features_file, (feature_row(records[name]) for name in sorted(records)))
+        if cache is not None:
+            save_cache(cache[0], cache[1], entries)
+        
+        tiers = stats['quality_tiers']
+        print(f"🔁 {datetime.now():%H:%M:%S}  +{len(changes['added'])} ~{len(changes['changed'])} "
+              f"-{len(changes['deleted'])}  ({time.perf_counter() - start:.2f}s)")
+        for kind, symbol in [('added', '➕'), ('changed', '✏️ '), ('deleted', '🗑️ ')]:
+            for name in changes[kind]:
+                print(f"   {symbol} {name}")
+        print(f"   📊 {stats['successful']}/{stats['total_files']} files, "
+              f"{len(tiers['high'])} HIGH / {len(tiers['medium'])} MEDIUM / {len(tiers['low'])} LOW, "
+              f"{stats['total_quick_wins']} quick wins")
+    
+    rescan = False
+    try:
+        while True:
+            try:
+                if watcher is None:
+                    # Reopened before the rescan, so nothing changed in between is missed
+                    watcher = open_watcher(str(insights_path), interval=args.poll_interval, polling=args.poll)
+                with watcher:
+                    print(f"👀 Watching {insights_path} ({watcher.kind}), Ctrl+C to stop")
+                    print()
+                    if rescan:
+                        refresh(set(scan(str(insights_path))) | set(records))
+                        rescan = False
+                    for names in iter_batches(watcher):
+                        if names is None:
+                            # Events were lost: compare everything on disk with what we have
+                            names = set(scan(str(insights_path))) | set(records)
+                        refresh(names)
+            except FileNotFoundError:
+                watcher = None
+                rescan = True
+                print(f"⚠️  {insights_path} was deleted or moved away; waiting for it to come back...")
+                wait_for_directory(str(insights_path), args.poll_interval)
+                print(f"📂 {insights_path} is back, rescanning")
+    except KeyboardInterrupt:
+        print()
+        print(f"👋 Watch stopped. {output_writer.summary()}")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Extract super-prompts and quick wins from insights files.")
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help="extract with N worker processes (0 = one per CPU core, default: 1)")
+    parser.add_argument('--cache', metavar='PATH',
+                        help=f"incremental extraction cache file (default: {CACHE_FILE}, one per shard with --shard)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="re-extract every file and leave the cache untouched")
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json',
+                        help="json: one document (default); jsonl: stream one record per line plus a summary trailer")
+    parser.add_argument('--output', metavar='PATH',
+                        help="output file (default: OUTPUT_FILE, with a .jsonl suffix for --format jsonl)")
+    parser.add_argument('--time-budget', type=float, default=FILE_TIME_BUDGET, metavar='SECONDS',
+                        help="per-file extraction budget; later stages are skipped and the file flagged once spent (0 = unlimited, default: %(default)s)")
+    parser.add_argument('--features', metavar='PATH',
+                        help="per-file quality feature columns for rescore-insights.py (default: <output>.features.npz, needs NumPy)")
+    parser.add_argument('--no-features', action='store_true',
+                        help="do not write the feature store")
+    parser.add_argument('--metrics', nargs='?', const='', metavar='PATH',
+                        help="record per-stage and per-file timings to PATH (default: <output>.metrics.json)")
+    parser.add_argument('--watch', action='store_true',
+                        help="after the full run, keep watching INSIGHTS_DIR and re-extract files as they change")
+    parser.add_argument('--poll', action='store_true',
+                        help="with --watch, poll for changes even where inotify is available")
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL, metavar='SECONDS',
+                        help="with --watch, seconds between directory scans when polling (default: %(default)s)")
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help="extract only shard i of N (files split by a hash of their name) into a partial "
+                             "output, by default OUTPUT_FILE with a .shard-i-of-N suffix")
+    parser.add_argument('--merge', nargs='+', metavar='SHARD',
+                        help="instead of extracting, combine the outputs of all N shards into one output, "
+                             "identical to a single run's")
+    args = parser.parse_args(argv)
+    if args.merge and (args.shard or args.watch):
+        parser.error("--merge cannot be combined with --shard or --watch")
+    if args.shard and args.watch:
+        parser.error("--watch cannot be combined with --shard")
+    return args
+
+def main(argv: Optional[List[str]] = None):
+    """Main extraction pipeline."""
+    args = parse_args(argv)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
     
-    # Calculate statistics
-    successful = [d for d in all_data if d.get('extraction_success')]
-    with_super_prompt = [d for d in successful if d.get('super_prompt')]
-    with_quick_wins = [d for d in successful if d.get('quick_wins')]
+    if args.output:
+        output_path = Path(args.output)
+    elif args.format == 'jsonl':
+        output_path = Path(OUTPUT_FILE).with_suffix('.jsonl')
+    else:
+        output_path = Path(OUTPUT_FILE)
+    # Shard outputs default to per-shard names next to the merged output
+    merged_path = output_path
+    if args.shard and not args.output:
+        output_path = shard_path(merged_path, args.shard)
     
-    high_quality = [d for d in successful if d.get('quality_score') == 'HIGH']
-    medium_quality = [d for d in successful if d.get('quality_score') == 'MEDIUM']
-    low_quality = [d for d in successful if d.get('quality_score') == 'LOW']
+    if args.metrics is not None:
+        enable_metrics()
     
-    # Domain breakdown
-    domains = {}
-    for d in successful:
-        domain = d.get('domain', 'unknown')
-        domains[domain] = domains.get(domain, 0) + 1
+    insights_path = Path(INSIGHTS_DIR)
+    cache = None
+    entries = {}
+    # Watching starts before extracting, so edits made during the run are not missed
+    watcher = open_watcher(str(insights_path), interval=args.poll_interval, polling=args.poll) if args.watch else None
+    if args.merge:
+        print("🧩 MERGING SHARD OUTPUTS")
+        print("=" * 70)
+        print()
+        print(f"📄 {len(args.merge)} shard outputs")
+        print()
+        results = iter_merged_shards([Path(path) for path in args.merge])
+    else:
+        print("🔄 FULL EXTRACTION PIPELINE")
+        print("=" * 70)
+        print()
+        
+        md_files = sorted(list(insights_path.glob("*.md")))
+        
+        print(f"📁 Found {len(md_files)} files to process")
+        print(f"📂 Directory: {INSIGHTS_DIR}")
+        if args.shard:
+            md_files = [filepath for filepath in md_files if shard_of(filepath.name, args.shard[1]) == args.shard[0]]
+            print(f"🧩 Shard {args.shard[0]}/{args.shard[1]}: {len(md_files)} files")
+        if workers > 1:
+            print(f"🧵 Workers: {workers}")
+        print()
+        
+        # Process all files
+        print("⚙️  Extracting content...\n")
+        if args.no_cache:
+            results = iter_extract_files(md_files, workers, args.time_budget)
+        else:
+            # Shards running side by side each keep their own cache
+            cache_file = Path(args.cache) if args.cache else Path(CACHE_FILE)
+            if args.shard and not args.cache:
+                cache_file = shard_path(cache_file, args.shard)
+            cache = (cache_file, extractor_fingerprint())
+            cached, pending, entries = plan_cached_extraction(md_files, load_cache(*cache))
+            print(f"♻️  Reusing {len(cached)} cached results, extracting {len(pending)} files\n")
+            results = iter_extract_files_cached(md_files, workers, cached, pending, entries, args.time_budget)
+    
+    if args.watch:
+        # Watch mode updates individual results later, so keep them all
+        results = [compact_record(data) for data in results]
+    
+    features_file = None
+    feature_rows = []
+    if not args.no_features and HAVE_NUMPY:
+        features_file = Path(args.features) if args.features else features_path(output_path)
+    elif not args.no_features:
+        print("⚠️  NumPy not installed, quality feature store not written\n")
+    
+    stats = new_statistics()
+    write = write_jsonl if args.format == 'jsonl' else write_json
+    write(output_path, results if features_file is None else collect_feature_rows(results, feature_rows), stats,
+          shard=args.shard)
+    if features_file is not None:
+        save_features(features_file, feature_rows)
+    
+    if cache is not None:
+        save_cache(cache[0], cache[1], entries)
+    
+    print()
+    
+    quality_tiers = stats['quality_tiers']
+    total_quick_wins = stats['total_quick_wins']
     
     # Statistics
     print("📊 EXTRACTION RESULTS")
     print("=" * 70)
-    print(f"✅ Successfully processed:    {len(successful)}/{len(all_data)}")
-    print(f"📝 With Super-Prompts:        {len(with_super_prompt)} files")
-    print(f"⚡ With Quick Wins:           {len(with_quick_wins)} files")
+    print(f"✅ Successfully processed:    {stats['successful']}/{stats['total_files']}")
+    print(f"📝 With Super-Prompts:        {stats['with_super_prompts']} files")
+    print(f"⚡ With Quick Wins:           {stats['with_quick_wins']} files")
     print()
     
-    total_quick_wins = sum(len(d.get('quick_wins', [])) for d in successful)
     print(f"🎯 Total Quick Win patterns:  {total_quick_wins}")
-    print(f"📚 Total Lessons:             {sum(len(d.get('lessons', [])) for d in successful)}")
+    print(f"📚 Total Lessons:             {stats['total_lessons']}")
+    if stats['over_budget']:
+        print(f"⏱️  Over time budget:          {len(stats['over_budget'])} files (partial results, see over_budget_files)")
     print()
     
     print("🏆 QUALITY DISTRIBUTION")
     print("=" * 70)
-    print(f"HIGH   (8+ points):   {len(high_quality):2d} files  ← Create standalone prompts")
-    print(f"MEDIUM (4-7 points):  {len(medium_quality):2d} files  ← Add to patterns library")
-    print(f"LOW    (0-3 points):  {len(low_quality):2d} files  ← Reference only")
+    print(f"HIGH   (8+ points):   {len(quality_tiers['high']):2d} files  ← Create standalone prompts")
+    print(f"MEDIUM (4-7 points):  {len(quality_tiers['medium']):2d} files  ← Add to patterns library")
+    print(f"LOW    (0-3 points):  {len(quality_tiers['low']):2d} files  ← Reference only")
     print()
     
     print("🏷️  DOMAIN BREAKDOWN")
     print("=" * 70)
-    for domain, count in sorted(domains.items(), key=lambda x: x[1], reverse=True):
+    for domain, count in sorted(stats['domains'].items(), key=lambda x: x[1], reverse=True):
         print(f"{domain:20s} {count:3d} files")
     print()
     
-    # Save results
-    output_data = {
-        'extraction_date': datetime.now().isoformat(),
-        'summary': {
-            'total_files': len(all_data),
-            'successful': len(successful),
-            'with_super_prompts': len(with_super_prompt),
-            'with_quick_wins': len(with_quick_wins),
-            'total_quick_wins': total_quick_wins,
-            'high_quality_count': len(high_quality),
-            'medium_quality_count': len(medium_quality),
-            'low_quality_count': len(low_quality)
-        },
-        'quality_tiers': {
-            'high': [d['filename'] for d in high_quality],
-            'medium': [d['filename'] for d in medium_quality],
-            'low': [d['filename'] for d in low_quality]
-        },
-        'domains': domains,
-        'files': all_data
-    }
-    
-    output_path = Path(OUTPUT_FILE)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2)
-    
     print(f"💾 Complete extraction data saved to:")
-    print(f"   {OUTPUT_FILE}")
+    print(f"   {output_path}")
+    print(f"   {output_writer.summary()}")
+    if features_file is not None:
+        print(f"🧮 Quality features saved to: {features_file}")
+    if metrics.enabled:
+        metrics_file = Path(args.metrics) if args.metrics else metrics_path(output_path)
+        metrics.write(metrics_file, 'extract-all-insights', output_writer)
+        print(f"⏱️  Timing metrics saved to: {metrics_file}")
     print()
     
     # Next steps
     print("✅ EXTRACTION COMPLETE!")
     print()
+    if args.shard:
+        index, count = args.shard
+        shard_outputs = [str(shard_path(merged_path, (i, count))) for i in range(1, count + 1)]
+        print(f"🧩 Shard {index}/{count} done. Once all {count} shards have run, merge them with:")
+        print(f"   extract-all-insights.py --merge {' '.join(shard_outputs) if not args.output else '<shard outputs>'}")
+        return
     print("📋 NEXT STEPS:")
-    print(f"1. Review {len(high_quality)} HIGH-quality files for prompt creation")
+    print(f"1. Review {len(quality_tiers['high'])} HIGH-quality files for prompt creation")
     print(f"2. Process {total_quick_wins} Quick Win patterns (deduplicate)")
     print(f"3. Run generation script to create Arsenal items")
     print()
     print("🚀 Ready for Phase 3: Generation")
+    
+    if args.watch:
+        print()
+        records = {data['filename']: data for data in results}
+        watch_insights(insights_path, output_path, write, records, stats, entries, cache, features_file,
+                       args, workers, watcher)
 
 if __name__ == "__main__":
     main()
@@ -2,190 +2,195 @@
 """
 Extract metadata, super-prompts, and quick wins from all prompt-insights files.
 Phase 1: Assessment - understand what we have before bulk processing.
+Files are parsed by the Phase 2 extractor through its cache, so the Phase 2
+run that follows reuses every result instead of parsing the files again.
 """
 
+import argparse
 import os
-import re
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional
 import json
 
+from insights_core import parse_tags
+from keyword_taxonomy import compile_classifier, load_taxonomy
+from output_writer import OutputWriter
+from script_loader import load_script
+
 # Configuration
 INSIGHTS_DIR = r"C:\Users\theca\CascadeProjects\chriscreateswithai-nextjs\content\prompt-insights"
 OUTPUT_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\scripts\insights-summary.json"
+# Extraction cache shared with Phase 2 (extract-all-insights.py)
+CACHE_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\scripts\.extraction-cache.json"
 
-def extract_frontmatter(content: str) -> Dict:
-    """Extract YAML frontmatter."""
-    match = re.search(r'^---\s*\n(.*?)\n---', content, re.DOTALL)
-    if not match:
-        return {}
-    
-    frontmatter = {}
-    for line in match.group(1).split('\n'):
-        if ':' in line:
-            key, value = line.split(':', 1)
-            frontmatter[key.strip()] = value.strip().strip("'\"")
-    
-    return frontmatter
-
-def extract_section(content: str, section_patterns: List[str]) -> str:
-    """Extract content from a section using multiple possible heading patterns."""
-    for pattern in section_patterns:
-        # Try to find the section
-        match = re.search(
-            rf'{pattern}.*?\n(.*?)(?=\n## |\n---\n|\Z)',
-            content,
-            re.DOTALL | re.IGNORECASE
-        )
-        if match:
-            return match.group(1).strip()
-    
-    return ""
+# Domain keywords in priority order (see keyword-taxonomy.json)
+DOMAIN_TAXONOMY = load_taxonomy()['assessment_domains']
+classify_domain = compile_classifier(DOMAIN_TAXONOMY['categories'], DOMAIN_TAXONOMY['fallback'])
 
-def extract_quick_wins(content: str) -> List[str]:
-    """Extract individual quick win patterns from Section 9."""
-    quick_wins_section = extract_section(
-        content,
-        [
-            r'## Section 9: Quick Wins',
-            r'## 9\) Quick Wins',
-            r'## 9\. Quick Wins'
-        ]
-    )
-    
-    if not quick_wins_section:
-        return []
-    
-    # Extract patterns - they're usually in a code block or as bullets
-    patterns = []
-    
-    # Try code block first
-    code_match = re.search(r'```[^\n]*\n(.*?)```', quick_wins_section, re.DOTALL)
-    if code_match:
-        for line in code_match.group(1).split('\n'):
-            line = line.strip()
-            if line and not line.startswith('#'):
-                patterns.append(line)
-    else:
-        # Try bullet points
-        for line in quick_wins_section.split('\n'):
-            line = line.strip()
-            if line.startswith('-') or line.startswith('•'):
-                patterns.append(line[1:].strip())
-    
-    return patterns
+# Atomic write-if-changed output for every file this script produces
+output_writer = OutputWriter()
 
-def analyze_file(filepath: Path) -> Dict:
-    """Analyze a single insights file."""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract metadata
-        frontmatter = extract_frontmatter(content)
-        
-        # Extract super-prompt
-        super_prompt = extract_section(
-            content,
-            [
-                r'## Section 4: Super-Prompt',
-                r'## 4\) Super-Prompt',
-                r'## 4\. Super-Prompt',
-                r'## Super-Prompt'
-            ]
-        )
-        
-        # Extract quick wins
-        quick_wins = extract_quick_wins(content)
-        
-        # Calculate metrics
-        word_count = len(content.split())
-        has_super_prompt = bool(super_prompt)
-        has_quick_wins = bool(quick_wins)
-        super_prompt_length = len(super_prompt.split()) if super_prompt else 0
-        
+def analyze_file(record: Dict) -> Dict:
+    """Summarize one Phase 2 extraction record for the assessment."""
+    filename = record['filename']
+    if not record.get('extraction_success'):
         return {
-            'filename': filepath.name,
-            'title': frontmatter.get('title', 'Unknown'),
-            'date': frontmatter.get('date', 'Unknown'),
-            'tags': frontmatter.get('tags', ''),
-            'thread_id': frontmatter.get('thread_fingerprint', ''),
-            'word_count': word_count,
-            'has_super_prompt': has_super_prompt,
-            'super_prompt_length': super_prompt_length,
-            'has_quick_wins': has_quick_wins,
-            'quick_wins_count': len(quick_wins),
-            'quick_wins': quick_wins[:3],  # First 3 for preview
-            'super_prompt_preview': super_prompt[:300] if super_prompt else ""
+            'filename': filename,
+            'error': record.get('error', 'extraction failed')
         }
     
-    except Exception as e:
-        return {
-            'filename': filepath.name,
-            'error': str(e)
-        }
+    super_prompt = (record.get('super_prompt') or {}).get('full_text') or ''
+    quick_wins = [qw['pattern'] for qw in record.get('quick_wins') or []]
+    # Phase 2 falls back to the file stem when there is no thread fingerprint
+    file_id = record.get('file_id') or ''
+    
+    return {
+        'filename': filename,
+        'title': record.get('title', 'Unknown'),
+        'date': record.get('date', 'Unknown'),
+        'tags': list(record.get('tags') or []),
+        'thread_id': '' if file_id == Path(filename).stem else file_id,
+        'word_count': record.get('word_count', 0),
+        'has_super_prompt': bool(super_prompt),
+        'super_prompt_length': len(super_prompt.split()),
+        'has_quick_wins': bool(quick_wins),
+        'quick_wins_count': len(quick_wins),
+        'quick_wins': quick_wins[:3],  # First 3 for preview
+        'super_prompt_preview': super_prompt[:300]
+    }
 
 def categorize_by_domain(files_data: List[Dict]) -> Dict[str, List[str]]:
     """Categorize files by detected domain/topic."""
-    domains = {
-        'API Development': [],
-        'Web Development': [],
-        'Database': [],
-        'Automation': [],
-        'Documentation': [],
-        'Business Process': [],
-        'Data Analysis': [],
-        'DevOps/Infrastructure': [],
-        'AI/ML': [],
-        'Other': []
-    }
+    domains = {name: [] for name in DOMAIN_TAXONOMY['categories']}
+    domains[DOMAIN_TAXONOMY['fallback']] = []
     
     for file_data in files_data:
         if 'error' in file_data:
             continue
         
         title = file_data['title'].lower()
-        tags = str(file_data['tags']).lower()
+        tags = ', '.join(parse_tags(file_data['tags'])).lower()
         combined = f"{title} {tags}"
         
-        categorized = False
-        
-        if any(kw in combined for kw in ['api', 'rest', 'fastapi', 'endpoint']):
-            domains['API Development'].append(file_data['filename'])
-            categorized = True
-        elif any(kw in combined for kw in ['nextjs', 'react', 'frontend', 'ui', 'web']):
-            domains['Web Development'].append(file_data['filename'])
-            categorized = True
-        elif any(kw in combined for kw in ['database', 'chroma', 'sql', 'postgres']):
-            domains['Database'].append(file_data['filename'])
-            categorized = True
-        elif any(kw in combined for kw in ['automation', 'zapier', 'workflow', 'process']):
-            domains['Automation'].append(file_data['filename'])
-            categorized = True
-        elif any(kw in combined for kw in ['documentation', 'docs', 'readme']):
-            domains['Documentation'].append(file_data['filename'])
-            categorized = True
-        elif any(kw in combined for kw in ['business', 'consulting', 'interview']):
-            domains['Business Process'].append(file_data['filename'])
-            categorized = True
-        elif any(kw in combined for kw in ['data', 'analysis', 'viz', 'chart']):
-            domains['Data Analysis'].append(file_data['filename'])
-            categorized = True
-        elif any(kw in combined for kw in ['docker', 'deployment', 'devops', 'ci/cd']):
-            domains['DevOps/Infrastructure'].append(file_data['filename'])
-            categorized = True
-        elif any(kw in combined for kw in ['ai', 'ml', 'llm', 'model']):
-            domains['AI/ML'].append(file_data['filename'])
-            categorized = True
-        
-        if not categorized:
-            domains['Other'].append(file_data['filename'])
+        domains[classify_domain(combined)].append(file_data['filename'])
     
     # Remove empty domains
     return {k: v for k, v in domains.items() if v}
 
-def main():
+# Per-file fields needed for the summary statistics in streaming mode
+SUMMARY_FIELDS = ['filename', 'title', 'tags', 'error', 'word_count', 'has_super_prompt',
+                  'super_prompt_length', 'has_quick_wins', 'quick_wins_count']
+
+def iter_extraction_results(md_files: List[Path], cache_file: Optional[Path]) -> Iterator[Dict]:
+    """Yield Phase 2 extraction records, reusing and updating its cache.
+
+    Without a cache file every file is extracted and nothing is saved.
+    """
+    extractor = load_script('extract-all-insights.py')
+    if cache_file is None:
+        yield from extractor.iter_extract_files(md_files)
+        return
+    
+    cache = (cache_file, extractor.extractor_fingerprint())
+    cached, pending, entries = extractor.plan_cached_extraction(md_files, extractor.load_cache(*cache))
+    print(f"♻️  Reusing {len(cached)} cached results, extracting {len(pending)} files")
+    yield from extractor.iter_extract_files_cached(md_files, 1, cached, pending, entries)
+    extractor.save_cache(*cache, entries)
+
+def iter_analyze_files(md_files: List[Path], cache_file: Optional[Path]) -> Iterator[Dict]:
+    """Yield analyze_file results with a progress indicator."""
+    for count, record in enumerate(iter_extraction_results(md_files, cache_file), 1):
+        yield analyze_file(record)
+        
+        # Progress indicator
+        if count % 10 == 0:
+            print(f"   Processed {count}/{len(md_files)} files...")
+
+def summarize_files(files_data: List[Dict]) -> Dict:
+    """Compute summary statistics, domains and high-value candidates."""
+    total_files = len(files_data)
+    with_super_prompt = sum(1 for d in files_data if d.get('has_super_prompt'))
+    with_quick_wins = sum(1 for d in files_data if d.get('has_quick_wins'))
+    avg_word_count = sum(d.get('word_count', 0) for d in files_data) / total_files
+    total_quick_wins = sum(d.get('quick_wins_count', 0) for d in files_data)
+    
+    high_value = [
+        d for d in files_data 
+        if d.get('has_super_prompt') 
+        and d.get('quick_wins_count', 0) >= 5
+        and d.get('super_prompt_length', 0) > 100
+    ]
+    
+    high_value.sort(key=lambda x: x.get('quick_wins_count', 0), reverse=True)
+    
+    return {
+        'summary': {
+            'total_files': total_files,
+            'with_super_prompt': with_super_prompt,
+            'with_quick_wins': with_quick_wins,
+            'avg_word_count': avg_word_count,
+            'total_quick_wins': total_quick_wins
+        },
+        'domains': categorize_by_domain(files_data),
+        'high_value': high_value
+    }
+
+def write_json(output_path: Path, results: Iterator[Dict]) -> Dict:
+    """Write all results as one indented JSON document; return the summary."""
+    all_data = list(results)
+    summary = summarize_files(all_data)
+    
+    output_data = {
+        'summary': summary['summary'],
+        'domains': summary['domains'],
+        'high_value_files': [d['filename'] for d in summary['high_value'][:15]],
+        'all_files': all_data
+    }
+    
+    with output_writer.open(output_path) as f:
+        json.dump(output_data, f, indent=2)
+    
+    return summary
+
+def write_jsonl(output_path: Path, results: Iterator[Dict]) -> Dict:
+    """Stream one result per line, then a summary trailer; return the summary.
+
+    Only the fields listed in SUMMARY_FIELDS are kept in memory per file.
+    """
+    stubs = []
+    with output_writer.open(output_path) as f:
+        for data in results:
+            f.write(json.dumps(data) + '\n')
+            stubs.append({k: data[k] for k in SUMMARY_FIELDS if k in data})
+        
+        summary = summarize_files(stubs)
+        trailer = {
+            'record_type': 'summary',
+            'summary': summary['summary'],
+            'domains': summary['domains'],
+            'high_value_files': [d['filename'] for d in summary['high_value'][:15]]
+        }
+        f.write(json.dumps(trailer) + '\n')
+    
+    return summary
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Assess prompt-insights files before bulk extraction.")
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json',
+                        help="json: one document (default); jsonl: stream one record per line plus a summary trailer")
+    parser.add_argument('--output', metavar='PATH',
+                        help="output file (default: OUTPUT_FILE, with a .jsonl suffix for --format jsonl)")
+    parser.add_argument('--cache', metavar='PATH',
+                        help=f"extraction cache shared with Phase 2 (default: {CACHE_FILE})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="extract every file and leave the cache untouched")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     """Main extraction and analysis."""
+    args = parse_args(argv)
+    
     print("🔍 Phase 1: Assessing Prompt Insights Files")
     print("=" * 60)
     
@@ -195,41 +200,43 @@ def main():
     print(f"\n📁 Found {len(md_files)} markdown files")
     print(f"📂 Directory: {INSIGHTS_DIR}\n")
     
+    if args.output:
+        output_path = Path(args.output)
+    elif args.format == 'jsonl':
+        output_path = Path(OUTPUT_FILE).with_suffix('.jsonl')
+    else:
+        output_path = Path(OUTPUT_FILE)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
     # Analyze all files
     print("📊 Analyzing files...")
-    all_data = []
-    for filepath in md_files:
-        data = analyze_file(filepath)
-        all_data.append(data)
-        
-        # Progress indicator
-        if len(all_data) % 10 == 0:
-            print(f"   Processed {len(all_data)}/{len(md_files)} files...")
+    cache_file = None if args.no_cache else Path(args.cache or CACHE_FILE)
+    results = iter_analyze_files(md_files, cache_file)
+    if args.format == 'jsonl':
+        summary = write_jsonl(output_path, results)
+    else:
+        summary = write_json(output_path, results)
     
-    print(f"✅ Analyzed {len(all_data)} files\n")
+    stats = summary['summary']
+    total_files = stats['total_files']
+    with_super_prompt = stats['with_super_prompt']
+    with_quick_wins = stats['with_quick_wins']
+    total_quick_wins = stats['total_quick_wins']
     
-    # Generate statistics
-    total_files = len(all_data)
-    with_super_prompt = sum(1 for d in all_data if d.get('has_super_prompt'))
-    with_quick_wins = sum(1 for d in all_data if d.get('has_quick_wins'))
-    avg_word_count = sum(d.get('word_count', 0) for d in all_data) / total_files
-    total_quick_wins = sum(d.get('quick_wins_count', 0) for d in all_data)
+    print(f"✅ Analyzed {total_files} files\n")
     
     print("📈 SUMMARY STATISTICS")
     print("=" * 60)
     print(f"Total files:              {total_files}")
     print(f"With Super-Prompts:       {with_super_prompt} ({with_super_prompt/total_files*100:.0f}%)")
     print(f"With Quick Wins:          {with_quick_wins} ({with_quick_wins/total_files*100:.0f}%)")
-    print(f"Average word count:       {avg_word_count:.0f} words")
+    print(f"Average word count:       {stats['avg_word_count']:.0f} words")
     print(f"Total Quick Win patterns: {total_quick_wins}")
     print(f"Avg Quick Wins per file:  {total_quick_wins/with_quick_wins:.1f}\n")
     
-    # Categorize by domain
-    domains = categorize_by_domain(all_data)
-    
     print("🏷️  DOMAIN BREAKDOWN")
     print("=" * 60)
-    for domain, files in sorted(domains.items(), key=lambda x: len(x[1]), reverse=True):
+    for domain, files in sorted(summary['domains'].items(), key=lambda x: len(x[1]), reverse=True):
         print(f"{domain:25s} {len(files):3d} files")
     print()
     
@@ -237,42 +244,14 @@ def main():
     print("⭐ HIGH-VALUE CANDIDATES (for priority extraction)")
     print("=" * 60)
     
-    high_value = [
-        d for d in all_data 
-        if d.get('has_super_prompt') 
-        and d.get('quick_wins_count', 0) >= 5
-        and d.get('super_prompt_length', 0) > 100
-    ]
-    
-    high_value.sort(key=lambda x: x.get('quick_wins_count', 0), reverse=True)
-    
-    for i, file_data in enumerate(high_value[:10], 1):
+    for i, file_data in enumerate(summary['high_value'][:10], 1):
         print(f"{i:2d}. {file_data['filename']}")
         print(f"    {file_data['title']}")
         print(f"    Quick Wins: {file_data['quick_wins_count']}, "
               f"Super-Prompt: {file_data['super_prompt_length']} words\n")
     
-    # Save detailed results
-    output_data = {
-        'summary': {
-            'total_files': total_files,
-            'with_super_prompt': with_super_prompt,
-            'with_quick_wins': with_quick_wins,
-            'avg_word_count': avg_word_count,
-            'total_quick_wins': total_quick_wins
-        },
-        'domains': domains,
-        'high_value_files': [d['filename'] for d in high_value[:15]],
-        'all_files': all_data
-    }
-    
-    output_path = Path(OUTPUT_FILE)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2)
-    
-    print(f"💾 Detailed results saved to: {OUTPUT_FILE}")
+    print(f"💾 Detailed results saved to: {output_path}")
+    print(f"   {output_writer.summary()}")
     print(f"\n✅ Phase 1 Assessment Complete!")
     print("\n📋 NEXT STEPS:")
     print("1. Review high-value candidates above")
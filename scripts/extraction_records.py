@@ -0,0 +1,156 @@
+"""
+Compact in-memory form of extraction results.
+File results, super-prompt structures and quick wins are held in __slots__
+classes instead of dicts: repeated labels (domain, quality tier, category,
+tags, dates) are interned and lists become tuples. to_dict() returns the
+exact JSON shape process_file produced, keys in the same order.
+"""
+
+import sys
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+# Key tuples of every record layout seen, shared by all records with that layout
+_SHAPES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+class CompactRecord:
+    """Base for slot records built from and converted back to JSON dicts.
+
+    FIELDS become slots; INTERNED string fields share one object per value;
+    SEQUENCE fields are stored as tuples, LINES fields as a single string,
+    SUFFIXES fields as an offset and ITEMS/NESTED fields as compact records. Keys outside FIELDS (and
+    values of an unexpected type) are kept in an extra dict, so nothing a
+    record was built from is lost.
+    """
+    __slots__ = ('_shape', '_extra')
+    
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED: FrozenSet[str] = frozenset()
+    SEQUENCES: FrozenSet[str] = frozenset()
+    # Lists of single-line strings, stored as one newline-joined str
+    LINES: FrozenSet[str] = frozenset()
+    # field -> field it is usually a suffix of, stored as an offset into that one
+    SUFFIXES: Dict[str, str] = {}
+    # field -> record class of the dict value / of each list item
+    NESTED: Dict[str, type] = {}
+    ITEMS: Dict[str, type] = {}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CompactRecord':
+        """Build a record from its JSON dict."""
+        record = cls.__new__(cls)
+        extra = None
+        for key in cls.FIELDS:
+            setattr(record, key, None)
+        for key, value in data.items():
+            # Values that would read back as an encoded form are kept as they are
+            if key in cls.FIELDS and not ((key in cls.LINES and isinstance(value, str)) or
+                                          (key in cls.SUFFIXES and isinstance(value, int))):
+                setattr(record, key, cls._pack(key, value))
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        for key, source in cls.SUFFIXES.items():
+            value, text = getattr(record, key), getattr(record, source)
+            if isinstance(value, str) and value and isinstance(text, str) and text.endswith(value):
+                setattr(record, key, len(text) - len(value))
+        keys = tuple(data)
+        record._shape = _SHAPES.setdefault(keys, keys)
+        record._extra = extra
+        return record
+    
+    @classmethod
+    def _pack(cls, key: str, value: Any) -> Any:
+        if isinstance(value, str):
+            return sys.intern(value) if key in cls.INTERNED else value
+        if isinstance(value, dict) and key in cls.NESTED:
+            return cls.NESTED[key].from_dict(value)
+        if isinstance(value, list):
+            if key in cls.LINES and all(isinstance(item, str) and '\n' not in item for item in value):
+                return '\n'.join(value) if value else ()
+            if key in cls.ITEMS:
+                item_class = cls.ITEMS[key]
+                return tuple(item_class.from_dict(item) if isinstance(item, dict) else item for item in value)
+            if key in cls.SEQUENCES:
+                return tuple(sys.intern(item) if key in cls.INTERNED and isinstance(item, str) else item
+                             for item in value)
+        return value
+    
+    @staticmethod
+    def _unpack(value: Any) -> Any:
+        if isinstance(value, CompactRecord):
+            return value.to_dict()
+        if isinstance(value, tuple):
+            return [item.to_dict() if isinstance(item, CompactRecord) else item for item in value]
+        return value
+    
+    def to_dict(self) -> Dict:
+        """The JSON dict this record was built from."""
+        return {key: self._unpack(self[key]) for key in self._shape}
+    
+    # Read access matching the dict form, for code written against it
+    def __getitem__(self, key: str) -> Any:
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        if key in self.FIELDS and key in self._shape:
+            value = getattr(self, key)
+            if key in self.LINES and isinstance(value, str):
+                return tuple(value.split('\n'))
+            if key in self.SUFFIXES and isinstance(value, int):
+                return getattr(self, self.SUFFIXES[key])[value:]
+            return value
+        raise KeyError(key)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._shape
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self._shape else default
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CompactRecord):
+            return NotImplemented
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class QuickWin(CompactRecord):
+    """One quick-win line: category, pattern and the original line."""
+    FIELDS = ('category', 'pattern', 'original')
+    __slots__ = FIELDS
+    INTERNED = frozenset({'category'})
+    # The pattern is the original line minus its category and bullet
+    SUFFIXES = {'pattern': 'original'}
+
+class SuperPrompt(CompactRecord):
+    """Parsed super-prompt structure."""
+    FIELDS = ('full_text', 'role', 'task', 'inputs', 'process', 'output', 'quality_checks')
+    __slots__ = FIELDS
+    LINES = frozenset({'inputs', 'process', 'quality_checks'})
+
+class FileRecord(CompactRecord):
+    """One file's extraction result (successful or failed)."""
+    FIELDS = ('filename', 'file_id', 'title', 'date', 'tags', 'domain', 'quality_score',
+              'super_prompt', 'quick_wins', 'lessons', 'extraction_success', 'word_count',
+              'time_budget_exceeded', 'skipped_stages', 'error')
+    __slots__ = FIELDS
+    INTERNED = frozenset({'date', 'tags', 'domain', 'quality_score', 'skipped_stages'})
+    SEQUENCES = frozenset({'tags', 'skipped_stages'})
+    LINES = frozenset({'lessons'})
+    NESTED = {'super_prompt': SuperPrompt}
+    ITEMS = {'quick_wins': QuickWin}
+
+def compact_record(data: Any) -> Optional[FileRecord]:
+    """A FileRecord for a result dict (records and None are returned as is)."""
+    if data is None or isinstance(data, FileRecord):
+        return data
+    return FileRecord.from_dict(data)
+
+def json_default(value: Any) -> Dict:
+    """json.dump(s) default= hook that writes compact records in their dict form."""
+    if isinstance(value, CompactRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,180 @@
+"""
+Per-file quality features and the rules that turn them into HIGH/MEDIUM/LOW.
+Extraction scores each file from the same feature counts it saves here, one
+NumPy column per feature, so trying other weights or tier thresholds is a
+vectorized pass over the saved columns instead of a re-extraction. NumPy is
+only needed for the store; scoring single files works without it.
+"""
+
+import io
+import json
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from output_writer import OutputWriter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# Configuration
+STORE_VERSION = 1
+FEATURE_COLUMNS = ('has_super_prompt', 'has_role', 'has_task', 'inputs', 'process', 'quality_checks',
+                   'quick_wins', 'lessons', 'word_count', 'prompt_length')
+# name -> (feature columns that must all reach minimum, minimum, points)
+SCORING_RULES: Dict[str, Tuple[Tuple[str, ...], int, int]] = {
+    'super_prompt': (('has_super_prompt',), 1, 3),
+    'role_and_task': (('has_role', 'has_task'), 1, 2),
+    'inputs': (('inputs',), 3, 1),
+    'process': (('process',), 3, 1),
+    'quality_checks': (('quality_checks',), 1, 1),
+    'quick_wins': (('quick_wins',), 3, 1),
+    'many_quick_wins': (('quick_wins',), 5, 1),
+    'lessons': (('lessons',), 3, 1),
+}
+# Minimum score per tier, highest first; anything below is LOW
+TIER_THRESHOLDS: Tuple[Tuple[str, int], ...] = (('HIGH', 8), ('MEDIUM', 4))
+TIERS = ('HIGH', 'MEDIUM', 'LOW')
+
+def features_path(output_path: Path) -> Path:
+    """Feature store next to an extraction output: data.json -> data.features.npz."""
+    return output_path.with_name(output_path.stem + '.features.npz')
+
+def quality_features(super_prompt, quick_wins, lessons, word_count: int = 0) -> Dict[str, int]:
+    """Feature counts of one file's extracted components."""
+    super_prompt = super_prompt or {}
+    return {
+        'has_super_prompt': int(bool(super_prompt)),
+        'has_role': int(bool(super_prompt.get('role'))),
+        'has_task': int(bool(super_prompt.get('task'))),
+        'inputs': len(super_prompt.get('inputs') or ()),
+        'process': len(super_prompt.get('process') or ()),
+        'quality_checks': len(super_prompt.get('quality_checks') or ()),
+        'quick_wins': len(quick_wins or ()),
+        'lessons': len(lessons or ()),
+        'word_count': word_count or 0,
+        'prompt_length': len(super_prompt.get('full_text') or ''),
+    }
+
+def score_features(features: Dict[str, int], rules: Dict = SCORING_RULES) -> int:
+    """Points one file earns under the scoring rules."""
+    return sum(points for columns, minimum, points in rules.values()
+               if all(features[column] >= minimum for column in columns))
+
+def quality_tier(score: int, thresholds: Tuple[Tuple[str, int], ...] = TIER_THRESHOLDS) -> str:
+    """HIGH, MEDIUM or LOW for a score."""
+    for tier, minimum in thresholds:
+        if score >= minimum:
+            return tier
+    return 'LOW'
+
+def feature_row(record) -> Tuple:
+    """(filename, success, domain, stored tier, features) of one extraction record."""
+    success = bool(record.get('extraction_success'))
+    features = quality_features(record.get('super_prompt'), record.get('quick_wins'),
+                                record.get('lessons'), record.get('word_count'))
+    return record.get('filename'), success, record.get('domain', 'unknown'), record.get('quality_score'), features
+
+class FeatureStore:
+    """Feature columns for a whole corpus, with vectorized rescoring."""
+    
+    def __init__(self, filenames: List[str], domains: List[str], columns: Dict[str, 'np.ndarray'],
+                 domain_codes: 'np.ndarray', stored_tiers: 'np.ndarray', success: 'np.ndarray'):
+        self.filenames = filenames
+        self.domains = domains
+        self.columns = columns
+        self.domain_codes = domain_codes
+        self.stored_tiers = stored_tiers
+        self.success = success
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple]) -> 'FeatureStore':
+        """Build the columns from feature_row tuples."""
+        filenames, domain_codes, stored_tiers, success = [], [], [], []
+        values = {column: [] for column in FEATURE_COLUMNS}
+        domain_index: Dict[str, int] = {}
+        for filename, ok, domain, tier, features in rows:
+            filenames.append(filename)
+            success.append(ok)
+            domain_codes.append(domain_index.setdefault(domain, len(domain_index)))
+            stored_tiers.append(TIERS.index(tier) if tier in TIERS else -1)
+            for column in FEATURE_COLUMNS:
+                values[column].append(features[column])
+        
+        columns = {column: np.array(values[column], dtype=np.int32) for column in FEATURE_COLUMNS}
+        return cls(filenames, list(domain_index), columns, np.array(domain_codes, dtype=np.int32),
+                   np.array(stored_tiers, dtype=np.int8), np.array(success, dtype=bool))
+    
+    @classmethod
+    def from_records(cls, records: Iterable) -> 'FeatureStore':
+        """Build the columns from extraction records."""
+        return cls.from_rows(feature_row(record) for record in records)
+    
+    def __len__(self) -> int:
+        return len(self.filenames)
+    
+    def save(self, path: Path, writer: OutputWriter) -> bool:
+        """Save as .npz, one array per feature column."""
+        meta = {'version': STORE_VERSION, 'filenames': self.filenames, 'domains': self.domains}
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer, meta=np.array(json.dumps(meta)), domain_codes=self.domain_codes,
+            stored_tiers=self.stored_tiers, success=self.success,
+            **{f"feature_{column}": values for column, values in self.columns.items()}
+        )
+        return writer.write_bytes(path, buffer.getvalue())
+    
+    @classmethod
+    def load(cls, path: Path) -> Optional['FeatureStore']:
+        """Load a saved store, or None if it is missing or from another version."""
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data['meta']))
+                if meta.get('version') != STORE_VERSION:
+                    return None
+                columns = {column: data[f"feature_{column}"] for column in FEATURE_COLUMNS}
+                return cls(meta['filenames'], meta['domains'], columns, data['domain_codes'],
+                           data['stored_tiers'], data['success'])
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+    
+    def scores(self, rules: Dict = SCORING_RULES) -> 'np.ndarray':
+        """Score of every file under the rules."""
+        total = np.zeros(len(self), dtype=np.int32)
+        for columns, minimum, points in rules.values():
+            passed = self.columns[columns[0]] >= minimum
+            for column in columns[1:]:
+                passed &= self.columns[column] >= minimum
+            total += passed * np.int32(points)
+        return total
+    
+    def tiers(self, rules: Dict = SCORING_RULES,
+              thresholds: Tuple[Tuple[str, int], ...] = TIER_THRESHOLDS) -> 'np.ndarray':
+        """Tier index (into TIERS) of every file; -1 for failed extractions."""
+        scores = self.scores(rules)
+        # First threshold reached wins, as in quality_tier
+        tiers = np.select([scores >= minimum for _, minimum in thresholds],
+                          [np.int8(TIERS.index(tier)) for tier, _ in thresholds], np.int8(TIERS.index('LOW')))
+        return np.where(self.success, tiers, np.int8(-1))
+    
+    def tier_counts(self, tiers: 'np.ndarray') -> Dict[str, int]:
+        """Files per tier."""
+        counts = np.bincount(tiers[tiers >= 0], minlength=len(TIERS))
+        return {tier: int(count) for tier, count in zip(TIERS, counts)}
+    
+    def domain_counts(self) -> Dict[str, int]:
+        """Successfully extracted files per domain."""
+        counts = np.bincount(self.domain_codes[self.success], minlength=len(self.domains))
+        return {domain: int(count) for domain, count in zip(self.domains, counts) if count}
+    
+    def domain_tier_counts(self, tiers: 'np.ndarray') -> Dict[str, Dict[str, int]]:
+        """Files per tier within each domain."""
+        valid = tiers >= 0
+        cells = np.bincount(self.domain_codes[valid] * len(TIERS) + tiers[valid],
+                            minlength=len(self.domains) * len(TIERS)).reshape(-1, len(TIERS))
+        return {domain: {tier: int(count) for tier, count in zip(TIERS, row)}
+                for domain, row in zip(self.domains, cells) if row.any()}
@@ -0,0 +1,175 @@
+"""
+Change notification for a directory of insights files (watch mode).
+Uses inotify on Linux, through libc so no extra packages are needed, and
+falls back to polling file sizes and mtimes everywhere else. Watchers only
+report which file names may have changed; callers compare against what
+they already know to tell additions, edits and deletions apart. Both raise
+FileNotFoundError if the directory itself is deleted or moved away.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from fnmatch import fnmatch
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+# Configuration
+WATCH_PATTERN = '*.md'
+POLL_INTERVAL = 2.0
+# Quiet period that ends a batch, so a burst of saves is handled once
+SETTLE_SECONDS = 0.5
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+READ_SIZE = 64 * 1024
+
+def is_watched_name(name: str, pattern: str = WATCH_PATTERN) -> bool:
+    """Whether a file name is one the pipeline reads (same rules as Path.glob)."""
+    return fnmatch(name, pattern)
+
+def scan(directory: str, pattern: str = WATCH_PATTERN) -> Dict[str, Tuple[int, int]]:
+    """Map each matching file name to its (size, mtime_ns) signature."""
+    signatures = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if is_watched_name(entry.name, pattern) and entry.is_file():
+                stat = entry.stat()
+                signatures[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    return signatures
+
+class PollingWatcher:
+    """Rescan the directory every interval and report names whose signature changed."""
+    
+    kind = 'polling'
+    
+    def __init__(self, directory: str, pattern: str = WATCH_PATTERN, interval: float = POLL_INTERVAL):
+        self.directory = directory
+        self.pattern = pattern
+        self.interval = interval
+        self.snapshot = scan(directory, pattern)
+    
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """Block until something changes or timeout passes; return the changed names."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+            current = scan(self.directory, self.pattern)
+            changed = {name for name in current.keys() | self.snapshot.keys()
+                       if current.get(name) != self.snapshot.get(name)}
+            self.snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+    
+    def close(self) -> None:
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class InotifyWatcher:
+    """Report names from inotify events; None from wait() means events were lost and a full rescan is needed."""
+    
+    kind = 'inotify'
+    
+    def __init__(self, directory: str, pattern: str = WATCH_PATTERN):
+        self.directory = directory
+        self.pattern = pattern
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+    
+    def read_events(self) -> Optional[Set[str]]:
+        """Drain pending events into a set of matching names (None on queue overflow)."""
+        changed: Optional[Set[str]] = set()
+        while True:
+            try:
+                buffer = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                _, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(buffer[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    raise FileNotFoundError(f"Watched directory went away: {self.directory}")
+                if mask & IN_Q_OVERFLOW:
+                    changed = None
+                elif changed is not None and is_watched_name(name, self.pattern):
+                    changed.add(name)
+    
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """Block until events arrive or timeout passes; return the changed names."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        return self.read_events()
+    
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def wait_for_directory(directory: str, interval: float = POLL_INTERVAL) -> None:
+    """Block until directory exists again (after it was deleted or moved away)."""
+    while not os.path.isdir(directory):
+        time.sleep(interval)
+
+def open_watcher(directory: str, pattern: str = WATCH_PATTERN, interval: float = POLL_INTERVAL,
+                 polling: bool = False):
+    """inotify where the platform has it, otherwise (or if polling) a PollingWatcher."""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory, pattern)
+        except (OSError, AttributeError):  # no inotify in this libc, or watch limit reached
+            pass
+    return PollingWatcher(directory, pattern, interval)
+
+def iter_batches(watcher, settle: float = SETTLE_SECONDS) -> Iterator[Optional[Set[str]]]:
+    """Yield sets of changed names, each once the directory has been quiet for settle seconds.
+
+    A None batch means the watcher lost track and the caller should rescan.
+    """
+    while True:
+        batch = watcher.wait()
+        while True:
+            more = watcher.wait(settle)
+            if more is None:
+                batch = None
+            elif not more:
+                break
+            elif batch is not None:
+                batch |= more
+        if batch is None or batch:
+            yield batch
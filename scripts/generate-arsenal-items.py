@@ -4,18 +4,29 @@ Generate Arsenal items from extracted insights data.
 Creates prompt files, updates patterns library, and tracking logs.
 """
 
-import json
-import re
+import argparse
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
-from collections import defaultdict
+
+from insights_core import (
+    DASH_RUN_PATTERN, INPUT_VAR_PATTERN, LEGACY_PATTERNS_SECTION_PATTERN, PATTERNS_SECTION_PATTERN,
+    SLUG_STRIP_PATTERN, WHITESPACE_PATTERN, iter_extraction_records, parse_tags,
+)
+from keyword_taxonomy import load_classifier
+from metrics import Metrics, metrics_path
+from output_writer import OutputWriter
+from pattern_index import PatternIndex
+from template_engine import load_template, render_batch
 
 # Configuration
 EXTRACTED_DATA_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\scripts\all-extracted-data.json"
 PROMPT_ARSENAL_DIR = r"C:\Users\theca\CascadeProjects\prompt-arsenal"
 PATTERNS_LIBRARY_FILE = r"C:\Users\theca\CascadeProjects\windsurf-memories-arsenal\prompt-engineering\prompt-patterns-library.md"
+PROMPT_TEMPLATE = 'prompt.v1.md'
 TRACKING_LOG_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\examples\meta-prompting\insights-tracking-log.md"
+PATTERN_INDEX_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\scripts\quick-win-pattern-index.json"
+LIBRARY_TOP_PATTERNS = 20
 
 # Domain to directory mapping for prompts
 DOMAIN_DIRS = {
@@ -32,56 +43,47 @@ DOMAIN_DIRS = {
     'general': 'meta-prompting'
 }
 
-def load_extraction_data() -> Dict:
-    """Load the extracted insights JSON."""
-    with open(EXTRACTED_DATA_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+# Pattern category keywords in priority order (see keyword-taxonomy.json)
+classify_pattern = load_classifier('pattern_categories')
+
+# Atomic write-if-changed output for every file this script produces
+output_writer = OutputWriter()
+
+# Optional per-stage timing (--metrics); nothing is wrapped unless enabled
+metrics = Metrics()
 
-def deduplicate_quick_wins(all_files: List[Dict]) -> List[Dict]:
-    """Deduplicate quick win patterns across all files."""
+def deduplicate_quick_wins(pattern_index: PatternIndex, similarity_threshold: Optional[float] = None) -> List[Dict]:
+    """Deduplicate quick win patterns across all indexed files.
+
+    Patterns are always merged when their normalized text is identical. With
+    a similarity_threshold (0-1), reworded variants whose shingle similarity
+    reaches it are merged as well. Each unique pattern keeps the chosen
+    wording's source_file and original line, its occurrence_count and its
+    source_files (one entry per occurrence).
+    """
     print("🔄 Deduplicating Quick Win patterns...")
     
-    # Group similar patterns
-    pattern_groups = defaultdict(list)
-    
-    for file_data in all_files:
-        if not file_data.get('extraction_success'):
-            continue
-        
-        for qw in file_data.get('quick_wins', []):
-            pattern = qw['pattern'].lower().strip('"')
-            
-            # Normalize for comparison
-            normalized = re.sub(r'\{[^}]+\}', '{VAR}', pattern)
-            normalized = re.sub(r'\s+', ' ', normalized)
-            
-            pattern_groups[normalized].append({
-                'pattern': qw['pattern'],
-                'category': qw.get('category'),
-                'source_file': file_data['filename'],
-                'original': qw['original']
-            })
-    
-    # Select best version of each pattern
     unique_patterns = []
-    for normalized, instances in pattern_groups.items():
-        # Prefer patterns with category
-        with_category = [p for p in instances if p['category']]
-        if with_category:
-            best = with_category[0]
-        else:
-            best = instances[0]
-        
-        # Add source count
-        best['occurrence_count'] = len(instances)
-        best['source_files'] = [p['source_file'] for p in instances]
-        unique_patterns.append(best)
-    
-    print(f"   {len(pattern_groups)} unique patterns from {sum(len(g) for g in pattern_groups.values())} total")
-    print(f"   Reduction: {100 - (len(pattern_groups) / sum(len(g) for g in pattern_groups.values()) * 100):.0f}% deduplication\n")
-    
-    # Sort by occurrence count
-    unique_patterns.sort(key=lambda x: x['occurrence_count'], reverse=True)
+    for entry in pattern_index.unique_patterns(similarity_threshold):
+        wording = (entry['pattern'], entry['category'])
+        source_file = min(filename for filename, source in entry['sources'].items()
+                          if (source['pattern'], source['category']) == wording)
+        unique_patterns.append({
+            'pattern': entry['pattern'],
+            'category': entry['category'],
+            'source_file': source_file,
+            'original': entry['sources'][source_file]['original'],
+            'occurrence_count': entry['count'],
+            'source_files': [filename for filename in sorted(entry['sources'])
+                             for _ in range(entry['sources'][filename]['occurrences'])]
+        })
+    
+    total = sum(p['occurrence_count'] for p in unique_patterns)
+    print(f"   {len(unique_patterns)} unique patterns from {total} total")
+    if total:
+        print(f"   Reduction: {100 - (len(unique_patterns) / total * 100):.0f}% deduplication\n")
+    else:
+        print()
     
     return unique_patterns
 
@@ -90,36 +92,14 @@ def categorize_pattern(pattern: str, existing_category: str = None) -> str:
     if existing_category:
         return existing_category
     
-    pattern_lower = pattern.lower()
-    
-    # Pattern category detection
-    if any(kw in pattern_lower for kw in ['clarify', 'confirm', 'what', 'which', 'scope']):
-        return 'Clarify'
-    elif any(kw in pattern_lower for kw in ['format', 'output', 'structure', 'markdown', 'table']):
-        return 'Constrain'
-    elif any(kw in pattern_lower for kw in ['score', 'check', 'verify', 'validate', 'review']):
-        return 'Evaluate'
-    elif any(kw in pattern_lower for kw in ['refactor', 'improve', 'enhance', 'upgrade']):
-        return 'Refine'
-    elif any(kw in pattern_lower for kw in ['citation', 'source', 'reference', 'evidence']):
-        return 'Verify'
-    elif any(kw in pattern_lower for kw in ['compare', 'contrast', 'difference', 'alternative']):
-        return 'Compare'
-    elif any(kw in pattern_lower for kw in ['export', 'save', 'output', 'generate file']):
-        return 'Export'
-    elif any(kw in pattern_lower for kw in ['prioritize', 'order', 'rank', 'sort']):
-        return 'Prioritize'
-    elif any(kw in pattern_lower for kw in ['safety', 'warn', 'flag', 'caution']):
-        return 'Safety'
-    else:
-        return 'Other'
+    return classify_pattern(pattern)
 
 def generate_prompt_filename(title: str, domain: str) -> str:
     """Generate appropriate filename for a prompt."""
     # Clean title
-    title_clean = re.sub(r'[^\w\s-]', '', title.lower())
-    title_clean = re.sub(r'\s+', '-', title_clean)
-    title_clean = re.sub(r'-+', '-', title_clean)
+    title_clean = SLUG_STRIP_PATTERN.sub('', title.lower())
+    title_clean = WHITESPACE_PATTERN.sub('-', title_clean)
+    title_clean = DASH_RUN_PATTERN.sub('-', title_clean)
     title_clean = title_clean.strip('-')
     
     # Limit length
@@ -128,28 +108,12 @@ def generate_prompt_filename(title: str, domain: str) -> str:
     
     return f"{title_clean}.md"
 
-def create_prompt_file(file_data: Dict, output_dir: Path) -> Path:
-    """Generate a prompt file from extracted super-prompt."""
-    super_prompt = file_data['super_prompt']
-    
-    # Generate prompt ID
-    prompt_id = f"prm.{file_data['file_id'][:8]}"
-    
-    # Determine appropriate directory
-    domain = file_data.get('domain', 'general')
-    subdir = DOMAIN_DIRS.get(domain, 'meta-prompting')
-    prompt_dir = output_dir / subdir
-    prompt_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Generate filename from title
-    filename = generate_prompt_filename(file_data['title'], domain)
-    filepath = prompt_dir / filename
-    
-    # Extract variables from inputs
+def extract_prompt_variables(super_prompt: Dict) -> List[Dict]:
+    """Extract template variables from super-prompt inputs."""
     variables = []
     for inp in super_prompt.get('inputs', []):
         # Look for {VAR} or {{VAR}} patterns
-        var_matches = re.findall(r'\{([A-Z_]+)\}', inp)
+        var_matches = INPUT_VAR_PATTERN.findall(inp)
         for var in var_matches:
             if not any(v['name'] == var.lower() for v in variables):
                 variables.append({
@@ -158,179 +122,209 @@ def create_prompt_file(file_data: Dict, output_dir: Path) -> Path:
                     'description': f"Extracted from: {inp[:50]}"
                 })
     
-    # Build prompt content
-    content = f"""---
-id: {prompt_id}
-type: prompt
-title: {file_data['title']}
-tags: [{', '.join(file_data.get('tags', [])[:5])}]
-role: user
-summary: Extracted from conversation analysis - {file_data['title']}
-vars:"""
+    return variables
+
+def prompt_context(file_data: Dict) -> Dict:
+    """Build the placeholder values for the prompt template."""
+    super_prompt = file_data['super_prompt']
+    variables = extract_prompt_variables(super_prompt)
     
     if variables:
-        for var in variables[:5]:  # Limit to 5 variables
-            content += f"\n  - {{ name: {var['name']}, required: {str(var['required']).lower()}, description: \"{var['description']}\" }}"
+        vars_block = ''.join(
+            f"\n  - {{ name: {var['name']}, required: {str(var['required']).lower()}, description: \"{var['description']}\" }}"
+            for var in variables[:5]  # Limit to 5 variables
+        )
     else:
-        content += "\n  []"
-    
-    content += f"""
-version: 1
-source_insights: {file_data['filename']}
----
-
-# {file_data['title']}
-
-**Extracted from conversation analysis on {file_data.get('date', 'Unknown')}.**
-
----
-
-## 🎯 The Complete Prompt
-
-```markdown
-{super_prompt['full_text']}
-```
-
----
-
-## 📋 When to Use
-
-**Apply this prompt when:**
-{chr(10).join('- ✅ ' + lesson for lesson in file_data.get('lessons', [])[:5])}
-
----
-
-## 🔧 Prompt Structure
-
-"""
+        vars_block = "\n  []"
     
+    structure = []
     if super_prompt.get('role'):
-        content += f"**Role:** {super_prompt['role']}\n\n"
-    
+        structure.append(f"**Role:** {super_prompt['role']}\n\n")
     if super_prompt.get('task'):
-        content += f"**Task:** {super_prompt['task']}\n\n"
-    
-    if super_prompt.get('inputs'):
-        content += "**Inputs:**\n"
-        for inp in super_prompt['inputs'][:7]:
-            content += f"{inp}\n"
-        content += "\n"
-    
-    if super_prompt.get('process'):
-        content += "**Process:**\n"
-        for step in super_prompt['process'][:7]:
-            content += f"{step}\n"
-        content += "\n"
-    
-    if super_prompt.get('quality_checks'):
-        content += "**Quality Checks:**\n"
-        for check in super_prompt['quality_checks']:
-            content += f"{check}\n"
-        content += "\n"
-    
-    content += """---
-
-## 🔗 Related Arsenal Items
-
-**💭 Memories:**
-- [Prompt Patterns Library](https://github.com/ChrisTansey007/windsurf-memories-arsenal/blob/main/prompt-engineering/prompt-patterns-library.md) - Pattern catalog
-
-**⚙️ Rules:**
-- [Prompt Quality Standards](https://github.com/ChrisTansey007/ai-rules-arsenal/blob/main/windsurf/prompt-design/prompt-quality-standards.md) - 5-D framework
-
----
-
-## 📖 Source
+        structure.append(f"**Task:** {super_prompt['task']}\n\n")
+    for label, key, limit in (('Inputs', 'inputs', 7), ('Process', 'process', 7), ('Quality Checks', 'quality_checks', None)):
+        if super_prompt.get(key):
+            items = super_prompt[key][:limit]
+            structure.append(f"**{label}:**\n" + ''.join(f"{item}\n" for item in items) + "\n")
+    
+    return {
+        'prompt_id': f"prm.{file_data['file_id'][:8]}",
+        'title': file_data['title'],
+        'tags': ', '.join(parse_tags(file_data.get('tags'))[:5]),
+        'vars': vars_block,
+        'filename': file_data['filename'],
+        'date': file_data.get('date', 'Unknown'),
+        'full_text': super_prompt['full_text'],
+        'when_to_use': '\n'.join('- ✅ ' + lesson for lesson in file_data.get('lessons', [])[:5]),
+        'structure': ''.join(structure),
+        'domain': file_data.get('domain', 'general'),
+        'quality_score': file_data.get('quality_score', 'Unknown')
+    }
 
-**Extracted from:** {file_data['filename']}  
-**Original conversation:** {file_data.get('date', 'Unknown')}  
-**Domain:** {domain}  
-**Quality score:** {file_data.get('quality_score', 'Unknown')}
+def render_prompt(file_data: Dict) -> str:
+    """Render one prompt document from the versioned prompt template."""
+    return load_template(PROMPT_TEMPLATE)(prompt_context(file_data))
 
----
+def render_prompts(records: Iterable[Dict]) -> List[str]:
+    """Render a batch of prompt documents with one compiled template."""
+    return render_batch(load_template(PROMPT_TEMPLATE), (prompt_context(record) for record in records))
 
-**Result: Production-ready prompt from analyzed conversation!** 🚀
-"""
+def create_prompt_file(file_data: Dict, output_dir: Path) -> Path:
+    """Generate a prompt file from extracted super-prompt."""
+    # Determine appropriate directory
+    domain = file_data.get('domain', 'general')
+    subdir = DOMAIN_DIRS.get(domain, 'meta-prompting')
+    prompt_dir = output_dir / subdir
+    prompt_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Generate filename from title
+    filename = generate_prompt_filename(file_data['title'], domain)
+    filepath = prompt_dir / filename
+    
+    # Render prompt content
+    content = render_prompt(file_data)
     
-    # Write file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
+    # Write file (atomically, skipped if nothing changed)
+    output_writer.write_text(filepath, content)
     
     return filepath
 
-def update_patterns_library(unique_patterns: List[Dict]) -> None:
-    """Append unique patterns to the patterns library."""
-    print("📚 Updating Patterns Library...")
-    
-    # Read current library
-    with open(PATTERNS_LIBRARY_FILE, 'r', encoding='utf-8') as f:
-        library_content = f.read()
+def build_patterns_section(unique_patterns: List[Dict], source_threads: int,
+                           top_n: int = LIBRARY_TOP_PATTERNS) -> str:
+    """Render the bulk-extraction section of the patterns library from the deduplicated patterns."""
+    section = "<!-- bulk-extraction-patterns:start -->\n"
+    section += "## 🆕 Patterns from Bulk Extraction\n\n"
+    section += f"**Source:** {source_threads} analyzed conversation threads  \n"
+    section += f"**Extracted:** {len(unique_patterns)} unique patterns after deduplication  \n"
     
-    # Group patterns by category
-    categorized = defaultdict(list)
-    for pattern in unique_patterns:
+    # Add top patterns by occurrence
+    for i, pattern in enumerate(unique_patterns[:top_n], 1):
         category = categorize_pattern(pattern['pattern'], pattern.get('category'))
-        categorized[category].append(pattern)
-    
-    # Find insertion point (before "Contributing New Patterns" section)
-    insertion_marker = "## 🌱 Contributing New Patterns"
-    if insertion_marker not in library_content:
-        print("   ⚠️  Could not find insertion point in patterns library")
-        return
+        section += f"\n### Pattern {i}: {pattern['pattern'][:60]}...\n"
+        section += f"```\n{pattern['pattern']}\n```\n"
+        section += f"- **Category:** {category}\n"
+        section += f"- **Occurrences:** {pattern['occurrence_count']} threads\n"
+        section += f"- **Source threads:** {len(set(pattern['source_files']))}\n"
     
-    # Build new patterns section
-    new_content = "\n\n## 🆕 Patterns from Bulk Extraction (2025-10-21)\n\n"
-    new_content += f"**Source:** 43 analyzed conversation threads  \n"
-    new_content += f"**Extracted:** {len(unique_patterns)} unique patterns after deduplication  \n\n"
-    
-    # Add top patterns by occurrence
-    top_patterns = sorted(unique_patterns, key=lambda x: x['occurrence_count'], reverse=True)[:20]
+    return section + "<!-- bulk-extraction-patterns:end -->"
+
+def update_patterns_library(unique_patterns: List[Dict], source_threads: int,
+                            top_n: int = LIBRARY_TOP_PATTERNS) -> bool:
+    """Regenerate the bulk-extraction section of the patterns library.
+
+    The section sits between marker comments and is replaced in place, so
+    repeat runs rewrite it rather than adding another copy. Returns whether
+    the library changed.
+    """
+    print("📚 Updating Patterns Library...")
     
-    for i, pattern in enumerate(top_patterns, 1):
-        category = categorize_pattern(pattern['pattern'], pattern.get('category'))
-        content += f"\n### Pattern {i}: {pattern['pattern'][:60]}...\n"
-        content += f"```\n{pattern['pattern']}\n```\n"
-        content += f"- **Category:** {category}\n"
-        content += f"- **Occurrences:** {pattern['occurrence_count']} threads\n"
-        content += f"- **Source threads:** {len(pattern['source_files'])}\n\n"
-    
-    # Insert before the contributing section
-    updated_content = library_content.replace(
-        insertion_marker,
-        new_content + insertion_marker
-    )
-    
-    # Write back
-    with open(PATTERNS_LIBRARY_FILE, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
-    
-    print(f"   ✅ Added {len(top_patterns)} top patterns to library\n")
+    # Read current library
+    try:
+        with open(PATTERNS_LIBRARY_FILE, 'r', encoding='utf-8') as f:
+            library_content = f.read()
+    except FileNotFoundError:
+        print(f"   ⚠️  Patterns library not found: {PATTERNS_LIBRARY_FILE}\n")
+        return False
+    
+    section = build_patterns_section(unique_patterns, source_threads, top_n)
+    
+    if PATTERNS_SECTION_PATTERN.search(library_content):
+        updated_content = PATTERNS_SECTION_PATTERN.sub(lambda m: section, library_content, count=1)
+    elif LEGACY_PATTERNS_SECTION_PATTERN.search(library_content):
+        # Replace the unmarked section earlier versions inserted
+        updated_content = LEGACY_PATTERNS_SECTION_PATTERN.sub(lambda m: section + "\n\n", library_content, count=1)
+    else:
+        # Find insertion point (before "Contributing New Patterns" section)
+        insertion_marker = "## 🌱 Contributing New Patterns"
+        if insertion_marker not in library_content:
+            print("   ⚠️  Could not find insertion point in patterns library\n")
+            return False
+        updated_content = library_content.replace(insertion_marker, section + "\n\n" + insertion_marker, 1)
+    
+    # Write back (atomically, skipped if nothing changed)
+    changed = output_writer.write_text(PATTERNS_LIBRARY_FILE, updated_content)
+    
+    shown = min(top_n, len(unique_patterns))
+    print(f"   ✅ Top {shown} of {len(unique_patterns)} patterns "
+          f"{'written to' if changed else 'already up to date in'} library\n")
+    return changed
+
+def enable_metrics() -> None:
+    """Time dedup, rendering and file generation, and each prompt file."""
+    metrics.instrument(globals(), [
+        'deduplicate_quick_wins', 'render_prompt', 'create_prompt_file', 'update_patterns_library'
+    ], items={'create_prompt_file': lambda file_data, output_dir: file_data['filename']})
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Generate Arsenal items from extracted insights data.")
+    parser.add_argument('--input', default=EXTRACTED_DATA_FILE, metavar='PATH',
+                        help="extraction data, .json or streamed .jsonl (default: %(default)s)")
+    parser.add_argument('--domain', action='append', metavar='DOMAIN',
+                        help="only generate prompts for this domain (repeatable)")
+    parser.add_argument('--similarity', type=float, metavar='T',
+                        help="also merge reworded quick wins with shingle similarity >= T (0 < T <= 1)")
+    parser.add_argument('--metrics', nargs='?', const='', metavar='PATH',
+                        help="record per-stage and per-prompt timings to PATH (default: <input>.generate.metrics.json)")
+    parser.add_argument('--pattern-index', default=PATTERN_INDEX_FILE, metavar='PATH',
+                        help="persistent quick-win pattern index merged into on every run (default: %(default)s)")
+    parser.add_argument('--additive', action='store_true',
+                        help="keep indexed files missing from the input (for a single --shard output); "
+                             "by default they are removed from the index")
+    parser.add_argument('--no-library', action='store_true',
+                        help="update the pattern index but leave the patterns library untouched")
+    args = parser.parse_args(argv)
+    if args.similarity is not None and not 0 < args.similarity <= 1:
+        parser.error(f"--similarity must be in (0, 1], got {args.similarity}")
+    return args
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main generation pipeline."""
+    args = parse_args(argv)
+    domains = set(args.domain) if args.domain else None
+    if args.metrics is not None:
+        enable_metrics()
+    
     print("🚀 ARSENAL GENERATION PIPELINE")
     print("=" * 70)
     print()
     
-    # Load data
+    # Stream records into the pattern index, which deduplication reads
     print("📂 Loading extraction data...")
-    data = load_extraction_data()
-    all_files = data['files']
-    high_quality = [f for f in all_files if f.get('quality_score') == 'HIGH']
-    
-    print(f"   {len(all_files)} files loaded")
-    print(f"   {len(high_quality)} HIGH-quality files to process\n")
+    counts = {'files': 0, 'high': 0, 'unchanged': 0, 'added': 0, 'updated': 0}
+    pattern_index_path = Path(args.pattern_index)
+    pattern_index = PatternIndex.load(pattern_index_path)
+    extracted = set()
+    
+    for record in iter_extraction_records(args.input):
+        counts['files'] += 1
+        if record.get('quality_score') == 'HIGH':
+            counts['high'] += 1
+        # Files merged before with the same quick wins are skipped by the index
+        if record.get('extraction_success'):
+            extracted.add(record['filename'])
+            counts[pattern_index.merge_file(record['filename'], record.get('quick_wins', []))] += 1
+    
+    # Files no longer in the extraction drop out, unless this is one shard of it
+    removed = [] if args.additive else pattern_index.prune(extracted)
+    
+    print(f"   {counts['files']} files loaded")
+    print(f"   {counts['high']} HIGH-quality files to process")
+    print(f"   Pattern index: {counts['added']} new, {counts['updated']} changed, "
+          f"{counts['unchanged']} already merged, {len(removed)} removed files; "
+          f"{len(pattern_index.patterns)} patterns\n")
+    pattern_index.save(pattern_index_path, output_writer)
     
     # Deduplicate quick wins
-    unique_patterns = deduplicate_quick_wins(all_files)
+    unique_patterns = deduplicate_quick_wins(pattern_index, args.similarity)
     
     # Generate prompt files for HIGH-quality items
-    print(f"📝 Generating {len(high_quality)} prompt files...\n")
+    print(f"📝 Generating prompt files...\n")
     
     prompt_arsenal_path = Path(PROMPT_ARSENAL_DIR)
     created_files = []
     
-    for file_data in high_quality:
+    for file_data in iter_extraction_records(args.input, quality={'HIGH'}, domains=domains):
         if not file_data.get('super_prompt'):
             print(f"   ⚠️  Skipping {file_data['filename']} - no super-prompt")
             continue
@@ -349,14 +343,20 @@ def main():
     print(f"\n✅ Created {len(created_files)} prompt files\n")
     
     # Update patterns library
-    # update_patterns_library(unique_patterns[:20])  # Top 20 patterns
+    if not args.no_library:
+        update_patterns_library(unique_patterns, len(pattern_index.files))
     
     # Summary
     print("📊 GENERATION SUMMARY")
     print("=" * 70)
     print(f"Prompt files created:     {len(created_files)}")
     print(f"Unique patterns found:    {len(unique_patterns)}")
-    print(f"Total source threads:     {len(all_files)}")
+    print(f"Total source threads:     {len(pattern_index.files)}")
+    print(f"💾 {output_writer.summary()}")
+    if metrics.enabled:
+        metrics_file = Path(args.metrics) if args.metrics else metrics_path(Path(args.input), 'generate')
+        metrics.write(metrics_file, 'generate-arsenal-items', output_writer)
+        print(f"⏱️  Timing metrics saved to: {metrics_file}")
     print()
     
     print("✅ GENERATION COMPLETE!")
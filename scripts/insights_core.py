@@ -0,0 +1,658 @@
+"""
+Shared parsing core for the insights extraction and generation scripts.
+Frontmatter parsing, section locators and precompiled patterns live here so
+every phase reads the insights files with the same rules.
+"""
+
+import codecs
+import heapq
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+# A document is either decoded text or a read-only memory map of UTF-8 bytes
+Document = Union[str, bytes, mmap.mmap]
+
+# Markdown structure
+FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---', re.DOTALL)
+TOKEN_PATTERN = re.compile(r'^(?:(#{2,}[^\n]*)|([ \t]*```[^\n]*)|(---))$', re.MULTILINE)
+
+# Byte-level equivalents for memory-mapped files (which keep CRLF line endings)
+BYTES_FRONTMATTER_PATTERN = re.compile(rb'^---\s*\n(.*?)\n---', re.DOTALL)
+BYTES_TOKEN_PATTERN = re.compile(rb'^(?:(#{2,}[^\r\n]*)|([ \t]*```[^\r\n]*)|(---))\r?$', re.MULTILINE)
+
+# Files at least this large are memory-mapped instead of read into a str
+MMAP_MIN_BYTES = 1 << 20
+WORD_COUNT_CHUNK = 1 << 20
+PROMPT_FENCE_LANGUAGES = {'markdown', 'text', 'yaml', ''}
+
+# Frontmatter
+FRONTMATTER_KEY_PATTERN = re.compile(r'^([^\s#:-][^:]*):(.*)$')
+FRONTMATTER_INT_PATTERN = re.compile(r'^-?(?:0|[1-9]\d*)$')
+MAX_FRONTMATTER_LINES = 500
+
+# Section heading variants, matched case-insensitively in priority order
+SUPER_PROMPT_HEADINGS = [
+    '## section 4: super-prompt',
+    '## 4) super-prompt',
+    '## 4. super-prompt',
+    '## super-prompt (reusable)',
+    '## super‑prompt',
+    '## super-prompt',
+]
+
+QUICK_WINS_HEADINGS = [
+    '## section 9: quick wins',
+    '## 9) quick wins',
+    '## 9. quick wins',
+    '## quick wins library',
+]
+
+LESSONS_HEADINGS = [
+    '## section 8: lessons',
+    '## 8) lessons',
+    '## 8. lessons',
+]
+
+# Super-prompt structure fields. Labels match case-sensitively anywhere in the
+# prompt; field bodies end at the first line that starts a new field.
+ROLE_LABELS = ('ROLE:', 'Role:')
+TASK_LABELS = ('TASK:', 'Task:', 'Objective:', 'OBJECTIVE:')
+INPUTS_LABELS = ('INPUTS:', 'Inputs:', 'INPUT:')
+PROCESS_LABELS = ('PROCESS', 'Process', 'CHECKLIST', 'Checklist')
+OUTPUT_LABELS = ('OUTPUT', 'Output')
+QUALITY_LABELS = ('QUALITY', 'Quality')
+FIELD_LABEL_LINE_PATTERN = re.compile(r'[A-Z]+:')
+TWO_WORD_LABEL_LINE_PATTERN = re.compile(r'[A-Z]+ [A-Z]+:')
+WHITESPACE_RUN_PATTERN = re.compile(r'\s*')
+NUMBERED_ITEM_PATTERN = re.compile(r'^\d+\.')
+NUMBERED_STEP_PATTERN = re.compile(r'^\d+[\.\)]')
+
+# Generation
+TEMPLATE_VAR_PATTERN = re.compile(r'\{[^}]+\}')
+INPUT_VAR_PATTERN = re.compile(r'\{([A-Z_]+)\}')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SLUG_STRIP_PATTERN = re.compile(r'[^\w\s-]')
+DASH_RUN_PATTERN = re.compile(r'-+')
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+# Cross-linking
+RELATED_SECTION_PATTERN = re.compile(r'## 🔗 Related Arsenal Items.*?(?=\n---|\n## |\Z)', re.DOTALL)
+RESULT_FOOTER_PATTERN = re.compile(r'(---\n\n\*\*Result:.*?\*\* 🚀)')
+ECOSYSTEM_SECTION_PATTERN = re.compile(r'---\s*\n\n## 🔗 Arsenal Ecosystem.*?(?=\n---\n\n##|\Z)', re.DOTALL)
+LICENSE_SECTION_PATTERN = re.compile(r'(---\s*\n\n## (?:📝 )?License)')
+
+# Patterns library: the generated section, and the unmarked one older runs inserted
+PATTERNS_SECTION_PATTERN = re.compile(
+    r'<!-- bulk-extraction-patterns:start -->.*?<!-- bulk-extraction-patterns:end -->', re.DOTALL
+)
+LEGACY_PATTERNS_SECTION_PATTERN = re.compile(
+    r'## 🆕 Patterns from Bulk Extraction.*?(?=## 🌱 Contributing New Patterns)', re.DOTALL
+)
+
+def parse_scalar(text: str) -> Any:
+    """Convert a YAML-style scalar to str, int, bool or None."""
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in '"\'':
+        inner = text[1:-1]
+        return inner.replace("''", "'") if text[0] == "'" else inner.replace('\\"', '"')
+    
+    lowered = text.lower()
+    if lowered == 'true':
+        return True
+    if lowered == 'false':
+        return False
+    if lowered in ('null', '~'):
+        return None
+    if FRONTMATTER_INT_PATTERN.match(text):
+        return int(text)
+    return text.strip("'\"")
+
+def split_inline_list(text: str) -> List[str]:
+    """Split the inside of a [a, "b, c"] list on commas outside quotes."""
+    items = []
+    current = []
+    quote = None
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == ',':
+            items.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    items.append(''.join(current).strip())
+    return [item for item in items if item]
+
+def parse_list_item(text: str) -> Any:
+    """Parse a list item, interning string values."""
+    value = parse_scalar(text)
+    return sys.intern(value) if isinstance(value, str) else value
+
+def parse_frontmatter_value(raw: str, block: List[str]) -> Any:
+    """Parse a frontmatter value from its first line and indented block."""
+    items = [line.strip() for line in block if line.strip()]
+    
+    # Block scalars: '|' keeps line breaks, '>' folds them
+    if raw in ('|', '|-', '|+', '>', '>-', '>+'):
+        return ('\n' if raw[0] == '|' else ' ').join(items)
+    
+    # Block list: "key:" followed by "- item" lines
+    if not raw and items and all(item.startswith('-') for item in items):
+        return [parse_list_item(item[1:].strip()) for item in items]
+    
+    # Multi-line plain or quoted value
+    if items:
+        raw = ' '.join([raw] + items).strip()
+    
+    if raw.startswith('[') and raw.endswith(']'):
+        return [parse_list_item(item) for item in split_inline_list(raw[1:-1])]
+    
+    return parse_scalar(raw)
+
+def parse_frontmatter_lines(lines: List[str]) -> Dict:
+    """Parse YAML-style frontmatter lines into typed values.
+
+    Supports quoted values, inline [a, b] lists, "- item" block lists,
+    '|'/'>' block scalars and indented continuation lines.
+    """
+    frontmatter = {}
+    i = 0
+    while i < len(lines):
+        match = FRONTMATTER_KEY_PATTERN.match(lines[i])
+        i += 1
+        if not match:
+            continue
+        
+        key = sys.intern(match.group(1).strip())
+        raw = match.group(2).strip()
+        
+        # Collect indented lines (and unindented "- item" lines of a block list)
+        block = []
+        while i < len(lines):
+            line = lines[i]
+            if line.strip() and not line[0].isspace() and not (not raw and line.startswith('-')):
+                break
+            block.append(line)
+            i += 1
+        
+        frontmatter[key] = parse_frontmatter_value(raw, block)
+    
+    return frontmatter
+
+def decode_text(data: bytes) -> str:
+    """Decode UTF-8 bytes with the same newline translation as text-mode reads."""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+def slice_text(content: Document, start: int, end: int) -> str:
+    """Return content[start:end] as text, decoding only that slice."""
+    chunk = content[start:end]
+    return chunk if isinstance(chunk, str) else decode_text(chunk)
+
+@contextmanager
+def open_document(filepath: Path) -> Iterator[Document]:
+    """Open a file for extraction.
+
+    Small files are read into a str. Files of MMAP_MIN_BYTES or more are
+    memory-mapped so the locators run on the bytes buffer and only the
+    returned section slices are decoded.
+    """
+    with open(filepath, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or size < MMAP_MIN_BYTES:
+            yield decode_text(f.read())
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+def count_words(content: Document) -> int:
+    """Count whitespace-separated words, streaming over byte buffers.
+
+    Matches len(content.split()) without materializing every word.
+    """
+    if isinstance(content, str):
+        return len(content.split())
+    
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    count = 0
+    in_word = False
+    for offset in range(0, len(content), WORD_COUNT_CHUNK):
+        text = decoder.decode(content[offset:offset + WORD_COUNT_CHUNK])
+        if not text:
+            continue
+        count += len(text.split())
+        # A word split across the chunk boundary was counted twice
+        if in_word and not text[0].isspace():
+            count -= 1
+        in_word = not text[-1].isspace()
+    return count
+
+def extract_frontmatter(content: Document) -> Dict:
+    """Extract YAML frontmatter."""
+    if isinstance(content, str):
+        match = FRONTMATTER_PATTERN.search(content)
+        header = match.group(1) if match else None
+    else:
+        match = BYTES_FRONTMATTER_PATTERN.search(content)
+        header = decode_text(match.group(1)) if match else None
+    
+    if header is None:
+        return {}
+    
+    return parse_frontmatter_lines(header.split('\n'))
+
+def read_frontmatter(filepath: Path) -> Dict:
+    """Read only the frontmatter header of a file, not the whole document."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        if f.readline().strip() != '---':
+            return {}
+        
+        lines = []
+        for line in f:
+            if line.startswith('---'):
+                return parse_frontmatter_lines(lines)
+            lines.append(line.rstrip('\r\n'))
+            if len(lines) >= MAX_FRONTMATTER_LINES:
+                break
+    
+    return {}
+
+def frontmatter_text(frontmatter: Dict, key: str, default: str = '') -> str:
+    """Return a frontmatter value as text, using default when missing or null."""
+    value = frontmatter.get(key)
+    return default if value is None else str(value)
+
+def parse_tags(value: Any) -> List[str]:
+    """Normalize a tags value (list or legacy "[a, b]" string) to a list."""
+    if value is None or value == '':
+        return []
+    if isinstance(value, list):
+        return [sys.intern(str(tag)) for tag in value]
+    
+    text = str(value).strip()
+    if text.startswith('[') and text.endswith(']'):
+        text = text[1:-1]
+    return [sys.intern(str(parse_scalar(tag))) for tag in split_inline_list(text)]
+
+def tokenize_document(content: Document) -> List[Tuple[str, int, int, str]]:
+    """Index headings, code fences and separators in a single pass.
+
+    Each token is (kind, start, end, text) where start/end delimit the
+    token's line (byte offsets for byte buffers). Heading text is
+    lowercased; fence text is the info string.
+    """
+    is_text = isinstance(content, str)
+    pattern = TOKEN_PATTERN if is_text else BYTES_TOKEN_PATTERN
+    
+    tokens = []
+    for match in pattern.finditer(content):
+        heading, fence, _ = match.groups()
+        if heading is not None:
+            heading = heading if is_text else heading.decode('utf-8', 'replace')
+            tokens.append(('heading', match.start(), match.end(), heading.lower()))
+        elif fence is not None:
+            fence = fence if is_text else fence.decode('utf-8', 'replace')
+            tokens.append(('fence', match.start(), match.end(), fence.strip()[3:].strip()))
+        else:
+            tokens.append(('separator', match.start(), match.end(), ''))
+    return tokens
+
+def parse_document(content: Document) -> Dict:
+    """Parse frontmatter and the section index once for a whole file."""
+    return {
+        'frontmatter': extract_frontmatter(content),
+        'tokens': tokenize_document(content)
+    }
+
+def find_section(tokens: List[Tuple[str, int, int, str]], headings: List[str],
+                 content_length: int) -> Optional[Tuple[int, int, int]]:
+    """Locate a section body by heading variant.
+
+    Returns (token_index, body_start, body_end). The body runs from the line
+    after the heading to the next '## ' heading or '---' separator.
+    """
+    for heading in headings:
+        for i, (kind, _, end, text) in enumerate(tokens):
+            if kind != 'heading' or heading not in text:
+                continue
+            body_end = content_length
+            for next_kind, next_start, _, next_text in tokens[i + 1:]:
+                if next_kind == 'separator' or (next_kind == 'heading' and next_text.startswith('## ')):
+                    body_end = next_start
+                    break
+            return i, min(end + 1, content_length), body_end
+    return None
+
+def find_code_block(content: Document, tokens: List[Tuple[str, int, int, str]],
+                    section: Tuple[int, int, int],
+                    languages: Optional[Set[str]] = None) -> Optional[str]:
+    """Return the body of the first fenced code block inside a section."""
+    index, body_start, body_end = section
+    opener = None
+    for kind, start, end, info in tokens[index + 1:]:
+        if start >= body_end:
+            break
+        if kind != 'fence':
+            continue
+        if opener is not None:
+            return slice_text(content, opener, start)
+        if languages is None or info in languages:
+            opener = end + 1
+    return None
+
+class TimeBudgetExceeded(Exception):
+    """A parsing loop ran past the file's time budget."""
+
+def check_deadline(deadline: Optional[float]) -> None:
+    """Raise TimeBudgetExceeded once time.perf_counter() is past deadline (None: no budget)."""
+    if deadline is not None and time.perf_counter() > deadline:
+        raise TimeBudgetExceeded()
+
+def iter_label_positions(text: str, labels: Tuple[str, ...]) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) of every label occurrence in text, leftmost first.
+
+    Each label's next occurrence is found once and merged, so the whole
+    text is scanned at most once per label.
+    """
+    heap = []
+    for label in labels:
+        pos = text.find(label)
+        if pos != -1:
+            heap.append((pos, label))
+    heapq.heapify(heap)
+    
+    while heap:
+        pos, label = heap[0]
+        yield pos, pos + len(label)
+        next_pos = text.find(label, pos + 1)
+        if next_pos == -1:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (next_pos, label))
+
+def block_start(text: str, pos: int) -> int:
+    """Start of a field body that must begin on a new line, or -1.
+
+    The whitespace run at pos must contain a newline; the body starts
+    after the last one.
+    """
+    run_end = WHITESPACE_RUN_PATTERN.match(text, pos).end()
+    newline = text.rfind('\n', pos, run_end)
+    return newline + 1 if newline != -1 else -1
+
+def inline_break(text: str, newline: int) -> bool:
+    """A blank line or an 'UPPER:' line ends an inline field (ROLE, TASK)."""
+    return text.startswith('\n', newline + 1) or FIELD_LABEL_LINE_PATTERN.match(text, newline + 1) is not None
+
+def block_break(text: str, newline: int) -> bool:
+    """A blank line then 'UPPER:', or an 'UPPER UPPER:' line, ends a block field."""
+    if text.startswith('\n', newline + 1) and FIELD_LABEL_LINE_PATTERN.match(text, newline + 2):
+        return True
+    return TWO_WORD_LABEL_LINE_PATTERN.match(text, newline + 1) is not None
+
+def paragraph_break(text: str, newline: int) -> bool:
+    """A blank line ends a paragraph field (QUALITY)."""
+    return text.startswith('\n', newline + 1)
+
+def field_end(text: str, start: int, is_break, deadline: Optional[float] = None) -> int:
+    """End of the field body starting at start: the first breaking line, or end of text."""
+    newline = text.find('\n', start)
+    while newline != -1:
+        if is_break(text, newline):
+            return newline
+        check_deadline(deadline)
+        newline = text.find('\n', newline + 1)
+    return len(text)
+
+def inline_field(text: str, labels: Tuple[str, ...], deadline: Optional[float] = None) -> Optional[str]:
+    """'LABEL: value' — the value may start on the label's line or a later one."""
+    for _, label_end in iter_label_positions(text, labels):
+        start = WHITESPACE_RUN_PATTERN.match(text, label_end).end()
+        if start < len(text):
+            return text[start:field_end(text, start, inline_break, deadline)].strip()
+        if start > label_end:
+            # Only whitespace follows the label
+            return ''
+    return None
+
+def block_field(text: str, labels: Tuple[str, ...], deadline: Optional[float] = None) -> Optional[str]:
+    """'LABEL:' followed by a body on the next lines."""
+    for _, label_end in iter_label_positions(text, labels):
+        start = block_start(text, label_end)
+        if start != -1:
+            return text[start:field_end(text, start, block_break, deadline)]
+        check_deadline(deadline)
+    return None
+
+def titled_block_field(text: str, labels: Tuple[str, ...], is_break,
+                       deadline: Optional[float] = None) -> Optional[str]:
+    """'LABEL anything:' followed by a body on the next lines.
+
+    Only the first label occurrence needs trying: the first colon after it
+    that ends its line opens the body, and any later label could only use
+    a subset of the same colons.
+    """
+    first = next(iter_label_positions(text, labels), None)
+    if first is None:
+        return None
+    
+    colon = text.find(':', first[1])
+    while colon != -1:
+        start = block_start(text, colon + 1)
+        if start != -1:
+            return text[start:field_end(text, start, is_break, deadline)]
+        check_deadline(deadline)
+        colon = text.find(':', colon + 1)
+    return None
+
+def parse_super_prompt_fields(prompt_text: str, deadline: Optional[float] = None) -> Dict:
+    """Parse ROLE/TASK/INPUTS/PROCESS/OUTPUT/QUALITY fields of a super-prompt.
+
+    A linear scan over label positions and line starts, replacing DOTALL
+    lazy regexes that backtracked quadratically on long prompts without a
+    terminator. Results are the same as the former patterns. The scans
+    raise TimeBudgetExceeded once the deadline (a perf_counter time) passes.
+    """
+    fields = {
+        'role': inline_field(prompt_text, ROLE_LABELS, deadline),
+        'task': inline_field(prompt_text, TASK_LABELS, deadline),
+        'inputs': [],
+        'process': [],
+        'output': None,
+        'quality_checks': []
+    }
+    
+    # INPUTS (often a list of bullets or variables)
+    inputs_text = block_field(prompt_text, INPUTS_LABELS, deadline)
+    if inputs_text:
+        for line in inputs_text.split('\n'):
+            check_deadline(deadline)
+            line = line.strip()
+            if line.startswith('-') or line.startswith('•') or NUMBERED_ITEM_PATTERN.match(line):
+                fields['inputs'].append(line)
+    
+    # PROCESS/CHECKLIST
+    process_text = titled_block_field(prompt_text, PROCESS_LABELS, block_break, deadline)
+    if process_text:
+        for line in process_text.split('\n'):
+            check_deadline(deadline)
+            line = line.strip()
+            if line.startswith('-') or line.startswith('•') or NUMBERED_STEP_PATTERN.match(line):
+                fields['process'].append(line)
+    
+    output_text = titled_block_field(prompt_text, OUTPUT_LABELS, block_break, deadline)
+    if output_text is not None:
+        fields['output'] = output_text.strip()
+    
+    # QUALITY CHECKS
+    quality_text = titled_block_field(prompt_text, QUALITY_LABELS, paragraph_break, deadline)
+    if quality_text:
+        for line in quality_text.split('\n'):
+            check_deadline(deadline)
+            line = line.strip()
+            if line.startswith('-') or line.startswith('•'):
+                fields['quality_checks'].append(line)
+    
+    return fields
+
+def extract_section(content: Document, tokens: List[Tuple[str, int, int, str]], headings: List[str]) -> str:
+    """Return the stripped text of the first matching section, or ''."""
+    section = find_section(tokens, headings, len(content))
+    if not section:
+        return ""
+    return slice_text(content, section[1], section[2]).strip()
+
+def parse_quick_wins(content: Document, tokens: List[Tuple[str, int, int, str]],
+                     deadline: Optional[float] = None) -> List[Dict]:
+    """Parse Quick Wins section lines into category/pattern entries."""
+    section = find_section(tokens, QUICK_WINS_HEADINGS, len(content))
+    if not section:
+        return []
+    
+    section_content = slice_text(content, section[1], section[2]).strip()
+    if not section_content:
+        return []
+    
+    quick_wins = []
+    
+    # Extract from code block
+    text = find_code_block(content, tokens, section)
+    if text is None:
+        text = section_content
+    
+    # Parse patterns
+    for line in text.split('\n'):
+        check_deadline(deadline)
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        
+        # Detect category (if present)
+        category = None
+        pattern_text = line
+        
+        # Format: "Category → pattern"
+        if '→' in line:
+            parts = line.split('→', 1)
+            category = parts[0].strip().strip('-•').strip()
+            pattern_text = parts[1].strip()
+        # Format: "Category: pattern"
+        elif ':' in line and not line.startswith('"'):
+            parts = line.split(':', 1)
+            potential_category = parts[0].strip().strip('-•').strip()
+            # Check if it looks like a category
+            if len(potential_category.split()) <= 3 and potential_category[0].isupper():
+                category = potential_category
+                pattern_text = parts[1].strip()
+        
+        # Remove leading bullets
+        pattern_text = pattern_text.lstrip('-•').strip()
+        
+        if pattern_text:
+            quick_wins.append({
+                'category': category,
+                'pattern': pattern_text,
+                'original': line
+            })
+    
+    return quick_wins
+
+def iter_json_array(f: IO[str], key: str, chunk_size: int = 1 << 16) -> Iterator:
+    """Stream the items of a top-level array from a JSON document.
+
+    Other top-level values are decoded and discarded one at a time, so
+    memory use is bounded by the largest single value, not the file size.
+    """
+    decoder = json.JSONDecoder()
+    state = {'buf': '', 'pos': 0, 'eof': False}
+    
+    def read_more(size: int) -> bool:
+        chunk = f.read(size)
+        if not chunk:
+            state['eof'] = True
+            return False
+        state['buf'] = state['buf'][state['pos']:] + chunk
+        state['pos'] = 0
+        return True
+    
+    def peek() -> str:
+        while True:
+            buf, pos = state['buf'], state['pos']
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            state['pos'] = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not read_more(chunk_size):
+                raise ValueError("Unexpected end of JSON document")
+    
+    def expect(char: str) -> None:
+        if peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {state['pos']}")
+        state['pos'] += 1
+    
+    def decode():
+        peek()
+        size = chunk_size
+        while True:
+            try:
+                value, end = decoder.raw_decode(state['buf'], state['pos'])
+                # A number cut at the buffer edge may continue in the next chunk
+                if state['eof'] or (end < len(state['buf']) and state['buf'][end] in ' \t\r\n,]}'):
+                    state['pos'] = end
+                    return value
+            except json.JSONDecodeError:
+                if state['eof']:
+                    raise
+            read_more(size)
+            size *= 2
+    
+    expect('{')
+    while peek() != '}':
+        if peek() == ',':
+            state['pos'] += 1
+            continue
+        name = decode()
+        expect(':')
+        if name != key:
+            decode()
+            continue
+        
+        expect('[')
+        while peek() != ']':
+            if peek() == ',':
+                state['pos'] += 1
+                continue
+            yield decode()
+        state['pos'] += 1
+
+def iter_extraction_records(path: str,
+                            quality: Optional[Set[str]] = None,
+                            domains: Optional[Set[str]] = None) -> Iterator[Dict]:
+    """Lazily yield file records from a JSON or JSONL extraction file.
+
+    Records can be filtered by quality tier and/or domain while reading.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if Path(path).suffix == '.jsonl':
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            records = iter_json_array(f, 'files')
+        
+        for record in records:
+            if record.get('record_type') == 'summary':
+                continue
+            if quality is not None and record.get('quality_score') not in quality:
+                continue
+            if domains is not None and record.get('domain') not in domains:
+                continue
+            yield record
@@ -0,0 +1,222 @@
+"""
+SQLite search index over extraction records.
+FTS5 tables cover super-prompt text, quick-win patterns and lessons; B-tree
+indexes cover domain, quality, date and tags. The query functions return
+plain dicts so the CLI and MCP tooling can use them directly.
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from insights_core import parse_tags
+
+# Configuration
+INDEX_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\scripts\insights-index.sqlite3"
+SCHEMA_VERSION = 1
+INSERT_BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL UNIQUE,
+    file_id TEXT,
+    title TEXT,
+    date TEXT,
+    domain TEXT,
+    quality_score TEXT,
+    word_count INTEGER,
+    record TEXT NOT NULL
+);
+CREATE TABLE tags (
+    file_row INTEGER NOT NULL REFERENCES files(id),
+    tag TEXT NOT NULL
+);
+CREATE TABLE prompts (
+    id INTEGER PRIMARY KEY REFERENCES files(id),
+    title TEXT,
+    full_text TEXT,
+    role TEXT,
+    task TEXT
+);
+CREATE TABLE quick_wins (
+    id INTEGER PRIMARY KEY,
+    file_row INTEGER NOT NULL REFERENCES files(id),
+    category TEXT,
+    pattern TEXT
+);
+CREATE TABLE lessons (
+    id INTEGER PRIMARY KEY,
+    file_row INTEGER NOT NULL REFERENCES files(id),
+    lesson TEXT
+);
+CREATE VIRTUAL TABLE prompts_fts USING fts5(
+    title, full_text, role, task, content='prompts', content_rowid='id'
+);
+CREATE VIRTUAL TABLE quick_wins_fts USING fts5(
+    pattern, category, content='quick_wins', content_rowid='id'
+);
+CREATE VIRTUAL TABLE lessons_fts USING fts5(
+    lesson, content='lessons', content_rowid='id'
+);
+"""
+
+# Created after the bulk load, which is faster than maintaining them per row
+INDEXES = """
+CREATE INDEX files_domain ON files(domain);
+CREATE INDEX files_quality ON files(quality_score);
+CREATE INDEX files_date ON files(date);
+CREATE INDEX tags_tag ON tags(tag, file_row);
+CREATE INDEX quick_wins_file ON quick_wins(file_row);
+CREATE INDEX lessons_file ON lessons(file_row);
+INSERT INTO prompts_fts(prompts_fts) VALUES ('rebuild');
+INSERT INTO quick_wins_fts(quick_wins_fts) VALUES ('rebuild');
+INSERT INTO lessons_fts(lessons_fts) VALUES ('rebuild');
+"""
+
+FILE_COLUMNS = "f.filename, f.title, f.date, f.domain, f.quality_score"
+
+def fts_query(text: str) -> str:
+    """Quote each term so arbitrary user text is a valid FTS5 query (all terms must match)."""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+def build_index(records: Iterable[Dict], db_path: Path) -> Dict[str, int]:
+    """Rebuild the index from extraction records; return row counts.
+
+    The database is built under a temporary name and renamed into place, so
+    readers never see a half-built index.
+    """
+    tmp_path = db_path.with_name(db_path.name + '.tmp')
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_path)
+    counts = {'files': 0, 'prompts': 0, 'quick_wins': 0, 'lessons': 0, 'tags': 0}
+    
+    try:
+        conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        
+        rows = {name: [] for name in counts}
+        
+        def flush() -> None:
+            conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows['files'])
+            conn.executemany("INSERT INTO tags VALUES (?, ?)", rows['tags'])
+            conn.executemany("INSERT INTO prompts VALUES (?, ?, ?, ?, ?)", rows['prompts'])
+            conn.executemany("INSERT INTO quick_wins (file_row, category, pattern) VALUES (?, ?, ?)", rows['quick_wins'])
+            conn.executemany("INSERT INTO lessons (file_row, lesson) VALUES (?, ?)", rows['lessons'])
+            for name, batch in rows.items():
+                counts[name] += len(batch)
+                batch.clear()
+        
+        for row_id, record in enumerate(records, 1):
+            if not record.get('extraction_success'):
+                continue
+            rows['files'].append((
+                row_id, record['filename'], record.get('file_id'), record.get('title'),
+                record.get('date'), record.get('domain'), record.get('quality_score'),
+                record.get('word_count'), json.dumps(record)
+            ))
+            rows['tags'].extend((row_id, tag) for tag in parse_tags(record.get('tags')))
+            
+            super_prompt = record.get('super_prompt')
+            if super_prompt:
+                rows['prompts'].append((row_id, record.get('title'), super_prompt.get('full_text'),
+                                        super_prompt.get('role'), super_prompt.get('task')))
+            rows['quick_wins'].extend((row_id, qw.get('category'), qw.get('pattern'))
+                                      for qw in record.get('quick_wins') or [])
+            rows['lessons'].extend((row_id, lesson) for lesson in record.get('lessons') or [])
+            
+            if len(rows['files']) >= INSERT_BATCH_SIZE:
+                flush()
+        
+        flush()
+        conn.executescript(INDEXES)
+        conn.commit()
+    finally:
+        conn.close()
+    
+    os.replace(tmp_path, db_path)
+    return counts
+
+def open_index(db_path: Path) -> sqlite3.Connection:
+    """Open an index read-only, with rows returned as sqlite3.Row."""
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"No insights index at {db_path} (run the build step first)")
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"Index schema v{version} does not match v{SCHEMA_VERSION}; rebuild it")
+    return conn
+
+def file_filters(domain: Optional[str], quality: Optional[str], tag: Optional[str],
+                 since: Optional[str] = None, until: Optional[str] = None) -> Tuple[str, List]:
+    """SQL conditions on the files table (alias f) and their parameters."""
+    conditions, params = [], []
+    if domain:
+        conditions.append("f.domain = ?")
+        params.append(domain)
+    if quality:
+        conditions.append("f.quality_score = ?")
+        params.append(quality.upper())
+    if tag:
+        conditions.append("EXISTS (SELECT 1 FROM tags t WHERE t.tag = ? AND t.file_row = f.id)")
+        params.append(tag)
+    if since:
+        conditions.append("f.date >= ?")
+        params.append(since)
+    if until:
+        conditions.append("f.date <= ?")
+        params.append(until)
+    return ''.join(f" AND {c}" for c in conditions), params
+
+def search_prompts(conn: sqlite3.Connection, query: str, domain: Optional[str] = None,
+                   quality: Optional[str] = None, tag: Optional[str] = None,
+                   limit: int = 20, raw: bool = False) -> List[Dict]:
+    """Full-text search over super-prompts (title, text, role, task), best match first."""
+    where, params = file_filters(domain, quality, tag)
+    sql = (f"SELECT {FILE_COLUMNS}, snippet(prompts_fts, 1, '[', ']', '…', 12) AS snippet, "
+           f"bm25(prompts_fts) AS rank "
+           f"FROM prompts_fts JOIN files f ON f.id = prompts_fts.rowid "
+           f"WHERE prompts_fts MATCH ?{where} ORDER BY rank LIMIT ?")
+    rows = conn.execute(sql, [query if raw else fts_query(query), *params, limit])
+    return [dict(row) for row in rows]
+
+def search_quick_wins(conn: sqlite3.Connection, query: str, domain: Optional[str] = None,
+                      quality: Optional[str] = None, tag: Optional[str] = None,
+                      limit: int = 20, raw: bool = False) -> List[Dict]:
+    """Full-text search over quick-win patterns and categories."""
+    where, params = file_filters(domain, quality, tag)
+    sql = (f"SELECT {FILE_COLUMNS}, q.category, q.pattern, bm25(quick_wins_fts) AS rank "
+           f"FROM quick_wins_fts JOIN quick_wins q ON q.id = quick_wins_fts.rowid "
+           f"JOIN files f ON f.id = q.file_row "
+           f"WHERE quick_wins_fts MATCH ?{where} ORDER BY rank LIMIT ?")
+    rows = conn.execute(sql, [query if raw else fts_query(query), *params, limit])
+    return [dict(row) for row in rows]
+
+def search_lessons(conn: sqlite3.Connection, query: str, domain: Optional[str] = None,
+                   quality: Optional[str] = None, tag: Optional[str] = None,
+                   limit: int = 20, raw: bool = False) -> List[Dict]:
+    """Full-text search over lessons learned."""
+    where, params = file_filters(domain, quality, tag)
+    sql = (f"SELECT {FILE_COLUMNS}, l.lesson, bm25(lessons_fts) AS rank "
+           f"FROM lessons_fts JOIN lessons l ON l.id = lessons_fts.rowid "
+           f"JOIN files f ON f.id = l.file_row "
+           f"WHERE lessons_fts MATCH ?{where} ORDER BY rank LIMIT ?")
+    rows = conn.execute(sql, [query if raw else fts_query(query), *params, limit])
+    return [dict(row) for row in rows]
+
+def find_files(conn: sqlite3.Connection, domain: Optional[str] = None, quality: Optional[str] = None,
+               tag: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+               limit: int = 100) -> List[Dict]:
+    """Files matching metadata filters, newest first."""
+    where, params = file_filters(domain, quality, tag, since, until)
+    sql = f"SELECT {FILE_COLUMNS} FROM files f WHERE 1 = 1{where} ORDER BY f.date DESC, f.filename LIMIT ?"
+    return [dict(row) for row in conn.execute(sql, [*params, limit])]
+
+def get_record(conn: sqlite3.Connection, filename: str) -> Optional[Dict]:
+    """The full extraction record for a file, or None."""
+    row = conn.execute("SELECT record FROM files WHERE filename = ?", (filename,)).fetchone()
+    return json.loads(row['record']) if row else None
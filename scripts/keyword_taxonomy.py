@@ -0,0 +1,83 @@
+"""
+Shared keyword taxonomy for domain and pattern classification.
+Each taxonomy is compiled once into a trie-shaped keyword matcher.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Configuration
+TAXONOMY_FILE = Path(__file__).with_name('keyword-taxonomy.json')
+
+def _trie_pattern(node: Dict) -> str:
+    """Regex for a keyword trie: one branch per next character, longest match first."""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # A keyword ends here, so the longer continuations are optional
+    return f"(?:{body})?" if '' in node else body
+
+def compile_classifier(categories: Dict[str, List[str]], fallback: str) -> Callable[[str], str]:
+    """Compile ordered keyword lists into a trie-walk substring classifier.
+
+    Matches the old `any(kw in text for kw in ...)` chains: the first
+    category (in priority order) with any keyword in the text wins. The
+    keywords are compiled into a trie-shaped regex, so each offset costs one
+    walk down the trie instead of a test per keyword. A match at an offset is
+    the longest keyword there, and every other keyword starting there is a
+    prefix of it, so its rank is the best among its prefixes. After a match
+    the scan goes on with the trie of the strictly better categories only.
+    """
+    names = list(categories)
+    priority = {}
+    for rank, name in enumerate(names):
+        for keyword in categories[name]:
+            priority.setdefault(keyword.lower(), rank)
+    # An empty keyword is in every text
+    always = priority.pop('', len(names))
+    
+    if not priority or always == 0:
+        result = names[always] if always < len(names) else fallback
+        return lambda text: result
+    
+    best_prefix = {keyword: min(rank for prefix, rank in priority.items() if keyword.startswith(prefix))
+                   for keyword in priority}
+    # searches[n]: finds keywords of the first n categories (None if there are none)
+    searches = [None]
+    for limit in range(1, len(names) + 1):
+        trie: Dict = {}
+        for keyword, rank in priority.items():
+            if rank < limit:
+                node = trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node[''] = True
+        searches.append(re.compile(_trie_pattern(trie)).search if trie else None)
+    
+    def classify(text: str) -> str:
+        text = text.lower()
+        best = always
+        search = searches[best]
+        match = search(text) if search else None
+        while match:
+            best = best_prefix[match.group()]
+            search = searches[best]
+            if search is None:
+                break
+            match = search(text, match.start() + 1)
+        return names[best] if best < len(names) else fallback
+    
+    return classify
+
+def load_taxonomy(path: Path = TAXONOMY_FILE) -> Dict:
+    """Load all taxonomies from the JSON config file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_classifier(name: str, path: Path = TAXONOMY_FILE) -> Callable[[str], str]:
+    """Compile the named taxonomy from the config file."""
+    taxonomy = load_taxonomy(path)[name]
+    return compile_classifier(taxonomy['categories'], taxonomy['fallback'])
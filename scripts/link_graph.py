@@ -0,0 +1,271 @@
+"""
+Markdown link graph across the local clones of the Arsenal repositories.
+Links are extracted per file and persisted with each file's size, mtime and
+hash, so a rescan only re-reads files that changed. The loaded graph
+answers backlink, orphan, dangling-link and repo-to-repo queries.
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from output_writer import OutputWriter
+
+# Configuration
+GRAPH_VERSION = 1
+# Directories never scanned (besides dot-directories)
+SKIP_DIRS = {'node_modules', '__pycache__', 'venv', 'dist', 'build'}
+MARKDOWN_SUFFIXES = ('.md', '.markdown')
+
+INLINE_LINK_PATTERN = re.compile(r'\]\(\s*<?([^)\s>]+)>?(?:\s+["\'(][^)]*)?\)')
+REFERENCE_LINK_PATTERN = re.compile(r'^\s{0,3}\[[^\]]+\]:\s*<?(\S+?)>?(?:\s|$)')
+HTML_LINK_PATTERN = re.compile(r'<a\s[^>]*href=["\']([^"\']+)["\']', re.IGNORECASE)
+INLINE_CODE_PATTERN = re.compile(r'`[^`\n]*`')
+FENCE_PATTERN = re.compile(r'^\s{0,3}(```|~~~)')
+GITHUB_URL_PATTERN = re.compile(
+    r'^https?://(?:www\.)?github\.com/([^/?#]+)/([^/?#]+?)(?:\.git)?'
+    r'(?:/(?:blob|tree|raw)/[^/?#]+(/[^?#]*)?)?/?(?:[?#].*)?$'
+)
+RAW_URL_PATTERN = re.compile(r'^https?://raw\.githubusercontent\.com/([^/]+)/([^/]+)/[^/]+(/[^?#]*)')
+EXTERNAL_SCHEME_PATTERN = re.compile(r'^[a-z][a-z0-9+.-]*:', re.IGNORECASE)
+
+def node_id(repo: str, path: str) -> str:
+    """Graph node for a repo-relative POSIX path: 'repo:path/to/file.md'."""
+    return f"{repo}:{path}"
+
+def split_node(node: str) -> Tuple[str, str]:
+    """Inverse of node_id: (repo, path)."""
+    repo, _, path = node.partition(':')
+    return repo, path
+
+def iter_links(text: str) -> Iterator[Tuple[str, int]]:
+    """Yield (target, line number) for markdown and HTML links outside code."""
+    in_fence = None
+    for line_number, line in enumerate(text.split('\n'), 1):
+        fence = FENCE_PATTERN.match(line)
+        if fence:
+            if in_fence is None:
+                in_fence = fence.group(1)
+            elif fence.group(1) == in_fence:
+                in_fence = None
+            continue
+        if in_fence is not None or ('](' not in line and ']:' not in line and 'href' not in line):
+            continue
+        line = INLINE_CODE_PATTERN.sub('', line)
+        for pattern in (INLINE_LINK_PATTERN, REFERENCE_LINK_PATTERN, HTML_LINK_PATTERN):
+            for match in pattern.finditer(line):
+                yield match.group(1), line_number
+
+class LinkResolver:
+    """Map link targets to graph nodes of the configured repositories."""
+    
+    def __init__(self, repos: Dict[str, str], owner: str):
+        self.repos = repos
+        self.owner = owner.lower()
+        # Longest root first so nested clones resolve to the inner repo
+        self.roots = sorted(((os.path.normcase(os.path.abspath(root)), name) for name, root in repos.items()),
+                            key=lambda item: -len(item[0]))
+    
+    def from_path(self, filesystem_path: str) -> Optional[str]:
+        """Node for a local file path, or None outside every repo."""
+        path = os.path.normcase(os.path.abspath(filesystem_path))
+        for root, name in self.roots:
+            if path == root or path.startswith(root + os.sep):
+                rel_path = os.path.relpath(path, root)
+                return node_id(name, '' if rel_path == '.' else Path(rel_path).as_posix())
+        return None
+    
+    def resolve(self, target: str, source: str) -> Optional[str]:
+        """Node a link from source points at, or None for external and in-page links.
+
+        GitHub blob/tree/raw URLs of configured repos, repo-root URLs and
+        relative or root-absolute paths are all resolved.
+        """
+        target = target.strip()
+        match = GITHUB_URL_PATTERN.match(target) or RAW_URL_PATTERN.match(target)
+        if match:
+            owner, repo, path = match.group(1), match.group(2), match.group(3) or ''
+            if owner.lower() != self.owner or repo not in self.repos:
+                return None
+            path = posixpath.normpath(unquote(path)).strip('/')
+            return node_id(repo, '' if path == '.' else path)
+        if not target or target.startswith('#') or target.startswith('//') or EXTERNAL_SCHEME_PATTERN.match(target):
+            return None
+        
+        path = unquote(target.split('#', 1)[0].split('?', 1)[0])
+        if not path:
+            return None
+        repo, source_path = split_node(source)
+        if path.startswith('/'):
+            resolved = posixpath.normpath(path.lstrip('/'))
+        else:
+            resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source_path), path))
+        if resolved == '.':
+            resolved = ''
+        if not resolved.startswith('../'):
+            return node_id(repo, resolved)
+        # Relative link out of the repo, e.g. ../prompt-arsenal/README.md between sibling clones
+        return self.from_path(os.path.join(self.repos[repo], *resolved.split('/')))
+    
+    def lookup(self, text: str) -> Optional[str]:
+        """Node for a command-line argument: 'repo:path', a GitHub URL or a local path."""
+        repo, _, path = text.partition(':')
+        if repo in self.repos:
+            path = posixpath.normpath(path).strip('/') if path else ''
+            return node_id(repo, '' if path == '.' else path)
+        if '://' in text:
+            return self.resolve(text, '')
+        return self.from_path(text)
+
+def scan_files(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (repo-relative POSIX path, stat) for every file outside skipped directories."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS)
+        rel_dir = os.path.relpath(dirpath, root)
+        prefix = '' if rel_dir == '.' else Path(rel_dir).as_posix() + '/'
+        for filename in sorted(filenames):
+            try:
+                yield prefix + filename, os.stat(os.path.join(dirpath, filename))
+            except OSError:
+                continue
+
+def extract_links(data: bytes, source: str, resolver: LinkResolver) -> Dict:
+    """Outbound links of one markdown file: internal [node, line] pairs and external URL count."""
+    links, external = [], 0
+    for target, line in iter_links(data.decode('utf-8', errors='replace')):
+        node = resolver.resolve(target, source)
+        if node is None:
+            external += not target.startswith('#')
+        else:
+            links.append([node, line])
+    return {'links': links, 'external': external}
+
+def update_graph(index: Dict, repos: Dict[str, str], owner: str) -> Dict[str, int]:
+    """Rescan the repos into index in place, re-reading only changed markdown files.
+
+    index holds 'files' (markdown entries with size, mtime_ns, sha256 and
+    links) and 'paths' (every file per repo, for dangling-link checks).
+    Returns counts of scanned, re-read, re-parsed and removed files.
+    """
+    resolver = LinkResolver(repos, owner)
+    # Links were resolved against the repo list, so a new list means a full rescan
+    same_config = index.get('repos') == repos and index.get('owner') == owner
+    old_files = index.get('files', {}) if same_config else {}
+    files, paths = {}, {}
+    counts = {'files': 0, 'markdown': 0, 'read': 0, 'parsed': 0, 'removed': 0, 'missing_repos': 0}
+    
+    for repo, root in repos.items():
+        if not os.path.isdir(root):
+            counts['missing_repos'] += 1
+            continue
+        repo_paths = []
+        for rel_path, stat in scan_files(root):
+            repo_paths.append(rel_path)
+            if not rel_path.lower().endswith(MARKDOWN_SUFFIXES):
+                continue
+            node = node_id(repo, rel_path)
+            entry = old_files.get(node)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                files[node] = entry
+                continue
+            
+            with open(os.path.join(root, *rel_path.split('/')), 'rb') as f:
+                data = f.read()
+            counts['read'] += 1
+            digest = hashlib.sha256(data).hexdigest()
+            if entry and entry['sha256'] == digest:
+                files[node] = dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                continue
+            counts['parsed'] += 1
+            files[node] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest,
+                           **extract_links(data, node, resolver)}
+        paths[repo] = repo_paths
+        counts['files'] += len(repo_paths)
+    
+    counts['markdown'] = len(files)
+    counts['removed'] = len(old_files.keys() - files.keys())
+    index.update({'version': GRAPH_VERSION, 'repos': repos, 'owner': owner, 'files': files, 'paths': paths})
+    return counts
+
+def load_graph_index(path: Path) -> Dict:
+    """Saved index, or an empty one if missing, unreadable or from another version."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if index.get('version') == GRAPH_VERSION else {}
+
+def save_graph_index(path: Path, index: Dict, writer: OutputWriter) -> None:
+    """Write the index compactly; skipped if unchanged."""
+    # json.dumps uses the C encoder; json.dump to a file does not
+    writer.write_text(path, json.dumps(index, separators=(',', ':')))
+
+class LinkGraph:
+    """Queries over a scanned index: backlinks, orphans, dangling links and repo-to-repo counts."""
+    
+    def __init__(self, index: Dict):
+        self.files: Dict[str, Dict] = index.get('files', {})
+        self.existing: Set[str] = {node_id(repo, path) for repo, paths in index.get('paths', {}).items()
+                                   for path in paths}
+        self.directories: Set[str] = set()
+        for node in self.existing:
+            repo, path = split_node(node)
+            while path:
+                path = posixpath.dirname(path)
+                directory = node_id(repo, path)
+                if directory in self.directories:
+                    break
+                self.directories.add(directory)
+        
+        self.backlinks_of: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        self.dangling_links: List[Tuple[str, int, str]] = []
+        for source, entry in self.files.items():
+            for target, line in entry['links']:
+                resolved = self.canonical(target)
+                if resolved is None:
+                    if split_node(target)[0] in index.get('paths', {}):
+                        self.dangling_links.append((source, line, target))
+                elif resolved != source:
+                    self.backlinks_of[resolved].append((source, line))
+    
+    def canonical(self, target: str) -> Optional[str]:
+        """Existing node a target refers to (a directory means its README), or None."""
+        if target in self.existing:
+            return target
+        target = target.rstrip('/')
+        if target in self.directories:
+            repo, path = split_node(target)
+            for readme in ('README.md', 'readme.md', 'index.md'):
+                candidate = node_id(repo, posixpath.join(path, readme) if path else readme)
+                if candidate in self.existing:
+                    return candidate
+            return target
+        return None
+    
+    def backlinks(self, node: str) -> List[Tuple[str, int]]:
+        """(source, line) of every link into node, sorted."""
+        return sorted(self.backlinks_of.get(self.canonical(node) or node, []))
+    
+    def orphans(self) -> List[str]:
+        """Markdown files nothing else links to (repo-root READMEs excluded)."""
+        return sorted(node for node in self.files
+                      if node not in self.backlinks_of and split_node(node)[1].lower() != 'readme.md')
+    
+    def dangling(self) -> List[Tuple[str, int, str]]:
+        """(source, line, target) of links into a scanned repo that point at nothing."""
+        return sorted(self.dangling_links)
+    
+    def repo_matrix(self) -> Dict[str, Dict[str, int]]:
+        """Link counts from each repo to each repo (existing targets only)."""
+        matrix: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for target, sources in self.backlinks_of.items():
+            for source, _ in sources:
+                matrix[split_node(source)[0]][split_node(target)[0]] += 1
+        return {repo: dict(row) for repo, row in matrix.items()}
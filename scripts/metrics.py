@@ -0,0 +1,135 @@
+"""
+Optional timing instrumentation for the pipeline scripts.
+Functions are only wrapped when metrics are enabled, so a normal run pays
+nothing; an instrumented run records per-call latency per stage and the
+slowest items (files, prompts) for each stage.
+"""
+
+import functools
+import heapq
+import json
+import math
+import time
+from array import array
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from output_writer import OutputWriter
+
+# Configuration
+SLOWEST_N = 10
+PERCENTILES = [50, 95, 99]
+
+def percentile(sorted_samples: array, p: float) -> float:
+    """Nearest-rank percentile of an ascending sample array."""
+    rank = max(1, math.ceil(p / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+def metrics_path(output_path: Path, label: Optional[str] = None) -> Path:
+    """Default metrics file next to an output: data.json -> data[.label].metrics.json."""
+    stem = f"{output_path.stem}.{label}" if label else output_path.stem
+    return output_path.with_name(stem + '.metrics.json')
+
+class Metrics:
+    """Per-stage latency samples plus the slowest N items per stage."""
+    
+    def __init__(self, slowest_n: int = SLOWEST_N):
+        self.enabled = False
+        self.slowest_n = slowest_n
+        self.samples: Dict[str, array] = defaultdict(lambda: array('d'))
+        self.slowest: Dict[str, List[Tuple[float, str]]] = defaultdict(list)
+    
+    def record(self, stage: str, seconds: float, item: Optional[str] = None) -> None:
+        """Record one call; item names it in the slowest list for the stage."""
+        self.samples[stage].append(seconds)
+        if item is not None:
+            self.record_slowest(stage, seconds, item)
+    
+    def wrap(self, stage: str, func: Callable, item: Optional[Callable[..., str]] = None) -> Callable:
+        """Return func timed under stage; item(*args) labels each call."""
+        perf_counter = time.perf_counter
+        record = self.record
+        
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(stage, perf_counter() - start, item(*args, **kwargs) if item else None)
+        
+        timed.metrics = self
+        return timed
+    
+    def instrument(self, namespace: Dict, names: List[str],
+                   items: Optional[Dict[str, Callable[..., str]]] = None) -> None:
+        """Replace the named functions in a module namespace with timed wrappers.
+
+        Callers that look the names up through that namespace (including
+        the module's own functions) then go through the wrappers.
+        """
+        self.enabled = True
+        items = items or {}
+        for name in names:
+            func = namespace[name]
+            if getattr(func, 'metrics', None) is self:
+                continue
+            namespace[name] = self.wrap(name, func, items.get(name))
+    
+    def drain(self) -> Dict:
+        """Return and clear the collected data (for sending from a worker)."""
+        data = {
+            'samples': {stage: samples.tolist() for stage, samples in self.samples.items()},
+            'slowest': {stage: list(heap) for stage, heap in self.slowest.items()}
+        }
+        self.samples.clear()
+        self.slowest.clear()
+        return data
+    
+    def merge(self, data: Dict) -> None:
+        """Add data drained from another Metrics (e.g. a worker process)."""
+        for stage, samples in data['samples'].items():
+            self.samples[stage].extend(samples)
+        for stage, heap in data['slowest'].items():
+            for seconds, item in heap:
+                self.record_slowest(stage, seconds, item)
+    
+    def record_slowest(self, stage: str, seconds: float, item: str) -> None:
+        """Offer an item to the slowest list without adding a latency sample."""
+        heap = self.slowest[stage]
+        if len(heap) < self.slowest_n:
+            heapq.heappush(heap, (seconds, item))
+        elif seconds > heap[0][0]:
+            heapq.heapreplace(heap, (seconds, item))
+    
+    def report(self) -> Dict:
+        """Summarize count, total and latency percentiles (ms) for each stage."""
+        stages = {}
+        for stage, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = array('d', sorted(samples))
+            total = sum(ordered)
+            summary = {
+                'count': len(ordered),
+                'total_s': round(total, 4),
+                'mean_ms': round(total / len(ordered) * 1000, 3)
+            }
+            for p in PERCENTILES:
+                summary[f'p{p}_ms'] = round(percentile(ordered, p) * 1000, 3)
+            summary['max_ms'] = round(ordered[-1] * 1000, 3)
+            stages[stage] = summary
+        
+        slowest = {
+            stage: [{'item': item, 'ms': round(seconds * 1000, 3)}
+                    for seconds, item in sorted(heap, reverse=True)]
+            for stage, heap in self.slowest.items() if heap
+        }
+        return {'stages': stages, 'slowest': slowest}
+    
+    def write(self, path: Path, script: str, writer: OutputWriter) -> bool:
+        """Write the report as JSON through the script's output writer."""
+        report = {'script': script, 'generated': datetime.now().isoformat(), **self.report()}
+        return writer.write_text(path, json.dumps(report, indent=2))
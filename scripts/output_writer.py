@@ -0,0 +1,127 @@
+"""
+Shared output layer: write files atomically and only when their content changes.
+Unchanged outputs keep their mtime, so git status and downstream content
+builds only see files that really changed.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Union
+
+# Configuration
+HASH_CHUNK_SIZE = 1 << 20
+
+PathLike = Union[str, Path]
+
+def file_digest(path: PathLike) -> str:
+    """sha256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def same_content(path: Path, size: int, digest: str) -> bool:
+    """True if path exists with exactly this size and sha256."""
+    try:
+        if path.stat().st_size != size:
+            return False
+        return file_digest(path) == digest
+    except OSError:
+        return False
+
+def encode_text(content: str, encoding: str = 'utf-8') -> bytes:
+    """Encode text the way open(path, 'w') would, including newline translation."""
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    return content.encode(encoding)
+
+class OutputWriter:
+    """Writes output files atomically, skipping byte-identical rewrites.
+
+    Counts written and skipped files so each stage can report them. One
+    writer can be shared by threads writing different files.
+    """
+    
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+    
+    def _count(self, written: bool) -> bool:
+        """Record one write or skip; return written."""
+        with self._lock:
+            if written:
+                self.written += 1
+            else:
+                self.skipped += 1
+        return written
+    
+    def _commit(self, tmp_path: Path, path: Path, size: int, digest: str) -> bool:
+        """Replace path with tmp_path unless path already has this content."""
+        if same_content(path, size, digest):
+            os.unlink(tmp_path)
+            return self._count(False)
+        os.replace(tmp_path, path)
+        return self._count(True)
+    
+    def _temp_file(self, path: Path):
+        """Create a temp file next to path so the final rename stays on one filesystem.
+
+        mkstemp creates files as 0600; give the temp file the mode the target
+        has (or would get from open()) so the rename does not change it.
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            mode = path.stat().st_mode & 0o777
+        except OSError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp_name, mode)
+        return fd, Path(tmp_name)
+    
+    def write_text(self, path: PathLike, content: str, encoding: str = 'utf-8') -> bool:
+        """Write text if it differs from the file on disk; return True if written."""
+        return self.write_bytes(path, encode_text(content, encoding))
+    
+    def write_bytes(self, path: PathLike, data: bytes) -> bool:
+        """Write bytes if they differ from the file on disk; return True if written."""
+        path = Path(path)
+        digest = hashlib.sha256(data).hexdigest()
+        if same_content(path, len(data), digest):
+            return self._count(False)
+        
+        fd, tmp_path = self._temp_file(path)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return self._count(True)
+    
+    @contextmanager
+    def open(self, path: PathLike, encoding: str = 'utf-8') -> Iterator[IO[str]]:
+        """Stream text into a temp file; on success it replaces path only if changed.
+
+        If the block raises, the temp file is removed and path is left untouched.
+        """
+        path = Path(path)
+        fd, tmp_path = self._temp_file(path)
+        try:
+            with os.fdopen(fd, 'w', encoding=encoding) as f:
+                yield f
+            self._commit(tmp_path, path, tmp_path.stat().st_size, file_digest(tmp_path))
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
+    def summary(self) -> str:
+        """One-line report of written and skipped files."""
+        return f"Files written: {self.written}, unchanged (skipped): {self.skipped}"
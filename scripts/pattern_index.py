@@ -0,0 +1,265 @@
+"""
+Persistent index of quick-win patterns across extraction runs.
+Patterns are keyed by a hash of their normalized text and carry their
+occurrence count and source files. Each source file's contribution is
+fingerprinted, so merging a run that repeats earlier files costs a hash
+per file and never double-counts. Each source keeps its own wording, and
+the one shown is recomputed from the current sources, so an index updated
+file by file matches one rebuilt from the same files. Reworded variants can be merged on top
+with MinHash near-duplicate clustering before ranking.
+"""
+
+import hashlib
+import json
+import random
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from insights_core import TEMPLATE_VAR_PATTERN, WHITESPACE_PATTERN
+from output_writer import OutputWriter
+
+# Configuration
+INDEX_VERSION = 3
+
+# Near-duplicate detection (MinHash + locality-sensitive hashing)
+SHINGLE_SIZE = 4
+MINHASH_PERMUTATIONS = 64
+MINHASH_PRIME = (1 << 61) - 1
+
+def normalize_pattern(pattern: str) -> str:
+    """Comparison form of a quick win: lowercase, template variables and whitespace folded."""
+    normalized = TEMPLATE_VAR_PATTERN.sub('{VAR}', pattern.lower().strip('"'))
+    return WHITESPACE_PATTERN.sub(' ', normalized)
+
+def pattern_key(normalized: str) -> str:
+    """Stable short hash of a normalized pattern."""
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+def contribution_digest(quick_wins: List[Dict]) -> str:
+    """Fingerprint of one file's quick wins, to skip files merged before unchanged."""
+    data = json.dumps([[qw.get('pattern'), qw.get('category'), qw.get('original')] for qw in quick_wins],
+                      ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def shingle_set(text: str) -> Set[str]:
+    """Return the overlapping character shingles of a normalized pattern."""
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def lsh_bands(threshold: float, num_perm: int = MINHASH_PERMUTATIONS) -> Tuple[int, int]:
+    """Pick (bands, rows) whose LSH similarity cut-off is closest to threshold."""
+    candidates = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(candidates, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+def find_near_duplicates(keys: List[str], threshold: float) -> List[List[int]]:
+    """Cluster keys whose shingle Jaccard similarity is at least threshold.
+
+    MinHash signatures are banded into LSH buckets so only keys sharing a
+    bucket are compared exactly. Returns clusters of key indexes, ordered
+    by each cluster's first key.
+    """
+    rng = random.Random(0)
+    permutations = [(rng.randrange(1, MINHASH_PRIME), rng.randrange(MINHASH_PRIME))
+                    for _ in range(MINHASH_PERMUTATIONS)]
+    bands, rows = lsh_bands(threshold)
+    
+    parent = list(range(len(keys)))
+    
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    # Shingles recur across patterns, so their permuted hashes are memoized
+    shingle_rows = {}
+    
+    def permuted_hashes(shingle: str) -> Tuple[int, ...]:
+        row = shingle_rows.get(shingle)
+        if row is None:
+            h = zlib.crc32(shingle.encode('utf-8'))
+            row = shingle_rows[shingle] = tuple([(a * h + b) % MINHASH_PRIME for a, b in permutations])
+        return row
+    
+    shingles = [shingle_set(key) for key in keys]
+    buckets = defaultdict(list)
+    
+    for i, key_shingles in enumerate(shingles):
+        signature = list(map(min, zip(*[permuted_hashes(sh) for sh in key_shingles])))
+        for band in range(bands):
+            bucket = buckets[(band, tuple(signature[band * rows:(band + 1) * rows]))]
+            for j in bucket:
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j:
+                    continue
+                other = shingles[j]
+                similarity = len(key_shingles & other) / len(key_shingles | other)
+                if similarity >= threshold:
+                    # Keep the earliest key as the cluster root
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+            bucket.append(i)
+    
+    clusters = defaultdict(list)
+    for i in range(len(keys)):
+        clusters[find(i)].append(i)
+    return list(clusters.values())
+
+def representative(wordings: Dict[Tuple[str, Optional[str]], int]) -> Tuple[str, Optional[str]]:
+    """The (pattern, category) to show for {(pattern, category): occurrences}.
+
+    The most frequent categorized wording wins, then the most frequent
+    uncategorized one; ties go to the first by text, so the choice does not
+    depend on merge order.
+    """
+    return min(wordings, key=lambda w: (not w[1], -wordings[w], w[0], w[1] or ''))
+
+def count_wordings(contributions: Iterable[Dict]) -> Dict[Tuple[str, Optional[str]], int]:
+    """{(pattern, category): occurrences} over source contributions."""
+    wordings: Dict[Tuple[str, Optional[str]], int] = {}
+    for contribution in contributions:
+        wording = (contribution['pattern'], contribution['category'])
+        wordings[wording] = wordings.get(wording, 0) + contribution['occurrences']
+    return wordings
+
+def combine_sources(sources: Iterable[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """Merge {filename: {'occurrences', 'pattern', 'category', 'original'}} maps, adding up shared files."""
+    by_file = defaultdict(list)
+    for source in sources:
+        for filename, contribution in source.items():
+            by_file[filename].append(contribution)
+    combined = {}
+    for filename, contributions in by_file.items():
+        wordings = count_wordings(contributions)
+        pattern, category = representative(wordings)
+        original = next(c['original'] for c in contributions if (c['pattern'], c['category']) == (pattern, category))
+        combined[filename] = {'occurrences': sum(wordings.values()), 'pattern': pattern, 'category': category,
+                              'original': original}
+    return combined
+
+class PatternIndex:
+    """Quick-win patterns by key, plus each source file's merged contribution."""
+    
+    def __init__(self):
+        # key -> {'pattern', 'category', 'count',
+        #         'sources': {filename: {'occurrences', 'pattern', 'category', 'original'}}}
+        self.patterns: Dict[str, Dict] = {}
+        # filename -> {'digest', 'keys': {key: occurrences}}
+        self.files: Dict[str, Dict] = {}
+        # Keys whose sources changed since their wording was last chosen
+        self.stale: Set[str] = set()
+    
+    @classmethod
+    def load(cls, path: Path) -> 'PatternIndex':
+        """Load a saved index; a missing or unreadable file gives an empty one."""
+        index = cls()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if data.get('version') == INDEX_VERSION:
+            index.patterns = data['patterns']
+            index.files = data['files']
+        return index
+    
+    def save(self, path: Path, writer: OutputWriter) -> bool:
+        """Write the index (sorted, so an unchanged index is not rewritten)."""
+        self.refresh_wordings()
+        data = {'version': INDEX_VERSION, 'patterns': self.patterns, 'files': self.files}
+        return writer.write_text(path, json.dumps(data, indent=1, sort_keys=True, ensure_ascii=False))
+    
+    def merge_file(self, filename: str, quick_wins: List[Dict]) -> str:
+        """Merge one file's quick wins, replacing what it contributed before.
+
+        Returns 'unchanged', 'added' or 'updated'.
+        """
+        digest = contribution_digest(quick_wins)
+        previous = self.files.get(filename)
+        if previous and previous['digest'] == digest:
+            return 'unchanged'
+        if previous:
+            self.remove_file(filename)
+        
+        # key -> {(pattern, category): occurrences} within this file, and the
+        # first original line of each wording
+        file_wordings: Dict[str, Dict[Tuple[str, Optional[str]], int]] = {}
+        originals: Dict[Tuple[str, Optional[str]], Optional[str]] = {}
+        for qw in quick_wins:
+            wordings = file_wordings.setdefault(pattern_key(normalize_pattern(qw['pattern'])), {})
+            wording = (qw['pattern'], qw.get('category'))
+            wordings[wording] = wordings.get(wording, 0) + 1
+            originals.setdefault(wording, qw.get('original'))
+        
+        keys: Dict[str, int] = {}
+        for key, wordings in file_wordings.items():
+            pattern, category = representative(wordings)
+            keys[key] = sum(wordings.values())
+            entry = self.patterns.setdefault(key, {'pattern': pattern, 'category': category, 'count': 0, 'sources': {}})
+            entry['count'] += keys[key]
+            entry['sources'][filename] = {'occurrences': keys[key], 'pattern': pattern, 'category': category,
+                                          'original': originals[(pattern, category)]}
+            self.stale.add(key)
+        
+        self.files[filename] = {'digest': digest, 'keys': keys}
+        return 'updated' if previous else 'added'
+    
+    def remove_file(self, filename: str) -> None:
+        """Take a file's contribution back out, dropping patterns left with no source."""
+        for key, occurrences in self.files.pop(filename, {'keys': {}})['keys'].items():
+            entry = self.patterns[key]
+            entry['count'] -= occurrences
+            entry['sources'].pop(filename, None)
+            if not entry['sources']:
+                del self.patterns[key]
+                self.stale.discard(key)
+            else:
+                self.stale.add(key)
+    
+    def refresh_wordings(self) -> None:
+        """Re-choose the wording shown for every pattern whose sources changed.
+
+        Done once after merging rather than per file, so a pattern shared by
+        many files is not re-tallied for each of them.
+        """
+        for key in self.stale:
+            entry = self.patterns[key]
+            entry['pattern'], entry['category'] = representative(count_wordings(entry['sources'].values()))
+        self.stale.clear()
+    
+    def prune(self, filenames: Set[str]) -> List[str]:
+        """Remove every file not in filenames; returns the removed ones."""
+        removed = sorted(set(self.files) - filenames)
+        for filename in removed:
+            self.remove_file(filename)
+        return removed
+    
+    def unique_patterns(self, similarity_threshold: Optional[float] = None) -> List[Dict]:
+        """Patterns by count, ties broken by text so the order is stable.
+
+        With a similarity_threshold (0-1), patterns whose shingle similarity
+        reaches it are merged first: counts and sources add up, and the
+        wording shown is chosen over all their sources (see representative).
+        """
+        self.refresh_wordings()
+        ranked = sorted(self.patterns.values(), key=lambda p: (-p['count'], p['pattern']))
+        if similarity_threshold is None:
+            return ranked
+        
+        merged = []
+        for cluster in find_near_duplicates([normalize_pattern(p['pattern']) for p in ranked], similarity_threshold):
+            members = [ranked[i] for i in cluster]
+            if len(members) == 1:
+                merged.append(members[0])
+                continue
+            sources = combine_sources(p['sources'] for p in members)
+            pattern, category = representative(count_wordings(c for p in members for c in p['sources'].values()))
+            merged.append({'pattern': pattern, 'category': category,
+                           'count': sum(p['count'] for p in members), 'sources': sources})
+        return sorted(merged, key=lambda p: (-p['count'], p['pattern']))
+    
+    def top(self, n: int, similarity_threshold: Optional[float] = None) -> List[Dict]:
+        """The n most frequent patterns (see unique_patterns)."""
+        return self.unique_patterns(similarity_threshold)[:n]
@@ -0,0 +1,303 @@
+"""
+Content-based related-prompt recommendations for the prompt arsenal.
+Prompts are vectorized as TF-IDF over word unigrams and bigrams, and the
+top-k neighbours of every prompt come from batched matrix products. The
+index is saved between runs and updated in place when prompts are added,
+edited or removed. NumPy is optional for the rest of the pipeline: without
+it HAVE_NUMPY is False and callers keep their static related lists.
+"""
+
+import hashlib
+import io
+import json
+import math
+import re
+import zipfile
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from insights_core import (
+    ECOSYSTEM_SECTION_PATTERN, FRONTMATTER_PATTERN, RELATED_SECTION_PATTERN,
+    extract_frontmatter, frontmatter_text, parse_tags,
+)
+from output_writer import OutputWriter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# Configuration
+INDEX_VERSION = 1
+RELATED_TOP_K = 4
+# Vocabulary: terms in at least MIN_DF prompts and at most MAX_DF of them,
+# the MAX_FEATURES most widespread of those
+MIN_DF = 2
+MAX_DF = 0.5
+MAX_FEATURES = 4096
+# Rows per similarity block (BLOCK_SIZE x prompts scores in memory at once)
+BLOCK_SIZE = 1024
+# Refit vocabulary and IDF once this fraction of the prompts has changed
+REFIT_FRACTION = 0.2
+
+TERM_PATTERN = re.compile(r'[a-z][a-z0-9]+')
+
+def prompt_title(frontmatter: Dict, body: str, path: Path) -> str:
+    """Frontmatter title, else the first H1, else the file name."""
+    title = frontmatter_text(frontmatter, 'title')
+    if title:
+        return title
+    for line in body.split('\n'):
+        if line.startswith('# '):
+            return line[2:].strip()
+    return path.stem.replace('-', ' ').title()
+
+def prompt_terms(text: str) -> Counter:
+    """Count the unigrams and bigrams of a text."""
+    words = TERM_PATTERN.findall(text.lower())
+    terms = Counter(words)
+    terms.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return terms
+
+def load_prompt(path: Path, rel_path: str) -> Dict:
+    """Read one prompt as {'path', 'title', 'digest', 'terms'}.
+
+    Link sections are left out so existing cross-links do not feed back
+    into the similarity.
+    """
+    data = path.read_bytes()
+    content = data.decode('utf-8', errors='replace')
+    frontmatter = extract_frontmatter(content)
+    match = FRONTMATTER_PATTERN.match(content)
+    body = content[match.end():] if match else content
+    body = ECOSYSTEM_SECTION_PATTERN.sub('', RELATED_SECTION_PATTERN.sub('', body))
+    title = prompt_title(frontmatter, body, path)
+    tags = ' '.join(parse_tags(frontmatter.get('tags')))
+    return {
+        'path': rel_path,
+        'title': title,
+        'digest': hashlib.sha256(data).hexdigest(),
+        'terms': prompt_terms(f"{title}\n{tags}\n{body}")
+    }
+
+def find_prompts(arsenal_dir: Path) -> Dict[str, Path]:
+    """Prompt files by arsenal-relative POSIX path (READMEs and dot-directories excluded)."""
+    prompts = {}
+    for path in sorted(arsenal_dir.rglob('*.md')):
+        rel = path.relative_to(arsenal_dir)
+        if path.name.lower() == 'readme.md' or any(part.startswith('.') for part in rel.parts):
+            continue
+        prompts[rel.as_posix()] = path
+    return prompts
+
+def select_top(neighbours: 'np.ndarray', scores: 'np.ndarray', k: int) -> Tuple['np.ndarray', 'np.ndarray']:
+    """Keep the k best-scoring candidates per row, best first.
+
+    Candidates with no shared terms (score <= 0) become -1 / 0.0.
+    """
+    if scores.shape[1] > k:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        neighbours = np.take_along_axis(neighbours, part, axis=1)
+        scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-scores, axis=1, kind='stable')
+    neighbours = np.take_along_axis(neighbours, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    empty = scores <= 0
+    neighbours[empty] = -1
+    scores[empty] = 0.0
+    if scores.shape[1] < k:
+        pad = k - scores.shape[1]
+        neighbours = np.pad(neighbours, ((0, 0), (0, pad)), constant_values=-1)
+        scores = np.pad(scores, ((0, 0), (0, pad)))
+    return neighbours, scores
+
+class RelatedIndex:
+    """TF-IDF vectors of all prompts plus each prompt's top-k most similar prompts."""
+    
+    def __init__(self, vocabulary: List[str], idf: 'np.ndarray', top_k: int = RELATED_TOP_K):
+        if np is None:
+            raise ImportError("numpy is required for the related-prompt index")
+        self.vocabulary = vocabulary
+        self.term_ids = {term: i for i, term in enumerate(vocabulary)}
+        self.idf = idf.astype(np.float32)
+        self.top_k = top_k
+        self.fitted_size = 0
+        self.paths: List[str] = []
+        self.titles: List[str] = []
+        self.digests: List[str] = []
+        self.vectors = np.zeros((0, len(vocabulary)), dtype=np.float32)
+        self.neighbours = np.zeros((0, top_k), dtype=np.int32)
+        self.scores = np.zeros((0, top_k), dtype=np.float32)
+    
+    @classmethod
+    def fit(cls, documents: List[Dict], top_k: int = RELATED_TOP_K) -> 'RelatedIndex':
+        """Build the vocabulary and IDF from documents and score every pair."""
+        df = Counter()
+        for doc in documents:
+            df.update(doc['terms'].keys())
+        n = len(documents)
+        max_df = max(MIN_DF, MAX_DF * n)
+        candidates = [(count, term) for term, count in df.items() if MIN_DF <= count <= max_df]
+        candidates.sort(key=lambda item: (-item[0], item[1]))
+        vocabulary = sorted(term for _, term in candidates[:MAX_FEATURES])
+        idf = np.array([math.log((1 + n) / (1 + df[term])) + 1 for term in vocabulary], dtype=np.float32)
+        
+        index = cls(vocabulary, idf, top_k)
+        index.update(documents)
+        index.fitted_size = n
+        return index
+    
+    def vectorize(self, documents: List[Dict]) -> 'np.ndarray':
+        """L2-normalized sublinear TF-IDF rows over the fitted vocabulary."""
+        vectors = np.zeros((len(documents), len(self.vocabulary)), dtype=np.float32)
+        for row, doc in enumerate(documents):
+            hits = [(self.term_ids[term], count) for term, count in doc['terms'].items() if term in self.term_ids]
+            if hits:
+                columns, counts = zip(*hits)
+                vectors[row, list(columns)] = 1 + np.log(np.array(counts, dtype=np.float32))
+        vectors *= self.idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+    
+    def top_neighbours(self, rows: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        """Exact top-k over all prompts for the given rows, BLOCK_SIZE rows per product."""
+        all_neighbours, all_scores = [], []
+        for start in range(0, len(rows), BLOCK_SIZE):
+            block = rows[start:start + BLOCK_SIZE]
+            scores = self.vectors[block] @ self.vectors.T
+            scores[np.arange(len(block)), block] = -np.inf
+            candidates = np.broadcast_to(np.arange(len(self.paths), dtype=np.int32), scores.shape)
+            neighbours, scores = select_top(candidates, scores, self.top_k)
+            all_neighbours.append(neighbours)
+            all_scores.append(scores)
+        if not all_neighbours:
+            return np.zeros((0, self.top_k), dtype=np.int32), np.zeros((0, self.top_k), dtype=np.float32)
+        return np.concatenate(all_neighbours), np.concatenate(all_scores)
+    
+    def update(self, documents: List[Dict], removed: Iterable[str] = ()) -> int:
+        """Add or replace documents and drop removed paths, keeping the fitted vocabulary.
+
+        New and replaced prompts, and prompts that lost a neighbour, are
+        rescored exactly. Every other prompt only has its current top-k
+        merged with its scores against the new prompts. Returns the number
+        of rows rescored exactly.
+        """
+        position = {path: i for i, path in enumerate(self.paths)}
+        stale = {position[path] for path in removed if path in position}
+        stale.update(position[doc['path']] for doc in documents if doc['path'] in position)
+        
+        # Drop stale rows; neighbour ids are remapped and dropped ones become -1
+        keep = np.array([i for i in range(len(self.paths)) if i not in stale], dtype=np.intp)
+        remap = np.full(len(self.paths) + 1, -1, dtype=np.int32)
+        remap[keep] = np.arange(len(keep), dtype=np.int32)
+        lost = (remap[self.neighbours] == -1) & (self.neighbours != -1)
+        dirty = lost.any(axis=1)[keep]
+        neighbours = remap[self.neighbours][keep]
+        scores = self.scores[keep]
+        
+        self.paths = [self.paths[i] for i in keep] + [doc['path'] for doc in documents]
+        self.titles = [self.titles[i] for i in keep] + [doc['title'] for doc in documents]
+        self.digests = [self.digests[i] for i in keep] + [doc['digest'] for doc in documents]
+        self.vectors = np.concatenate([self.vectors[keep], self.vectorize(documents)])
+        
+        new_rows = np.arange(len(keep), len(self.paths))
+        clean_rows = np.flatnonzero(~dirty)
+        if len(new_rows):
+            for start in range(0, len(clean_rows), BLOCK_SIZE):
+                block = clean_rows[start:start + BLOCK_SIZE]
+                new_scores = self.vectors[block] @ self.vectors[new_rows].T
+                candidates = np.concatenate([neighbours[block], np.broadcast_to(new_rows.astype(np.int32), new_scores.shape)], axis=1)
+                merged = np.concatenate([np.where(neighbours[block] >= 0, scores[block], -np.inf), new_scores], axis=1)
+                neighbours[block], scores[block] = select_top(candidates, merged, self.top_k)
+        
+        self.neighbours = np.concatenate([neighbours, np.full((len(new_rows), self.top_k), -1, dtype=np.int32)])
+        self.scores = np.concatenate([scores, np.zeros((len(new_rows), self.top_k), dtype=np.float32)])
+        rescore = np.concatenate([np.flatnonzero(dirty), new_rows]).astype(np.intp)
+        self.neighbours[rescore], self.scores[rescore] = self.top_neighbours(rescore)
+        return len(rescore)
+    
+    def related(self, path: str) -> List[Tuple[str, str, float]]:
+        """(title, path, score) of the prompts most similar to path, best first."""
+        try:
+            row = self.paths.index(path)
+        except ValueError:
+            return []
+        return [(self.titles[i], self.paths[i], float(score))
+                for i, score in zip(self.neighbours[row], self.scores[row]) if i >= 0]
+    
+    def save(self, path: Path, writer: OutputWriter) -> bool:
+        """Save as .npz with the vectors stored sparse."""
+        rows, columns = np.nonzero(self.vectors)
+        meta = {
+            'version': INDEX_VERSION,
+            'top_k': self.top_k,
+            'fitted_size': self.fitted_size,
+            'vocabulary': self.vocabulary,
+            'paths': self.paths,
+            'titles': self.titles,
+            'digests': self.digests
+        }
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer, meta=np.array(json.dumps(meta)), idf=self.idf,
+            rows=rows.astype(np.int32), columns=columns.astype(np.int32), values=self.vectors[rows, columns],
+            neighbours=self.neighbours, scores=self.scores
+        )
+        return writer.write_bytes(path, buffer.getvalue())
+    
+    @classmethod
+    def load(cls, path: Path) -> Optional['RelatedIndex']:
+        """Load a saved index, or None if it is missing or from another version."""
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data['meta']))
+                if meta.get('version') != INDEX_VERSION:
+                    return None
+                index = cls(meta['vocabulary'], data['idf'], meta['top_k'])
+                index.fitted_size = meta['fitted_size']
+                index.paths, index.titles, index.digests = meta['paths'], meta['titles'], meta['digests']
+                index.vectors = np.zeros((len(index.paths), len(index.vocabulary)), dtype=np.float32)
+                index.vectors[data['rows'], data['columns']] = data['values']
+                index.neighbours = data['neighbours']
+                index.scores = data['scores']
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+        return index
+
+def build_related_index(arsenal_dir: Path, index_path: Optional[Path], writer: OutputWriter,
+                        top_k: int = RELATED_TOP_K, refit: bool = False) -> Tuple['RelatedIndex', Dict[str, int]]:
+    """Bring the related-prompt index up to date with the arsenal.
+
+    Only prompts whose content hash changed are read and vectorized; the
+    vocabulary is refitted from scratch when there is no usable saved
+    index, when refit is set, or when more than REFIT_FRACTION of the
+    prompts changed since the last fit. Returns the index and counts of
+    what happened.
+    """
+    prompts = find_prompts(arsenal_dir)
+    index = None if refit or index_path is None else RelatedIndex.load(index_path)
+    if index is not None and index.top_k != top_k:
+        index = None
+    
+    known = dict(zip(index.paths, index.digests)) if index else {}
+    changed = []
+    for rel_path, path in prompts.items():
+        if known.get(rel_path) != hashlib.sha256(path.read_bytes()).hexdigest():
+            changed.append(rel_path)
+    removed = [rel_path for rel_path in known if rel_path not in prompts]
+    
+    stats = {'prompts': len(prompts), 'changed': len(changed), 'removed': len(removed), 'rescored': 0, 'refit': 0}
+    if index is None or len(changed) + len(removed) > REFIT_FRACTION * max(index.fitted_size, 1):
+        index = RelatedIndex.fit([load_prompt(path, rel_path) for rel_path, path in prompts.items()], top_k)
+        stats['refit'] = 1
+        stats['rescored'] = len(index.paths)
+    elif changed or removed:
+        stats['rescored'] = index.update([load_prompt(prompts[rel_path], rel_path) for rel_path in changed], removed)
+    
+    if index_path is not None and (stats['refit'] or changed or removed):
+        index.save(index_path, writer)
+    return index, stats
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Try other quality weights and tier thresholds on the saved feature columns,
+without re-extracting: tier and domain distributions for the whole corpus.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from feature_store import HAVE_NUMPY, SCORING_RULES, TIER_THRESHOLDS, TIERS, FeatureStore, features_path
+
+# Configuration
+EXTRACTED_DATA_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\scripts\all-extracted-data.json"
+# Files listed per tier change
+CHANGED_EXAMPLES = 10
+
+def parse_setting(text: str) -> Tuple[str, int]:
+    """NAME=N from the command line."""
+    name, _, value = text.partition('=')
+    try:
+        return name.strip(), int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=N, got {text!r}")
+
+def build_rules(points: List[Tuple[str, int]], minimums: List[Tuple[str, int]]) -> Dict:
+    """SCORING_RULES with --points and --minimum overrides applied."""
+    rules = dict(SCORING_RULES)
+    for option, overrides, position in [('--points', points, 2), ('--minimum', minimums, 1)]:
+        for name, value in overrides:
+            if name not in rules:
+                raise SystemExit(f"❌ {option}: unknown rule {name!r} (rules: {', '.join(rules)})")
+            rule = list(rules[name])
+            rule[position] = value
+            rules[name] = tuple(rule)
+    return rules
+
+def print_report(store: FeatureStore, rules: Dict, thresholds: Tuple, tiers, seconds: float) -> None:
+    """Rules, tier distribution against the stored one, domains and moved files."""
+    print("🧮 QUALITY RESCORING")
+    print("=" * 70)
+    for name, (columns, minimum, points) in rules.items():
+        changed = '' if SCORING_RULES[name] == (columns, minimum, points) else '  ← changed'
+        print(f"{name:16s} +{points}  if {' and '.join(columns)} >= {minimum}{changed}")
+    print(f"Tiers: {', '.join(f'{tier} >= {minimum}' for tier, minimum in thresholds)}, else LOW")
+    print(f"⏱️  Rescored {len(store)} files in {seconds * 1000:.1f} ms")
+    print()
+    
+    before = store.tier_counts(store.stored_tiers)
+    after = store.tier_counts(tiers)
+    print("🏆 QUALITY DISTRIBUTION (stored → rescored)")
+    print("=" * 70)
+    for tier in TIERS:
+        delta = after[tier] - before[tier]
+        print(f"{tier:6s} {before[tier]:6d} → {after[tier]:6d}  ({delta:+d})")
+    print()
+    
+    print("🏷️  DOMAIN BREAKDOWN")
+    print("=" * 70)
+    domain_counts = store.domain_counts()
+    cells = store.domain_tier_counts(tiers)
+    print(f"{'':20s} {'files':>6s} " + ' '.join(f"{tier:>6s}" for tier in TIERS))
+    for domain, count in sorted(domain_counts.items(), key=lambda x: x[1], reverse=True):
+        row = cells.get(domain, {})
+        print(f"{domain:20s} {count:6d} " + ' '.join(f"{row.get(tier, 0):6d}" for tier in TIERS))
+    print()
+    
+    moved = (tiers != store.stored_tiers) & (tiers >= 0)
+    print(f"🔀 {int(moved.sum())} files change tier")
+    for index in moved.nonzero()[0][:CHANGED_EXAMPLES]:
+        print(f"   {store.filenames[index]}: {TIERS[store.stored_tiers[index]]} → {TIERS[tiers[index]]}")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Rescore extracted files from their saved quality features.")
+    parser.add_argument('--features', metavar='PATH',
+                        help="feature store written by extract-all-insights.py "
+                             "(default: next to EXTRACTED_DATA_FILE)")
+    parser.add_argument('--points', type=parse_setting, action='append', default=[], metavar='RULE=N',
+                        help=f"points a rule is worth (rules: {', '.join(SCORING_RULES)})")
+    parser.add_argument('--minimum', type=parse_setting, action='append', default=[], metavar='RULE=N',
+                        help="count a rule's features must reach")
+    parser.add_argument('--high', type=int, default=dict(TIER_THRESHOLDS)['HIGH'], metavar='N',
+                        help="minimum score for HIGH (default: %(default)s)")
+    parser.add_argument('--medium', type=int, default=dict(TIER_THRESHOLDS)['MEDIUM'], metavar='N',
+                        help="minimum score for MEDIUM (default: %(default)s)")
+    parser.add_argument('--json', action='store_true', help="print the distributions as JSON")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """Load the feature columns and rescore every file."""
+    args = parse_args(argv)
+    if not HAVE_NUMPY:
+        raise SystemExit("❌ Rescoring needs NumPy (pip install numpy)")
+    
+    path = Path(args.features) if args.features else features_path(Path(EXTRACTED_DATA_FILE))
+    store = FeatureStore.load(path)
+    if store is None:
+        raise SystemExit(f"❌ No feature store at {path} (run extract-all-insights.py first)")
+    
+    rules = build_rules(args.points, args.minimum)
+    thresholds = (('HIGH', args.high), ('MEDIUM', args.medium))
+    start = time.perf_counter()
+    tiers = store.tiers(rules, thresholds)
+    seconds = time.perf_counter() - start
+    
+    if args.json:
+        print(json.dumps({
+            'files': len(store),
+            'seconds': round(seconds, 6),
+            'quality_tiers': store.tier_counts(tiers),
+            'stored_quality_tiers': store.tier_counts(store.stored_tiers),
+            'domains': store.domain_counts(),
+            'domain_tiers': store.domain_tier_counts(tiers),
+            'changed': int(((tiers != store.stored_tiers) & (tiers >= 0)).sum())
+        }, indent=2))
+        return
+    print_report(store, rules, thresholds, tiers, seconds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Run the whole Arsenal pipeline make-style: each stage is skipped when the
+content hashes of its inputs (data files and its own code) are unchanged
+since its last successful run, and independent stages run concurrently.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from arsenal_repos import REPOS_CONFIG_FILE, load_repos_config, readme_repos
+from keyword_taxonomy import TAXONOMY_FILE
+from output_writer import OutputWriter
+
+# Configuration
+SCRIPTS_DIR = Path(__file__).resolve().parent
+STATE_FILE = SCRIPTS_DIR / '.pipeline-state.json'
+LOG_DIR = SCRIPTS_DIR / 'pipeline-logs'
+MAX_WORKERS = 4
+# Lines of each stage's output shown after it finishes (full output in LOG_DIR)
+OUTPUT_TAIL_LINES = 12
+
+output_writer = OutputWriter()
+
+def script_constant(script: str, name: str):
+    """Read a module-level path constant from a script without running it."""
+    tree = ast.parse((SCRIPTS_DIR / script).read_text(encoding='utf-8'))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == name for t in node.targets):
+            value = node.value
+            # PATH = Path(r"...")
+            if isinstance(value, ast.Call) and getattr(value.func, 'id', None) == 'Path' and value.args:
+                value = value.args[0]
+            return ast.literal_eval(value)
+    raise KeyError(f"{name} not found in {script}")
+
+def local_sources(script: str) -> List[Path]:
+    """The script plus every sibling module it imports, directly or indirectly."""
+    seen: Set[Path] = set()
+    pending = [SCRIPTS_DIR / script]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+            names = []
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            for name in names:
+                module = SCRIPTS_DIR / f"{name.split('.')[0]}.py"
+                if module.exists():
+                    pending.append(module)
+    return sorted(seen)
+
+def pipeline_stages() -> Dict[str, Dict]:
+    """Stage definitions in run order.
+
+    inputs and outputs are file paths or (directory, glob) pairs; each
+    stage's code (script and local modules) is added to its inputs.
+    """
+    insights = (script_constant('extract-all-insights.py', 'INSIGHTS_DIR'), '*.md')
+    prompt_arsenal = script_constant('generate-arsenal-items.py', 'PROMPT_ARSENAL_DIR')
+    readmes = [str(Path(repo['path']) / 'README.md') for repo in readme_repos(load_repos_config()).values()]
+    
+    stages = {
+        'assess': {
+            'script': 'extract-insights-metadata.py',
+            'deps': [],
+            # Assessment extracts through the Phase 2 extractor and its cache
+            'inputs': [insights, TAXONOMY_FILE, *local_sources('extract-all-insights.py')],
+            'outputs': [script_constant('extract-insights-metadata.py', 'OUTPUT_FILE')]
+        },
+        'extract': {
+            'script': 'extract-all-insights.py',
+            # Runs after assess so it reuses the cached results instead of parsing every file again
+            'deps': ['assess'],
+            'inputs': [insights, TAXONOMY_FILE],
+            'outputs': [script_constant('extract-all-insights.py', 'OUTPUT_FILE')]
+        },
+        'generate': {
+            'script': 'generate-arsenal-items.py',
+            'deps': ['extract'],
+            'inputs': [script_constant('generate-arsenal-items.py', 'EXTRACTED_DATA_FILE'), TAXONOMY_FILE,
+                       (SCRIPTS_DIR / 'templates', '*')],
+            'outputs': [(prompt_arsenal, '**/*.md'),
+                        script_constant('generate-arsenal-items.py', 'PATTERNS_LIBRARY_FILE'),
+                        script_constant('generate-arsenal-items.py', 'PATTERN_INDEX_FILE')]
+        },
+        'enhance': {
+            'script': 'enhance-prompt-links.py',
+            'deps': ['generate'],
+            'inputs': [(script_constant('enhance-prompt-links.py', 'PROMPT_ARSENAL'), '**/*.md')],
+            'outputs': []
+        },
+        'ecosystem': {
+            'script': 'update-ecosystem-links.py',
+            'deps': [],
+            'inputs': [REPOS_CONFIG_FILE, *readmes],
+            'outputs': readmes
+        },
+    }
+    for stage in stages.values():
+        stage['inputs'] = [*stage['inputs'], *local_sources(stage['script'])]
+    return stages
+
+class FileHasher:
+    """sha256 of files, re-hashing only those whose size or mtime changed since the last run."""
+    
+    def __init__(self, cache: Dict[str, List]):
+        self.cache = cache
+    
+    def digest(self, path: str) -> Optional[str]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        cached = self.cache.get(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        self.cache[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return self.cache[path][2]
+    
+    def snapshot(self, specs: List) -> Dict[str, Optional[str]]:
+        """{path: sha256 or None if missing} for files and (directory, glob) specs."""
+        hashes = {}
+        for spec in specs:
+            if isinstance(spec, tuple):
+                directory, pattern = spec
+                if not Path(directory).is_dir():
+                    hashes[f"{directory}/{pattern}"] = None
+                    continue
+                for path in sorted(Path(directory).glob(pattern)):
+                    if path.is_file():
+                        hashes[str(path)] = self.digest(str(path))
+            else:
+                hashes[str(spec)] = self.digest(str(spec))
+        return hashes
+
+def fingerprint(hashes: Dict[str, Optional[str]]) -> str:
+    return hashlib.sha256(json.dumps(hashes, sort_keys=True).encode('utf-8')).hexdigest()
+
+def stage_status(name: str, stage: Dict, state: Dict, hasher: FileHasher, force: bool) -> Tuple[str, str]:
+    """('run' or 'skip', reason) from the stage's current inputs and outputs."""
+    record = state['stages'].get(name)
+    if force:
+        return 'run', "forced"
+    if record is None:
+        return 'run', "never run"
+    inputs = hasher.snapshot(stage['inputs'])
+    if fingerprint(inputs) != record['fingerprint']:
+        previous = record['inputs']
+        changed = [path for path in inputs.keys() | previous.keys() if inputs.get(path) != previous.get(path)]
+        return 'run', f"{len(changed)} input file{'s' if len(changed) != 1 else ''} changed"
+    # Only outputs the last run produced; some are legitimately absent (e.g. repos not cloned here)
+    missing = [path for path, digest in hasher.snapshot(stage['outputs']).items()
+               if digest is None and record['outputs'].get(path) is not None]
+    if missing:
+        return 'run', f"output missing: {missing[0]}"
+    return 'skip', "up to date"
+
+def run_stage(name: str, stage: Dict) -> Dict:
+    """Run one stage's script; returns its exit code, output and duration."""
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, str(SCRIPTS_DIR / stage['script'])], cwd=SCRIPTS_DIR, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               encoding='utf-8', errors='replace')
+    return {'stage': name, 'returncode': completed.returncode, 'output': completed.stdout,
+            'seconds': time.perf_counter() - start}
+
+def selected_stages(stages: Dict[str, Dict], targets: List[str]) -> List[str]:
+    """Targets plus everything upstream of them, in pipeline order."""
+    if not targets:
+        return list(stages)
+    wanted: Set[str] = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(stages[name]['deps'])
+    return [name for name in stages if name in wanted]
+
+def print_plan(names: List[str], stages: Dict[str, Dict], state: Dict, hasher: FileHasher, force: Set[str]) -> None:
+    """Show what a run would do, without running anything."""
+    print("📋 PIPELINE PLAN (dry run)")
+    print("=" * 70)
+    will_run: Set[str] = set()
+    for name in names:
+        action, reason = stage_status(name, stages[name], state, hasher, name in force)
+        upstream = [dep for dep in stages[name]['deps'] if dep in will_run]
+        if action == 'skip' and upstream:
+            action, reason = 'maybe', f"reruns if {', '.join(upstream)} changes its outputs"
+        if action != 'skip':
+            will_run.add(name)
+        symbol = {'run': '▶️ ', 'maybe': '❔', 'skip': '⏭️ '}[action]
+        print(f"{symbol} {name:10s} {stages[name]['script']:30s} {reason}")
+
+def run_pipeline(names: List[str], stages: Dict[str, Dict], state: Dict, hasher: FileHasher,
+                 force: Set[str], workers: int, verbose: bool) -> Dict[str, str]:
+    """Run the selected stages as their dependencies finish; returns each stage's result."""
+    results: Dict[str, str] = {}
+    running = {}
+    LOG_DIR.mkdir(exist_ok=True)
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while len(results) < len(names):
+            for name in names:
+                if name in results or name in running.values():
+                    continue
+                deps = [dep for dep in stages[name]['deps'] if dep in names]
+                if any(results.get(dep) in ('failed', 'blocked') for dep in deps):
+                    results[name] = 'blocked'
+                    print(f"\n⛔ {name}: blocked by a failed upstream stage")
+                    continue
+                if not all(dep in results for dep in deps):
+                    continue
+                # Decided only now, so upstream outputs are part of the input hashes
+                action, reason = stage_status(name, stages[name], state, hasher, name in force)
+                if action == 'skip':
+                    results[name] = 'skipped'
+                    print(f"\n⏭️  {name}: {reason}")
+                    continue
+                print(f"\n▶️  {name}: {reason}, running {stages[name]['script']}...")
+                running[pool.submit(run_stage, name, stages[name])] = name
+            
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                outcome = future.result()
+                log_file = LOG_DIR / f"{name}.log"
+                output_writer.write_text(log_file, outcome['output'])
+                lines = outcome['output'].rstrip().split('\n')
+                shown = lines if verbose else lines[-OUTPUT_TAIL_LINES:]
+                
+                if outcome['returncode'] == 0:
+                    results[name] = 'ran'
+                    # Hashed after the run: stages that update their inputs in place
+                    # (enhance, ecosystem) are then up to date on the next run
+                    inputs = hasher.snapshot(stages[name]['inputs'])
+                    state['stages'][name] = {
+                        'fingerprint': fingerprint(inputs),
+                        'inputs': inputs,
+                        'outputs': hasher.snapshot(stages[name]['outputs']),
+                        'finished': datetime.now().isoformat(),
+                        'seconds': round(outcome['seconds'], 2)
+                    }
+                    print(f"\n✅ {name} finished in {outcome['seconds']:.1f}s (log: {log_file})")
+                else:
+                    results[name] = 'failed'
+                    print(f"\n❌ {name} failed with exit code {outcome['returncode']} (log: {log_file})")
+                for line in shown:
+                    print(f"   │ {line}")
+    
+    return results
+
+def load_state(path: Path) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'stages': {}, 'hashes': {}}
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Run the Arsenal pipeline, skipping stages whose inputs are unchanged.")
+    parser.add_argument('targets', nargs='*', metavar='STAGE',
+                        help="stages to bring up to date, with their upstream stages (default: all)")
+    parser.add_argument('--dry-run', action='store_true', help="show the plan without running anything")
+    parser.add_argument('--force', nargs='?', const='*', metavar='STAGE[,STAGE...]',
+                        help="run these stages (default: all selected) even if up to date")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, metavar='N',
+                        help="run up to N independent stages at once (default: %(default)s)")
+    parser.add_argument('--verbose', action='store_true', help="print each stage's full output")
+    parser.add_argument('--state', default=STATE_FILE, metavar='PATH',
+                        help="stage hashes from previous runs (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """Plan or run the pipeline."""
+    args = parse_args(argv)
+    stages = pipeline_stages()
+    unknown = [name for name in args.targets + (args.force or '').split(',') if name not in stages and name not in ('', '*')]
+    if unknown:
+        raise SystemExit(f"❌ Unknown stage(s): {', '.join(unknown)} (stages: {', '.join(stages)})")
+    
+    names = selected_stages(stages, args.targets)
+    force = set(names) if args.force == '*' else set((args.force or '').split(',')) - {''}
+    state_path = Path(args.state)
+    state = load_state(state_path)
+    hasher = FileHasher(state['hashes'])
+    
+    if args.dry_run:
+        print_plan(names, stages, state, hasher, force)
+        return
+    
+    print("🏭 ARSENAL PIPELINE")
+    print("=" * 70)
+    start = time.perf_counter()
+    results = run_pipeline(names, stages, state, hasher, force, args.workers, args.verbose)
+    output_writer.write_text(state_path, json.dumps(state, indent=1, sort_keys=True))
+    
+    print(f"\n{'=' * 70}")
+    for name in names:
+        symbol = {'ran': '✅', 'skipped': '⏭️ ', 'failed': '❌', 'blocked': '⛔'}[results[name]]
+        print(f"{symbol} {name:10s} {results[name]}")
+    print(f"⏱️  Total: {time.perf_counter() - start:.1f}s")
+    if any(result in ('failed', 'blocked') for result in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Import the hyphen-named pipeline scripts as modules.
+Lets one stage reuse another's functions (and its cache) without copying them.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+# Configuration
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+def load_script(filename: str):
+    """Import a hyphen-named pipeline script as a module."""
+    name = filename[:-3].replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Build and query the SQLite search index over extracted insights.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from insights_core import iter_extraction_records
+from insights_index import (
+    INDEX_FILE, build_index, find_files, get_record, open_index,
+    search_lessons, search_prompts, search_quick_wins,
+)
+
+# Configuration
+EXTRACTED_DATA_FILE = r"C:\Users\theca\CascadeProjects\arsenal-integration-hub\scripts\all-extracted-data.json"
+
+SEARCHES = {
+    'prompts': search_prompts,
+    'quick-wins': search_quick_wins,
+    'lessons': search_lessons,
+}
+
+def print_results(kind: str, results: List[Dict]) -> None:
+    """Print search or filter results one per line."""
+    if not results:
+        print("   (no matches)")
+        return
+    for r in results:
+        print(f"📄 {r['filename']}  [{r['domain']}, {r['quality_score']}, {r['date']}]")
+        if kind == 'prompts':
+            print(f"   {r['title']}")
+            print(f"   {r['snippet']}")
+        elif kind == 'quick-wins':
+            category = f"{r['category']} → " if r['category'] else ''
+            print(f"   {category}{r['pattern']}")
+        elif kind == 'lessons':
+            print(f"   {r['lesson']}")
+        else:
+            print(f"   {r['title']}")
+
+def add_filters(parser: argparse.ArgumentParser) -> None:
+    """Metadata filters shared by the query commands."""
+    parser.add_argument('--domain', help="only files in this domain")
+    parser.add_argument('--quality', choices=['HIGH', 'MEDIUM', 'LOW'], type=str.upper,
+                        help="only files with this quality score")
+    parser.add_argument('--tag', help="only files with this tag")
+    parser.add_argument('--limit', type=int, default=20, help="maximum results (default: %(default)s)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Search extracted super-prompts, quick wins and lessons.")
+    parser.add_argument('--db', default=INDEX_FILE, metavar='PATH',
+                        help="index database (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    build = commands.add_parser('build', help="rebuild the index from extraction data")
+    build.add_argument('--input', default=EXTRACTED_DATA_FILE, metavar='PATH',
+                       help="extraction data, .json or .jsonl (default: %(default)s)")
+    
+    for kind in SEARCHES:
+        search = commands.add_parser(kind, help=f"full-text search over {kind.replace('-', ' ')}")
+        search.add_argument('query', help="search terms (all must match)")
+        search.add_argument('--raw', action='store_true', help="pass the query to FTS5 unchanged (AND/OR/NEAR, prefix*)")
+        add_filters(search)
+    
+    files = commands.add_parser('files', help="list files by metadata")
+    add_filters(files)
+    files.add_argument('--since', metavar='DATE', help="only files dated on or after DATE")
+    files.add_argument('--until', metavar='DATE', help="only files dated on or before DATE")
+    
+    show = commands.add_parser('show', help="print the full extraction record for a file")
+    show.add_argument('filename')
+    
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """Build the index or run a query against it."""
+    args = parse_args(argv)
+    db_path = Path(args.db)
+    
+    if args.command == 'build':
+        print("🗂️  BUILDING INSIGHTS INDEX")
+        print("=" * 70)
+        start = time.perf_counter()
+        counts = build_index(iter_extraction_records(args.input), db_path)
+        print(f"✅ Indexed {counts['files']} files in {time.perf_counter() - start:.1f}s")
+        print(f"   {counts['prompts']} super-prompts, {counts['quick_wins']} quick wins, "
+              f"{counts['lessons']} lessons, {counts['tags']} tags")
+        print(f"💾 Index saved to: {db_path}")
+        return
+    
+    conn = open_index(db_path)
+    try:
+        start = time.perf_counter()
+        if args.command == 'show':
+            record = get_record(conn, args.filename)
+            if record is None:
+                print(f"⚠️  {args.filename} is not in the index")
+            else:
+                print(json.dumps(record, indent=2))
+            return
+        
+        filters = {'domain': args.domain, 'quality': args.quality, 'tag': args.tag, 'limit': args.limit}
+        if args.command == 'files':
+            results = find_files(conn, since=args.since, until=args.until, **filters)
+        else:
+            results = SEARCHES[args.command](conn, args.query, raw=args.raw, **filters)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        conn.close()
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"🔍 {len(results)} results ({elapsed_ms:.1f} ms)\n")
+    print_results(args.command, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Deterministic synthetic prompt-insights corpus for benchmarks.
+Each document is generated from (seed, index) alone, so any size can be
+produced in constant memory and regenerated file-for-file.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import List
+
+# Configuration
+CORPUS_VERSION = 1
+MANIFEST_FILE = 'corpus-manifest.json'
+
+# Heading variants as they appear in real insights files (None = section absent)
+SUPER_PROMPT_VARIANTS = [
+    '## Section 4: Super-Prompt',
+    '## 4) Super-Prompt (Reusable)',
+    '## 4. Super-Prompt',
+    '## Super-Prompt (Reusable)',
+    '## Super‑Prompt',
+    '## Super-Prompt',
+    None,
+]
+QUICK_WINS_VARIANTS = [
+    '## Section 9: Quick Wins',
+    '## 9) Quick Wins',
+    '## 9. Quick Wins',
+    '## Quick Wins Library',
+    None,
+]
+LESSONS_VARIANTS = [
+    '## Section 8: Lessons Learned',
+    '## 8) Lessons',
+    '## 8. Lessons',
+    None,
+]
+FENCE_VARIANTS = ['```markdown', '```', '```text', '```yaml', None]
+
+VOCABULARY = (
+    'api react zapier n8n database postgres docs documentation business marketing '
+    'data analysis docker deploy llm prompt test validation workflow automation '
+    'nextjs frontend chart visualization seo content ui rest forensics audit'
+).split()
+
+QUICK_WIN_LINES = [
+    '- Clarify → Ask what {TERM} means before answering',
+    'Format: output as a markdown table',
+    '- "Verify: cite a source for every claim"',
+    '• Verify sources against {SOURCE}',
+    'Check scope: confirm constraints first',
+    '- Rank ideas by value and effort',
+    '1. Summarize the thread in three bullets',
+]
+
+LESSON_LINES = [
+    '- Start from the output spec and work backwards',
+    '1. Keep variables explicit',
+    '• Ask for missing inputs instead of guessing',
+    'Plain observations are kept too',
+]
+
+def super_prompt_body(rng: random.Random) -> str:
+    """A super-prompt with the ROLE/TASK/INPUTS/PROCESS/OUTPUT/QUALITY fields."""
+    topic = ' '.join(rng.sample(VOCABULARY, 3))
+    inputs = '\n'.join(f"- {{{name}}}{' (optional)' if rng.random() < 0.3 else ''}"
+                       for name in rng.sample(['TOPIC', 'AUDIENCE', 'GOAL', 'REPO_URL', 'DEADLINE'], rng.randint(1, 4)))
+    steps = '\n'.join(f"{i}. Step {i} of the {topic} analysis" for i in range(1, rng.randint(3, 9)))
+    return (
+        f"ROLE: You are an expert in {topic}.\n"
+        f"TASK: Produce a complete {topic} plan\nwith clear priorities.\n\n"
+        f"INPUTS:\n{inputs}\n\n"
+        f"PROCESS:\n{steps}\n\n"
+        f"OUTPUT SPEC:\nA markdown report with a summary table.\n\n"
+        f"QUALITY CHECKS:\n- Every claim is sourced\n- Output matches the spec\n"
+    )
+
+def generate_document(index: int, seed: int = 0) -> str:
+    """Generate insights markdown for one file, deterministic in (seed, index)."""
+    rng = random.Random(seed * 1000003 + index)
+    title = ' '.join(rng.sample(VOCABULARY, 2)).title()
+    tags = ', '.join(rng.sample(VOCABULARY, rng.randint(1, 4)))
+    
+    sections = []
+    heading = rng.choice(SUPER_PROMPT_VARIANTS)
+    if heading:
+        fence = rng.choice(FENCE_VARIANTS)
+        body = super_prompt_body(rng)
+        if fence:
+            sections.append(f"{heading}\n\nUse this prompt to repeat the thread.\n\n{fence}\n{body}```\n")
+        else:
+            sections.append(f"{heading}\n\n{body}")
+    
+    heading = rng.choice(QUICK_WINS_VARIANTS)
+    if heading:
+        # Reword most lines so dedup sees exact repeats, near-duplicates and unique patterns
+        items = '\n'.join(
+            rng.choice(QUICK_WIN_LINES) + (f" for {' '.join(rng.sample(VOCABULARY, 2))}" if rng.random() < 0.7 else '')
+            for _ in range(rng.randint(1, 10))
+        )
+        if rng.random() < 0.5:
+            sections.append(f"{heading}\n\n```\n{items}\n```\n")
+        else:
+            sections.append(f"{heading}\n\n{items}\n")
+    
+    heading = rng.choice(LESSONS_VARIANTS)
+    if heading:
+        items = '\n'.join(rng.choice(LESSON_LINES) for _ in range(rng.randint(2, 6)))
+        sections.append(f"{heading}\n\n{items}\n")
+    
+    rng.shuffle(sections)
+    filler = '\n\n'.join(
+        ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(20, 80)))
+        for _ in range(rng.randint(1, 6))
+    )
+    
+    return (
+        f"---\n"
+        f"title: '{title} thread'\n"
+        f"date: 2025-{index % 12 + 1:02d}-{index % 28 + 1:02d}\n"
+        f"tags: [{tags}]\n"
+        f"thread_fingerprint: {seed:04x}{index:012x}\n"
+        f"---\n\n"
+        f"# {title} Thread Insights\n\n"
+        f"## Summary\n\n{filler}\n\n"
+        + '\n---\n\n'.join(sections)
+        + "\n## Appendix\n\nNotes.\n"
+    )
+
+# Super-prompt bodies that made the old DOTALL field regexes backtrack: many
+# field labels followed by colons that never end a line, long lines with
+# no terminator, and uppercase runs that almost look like field labels.
+# Each unit is repeated until the prompt reaches the requested size.
+ADVERSARIAL_UNITS = {
+    'process_colons': 'PROCESS step: detail ',
+    'output_colons': 'Output format: table ',
+    'quality_colons': 'QUALITY check: ok ',
+    'checklist_no_newline': 'Checklist item; ',
+    'inputs_no_newline': 'INPUTS: {VAR} ',
+    'role_unterminated': 'ROLE: expert reviewer and ',
+    'uppercase_near_labels': '\nABCDEFGHIJ KLMNOPQRST UVWXYZ',
+    'blank_line_floods': 'TASK: x\n\n\n\n ',
+}
+
+def adversarial_document(case: str, size: int) -> str:
+    """Insights file whose super-prompt is ADVERSARIAL_UNITS[case] repeated to ~size chars."""
+    unit = ADVERSARIAL_UNITS[case]
+    body = unit * max(1, size // len(unit))
+    return (
+        f"---\ntitle: 'Adversarial {case}'\nthread_fingerprint: adv-{case}-{size}\n---\n\n"
+        f"# Adversarial {case}\n\n"
+        f"## Section 4: Super-Prompt\n\n```markdown\n{body}\n```\n"
+    )
+
+def write_adversarial(directory: Path, sizes: List[int]) -> List[Path]:
+    """Write one adversarial document per (case, size)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for case in ADVERSARIAL_UNITS:
+        for size in sizes:
+            path = directory / f"adversarial-{case}-{size}.md"
+            with open(path, 'w', encoding='utf-8', newline='\n') as f:
+                f.write(adversarial_document(case, size))
+            paths.append(path)
+    return paths
+
+def corpus_filename(index: int) -> str:
+    """File name for document index (sorts in generation order)."""
+    return f"insights-{index:07d}.md"
+
+def write_corpus(directory: Path, count: int, seed: int = 0) -> List[Path]:
+    """Write count documents into directory, reusing an identical existing corpus.
+
+    A manifest records (version, seed, count); a directory whose manifest
+    already matches is not regenerated.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = directory / MANIFEST_FILE
+    manifest = {'version': CORPUS_VERSION, 'seed': seed, 'count': count}
+    paths = [directory / corpus_filename(i) for i in range(count)]
+    
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            if json.load(f) == manifest:
+                return paths
+    except (OSError, ValueError):
+        pass
+    
+    for old in directory.glob('insights-*.md'):
+        old.unlink()
+    for index, path in enumerate(paths):
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(generate_document(index, seed))
+    
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    return paths
@@ -0,0 +1,37 @@
+"""
+Minimal template engine for generated Arsenal documents.
+Templates are versioned files with {{name}} placeholders, compiled once and
+rendered with a single str.format_map call per record.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+from insights_core import PLACEHOLDER_PATTERN
+
+# Configuration
+TEMPLATE_DIR = Path(__file__).with_name('templates')
+
+def compile_template(text: str) -> Callable[[Dict], str]:
+    """Compile {{name}} placeholders into a reusable render function.
+
+    Literal braces are escaped so the whole layout becomes one format
+    string; rendering raises KeyError for a missing placeholder value.
+    """
+    pieces = PLACEHOLDER_PATTERN.split(text)
+    format_string = ''.join(
+        piece.replace('{', '{{').replace('}', '}}') if i % 2 == 0 else '{' + piece + '}'
+        for i, piece in enumerate(pieces)
+    )
+    return format_string.format_map
+
+@lru_cache(maxsize=None)
+def load_template(name: str) -> Callable[[Dict], str]:
+    """Load and compile a template file such as 'prompt.v1.md' (cached)."""
+    with open(TEMPLATE_DIR / name, 'r', encoding='utf-8') as f:
+        return compile_template(f.read())
+
+def render_batch(template: Callable[[Dict], str], contexts: Iterable[Dict]) -> List[str]:
+    """Render many records with one compiled template."""
+    return [template(context) for context in contexts]
@@ -3,16 +3,20 @@
 Update all Arsenal READMEs with ecosystem links
 """
 
-import re
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 
-# Repository paths
-REPOS = {
-    'ai-rules-arsenal': r'C:\Users\theca\CascadeProjects\ai-rules-arsenal',
-    'ai-workflows-arsenal': r'C:\Users\theca\CascadeProjects\ai-workflows-arsenal',
-    'ai-scripts-arsenal': r'C:\Users\theca\CascadeProjects\ai-scripts-arsenal',
-}
+from arsenal_repos import REPOS_CONFIG_FILE, load_repos_config, readme_repos
+from insights_core import ECOSYSTEM_SECTION_PATTERN, LICENSE_SECTION_PATTERN
+from output_writer import OutputWriter
+
+# Repositories updated at once
+MAX_WORKERS = 8
+
+output_writer = OutputWriter()
 
 ECOSYSTEM_SECTION = """
 ---
@@ -48,15 +52,23 @@ arsenal install all
 **See [Arsenal Integration Hub](https://github.com/ChrisTansey007/arsenal-integration-hub) for complete guides!**
 """
 
-def update_readme(repo_name: str, repo_path: str):
-    """Update README for a specific repository."""
-    print(f"\n📝 Updating {repo_name}...")
-    
+def load_repos(path: Path = REPOS_CONFIG_FILE) -> Dict[str, Dict]:
+    """Load the repositories to update (those with a marker): {name: {'path': ..., 'marker': ...}}."""
+    return readme_repos(load_repos_config(path))
+
+def update_readme(repo_name: str, repo_path: str, marker: Optional[str] = None) -> Dict:
+    """Update README for a specific repository.
+
+    Returns a result with status 'updated', 'unchanged' or 'missing' and the
+    progress messages, so concurrent updates can be reported one repo at a time.
+    """
     readme_path = Path(repo_path) / 'README.md'
+    result = {'repo': repo_name, 'messages': []}
     
     if not readme_path.exists():
-        print(f"   ⚠️  README.md not found at {readme_path}")
-        return False
+        result['status'] = 'missing'
+        result['messages'].append(f"⚠️  README.md not found at {readme_path}")
+        return result
     
     # Read current content
     with open(readme_path, 'r', encoding='utf-8') as f:
@@ -69,60 +81,84 @@ def update_readme(repo_name: str, repo_path: str):
         'scripts_marker': ''
     }
     
-    if repo_name == 'ai-rules-arsenal':
-        markers['rules_marker'] = ' ← YOU ARE HERE'
-    elif repo_name == 'ai-workflows-arsenal':
-        markers['workflows_marker'] = ' ← YOU ARE HERE'
-    elif repo_name == 'ai-scripts-arsenal':
-        markers['scripts_marker'] = ' ← YOU ARE HERE'
+    if marker:
+        markers[marker] = ' ← YOU ARE HERE'
     
     ecosystem_text = ECOSYSTEM_SECTION.format(**markers)
     
     # Check if ecosystem section already exists
     if '## 🔗 Arsenal Ecosystem' in content:
-        print(f"   ℹ️  Ecosystem section already exists, replacing...")
+        result['messages'].append("ℹ️  Ecosystem section already exists, replacing...")
         # Replace existing section (find everything between the section and next ## or end)
-        pattern = r'---\s*\n\n## 🔗 Arsenal Ecosystem.*?(?=\n---\n\n##|\Z)'
-        content = re.sub(pattern, ecosystem_text.strip(), content, flags=re.DOTALL)
+        content = ECOSYSTEM_SECTION_PATTERN.sub(ecosystem_text.strip(), content)
     else:
-        print(f"   ➕ Adding new ecosystem section...")
+        result['messages'].append("➕ Adding new ecosystem section...")
         # Find a good place to insert (before ## License or at the end)
         if '## License' in content or '## 📝 License' in content:
             # Insert before license
-            content = re.sub(
-                r'(---\s*\n\n## (?:📝 )?License)',
-                ecosystem_text + r'\n\n\1',
-                content
-            )
+            content = LICENSE_SECTION_PATTERN.sub(ecosystem_text + r'\n\n\1', content)
         else:
             # Append at end
             content += '\n' + ecosystem_text
     
-    # Write back
-    with open(readme_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    print(f"   ✅ Updated {repo_name}/README.md")
-    return True
+    # Write back (atomically, skipped if nothing changed)
+    if output_writer.write_text(readme_path, content):
+        result['status'] = 'updated'
+        result['messages'].append(f"✅ Updated {repo_name}/README.md")
+    else:
+        result['status'] = 'unchanged'
+        result['messages'].append(f"⏭️  {repo_name}/README.md already up to date")
+    return result
+
+def timed_update(repo_name: str, repo: Dict) -> Dict:
+    """Run update_readme, timing it and containing any failure to this repo."""
+    start = time.perf_counter()
+    try:
+        result = update_readme(repo_name, repo['path'], repo.get('marker'))
+    except Exception as e:
+        result = {'repo': repo_name, 'status': 'failed', 'messages': [f"❌ Error: {e}"]}
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def update_all(repos: Dict[str, Dict], workers: int = MAX_WORKERS) -> List[Dict]:
+    """Update every repository concurrently; results come back in config order."""
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(repos)))) as pool:
+        return list(pool.map(timed_update, repos, repos.values()))
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Add or refresh the Arsenal ecosystem section in each repository README.")
+    parser.add_argument('--config', default=REPOS_CONFIG_FILE, metavar='PATH',
+                        help="JSON file listing the repositories (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, metavar='N',
+                        help="update up to N repositories at once (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     """Update all repository READMEs."""
+    args = parse_args(argv)
+    repos = load_repos(Path(args.config))
+    
     print("🔗 UPDATING ARSENAL ECOSYSTEM LINKS")
     print("=" * 70)
     
-    success_count = 0
+    results = update_all(repos, args.workers)
+    for result in results:
+        print(f"\n📝 {result['repo']} ({result['status']}, {result['seconds'] * 1000:.0f} ms)")
+        for message in result['messages']:
+            print(f"   {message}")
     
-    for repo_name, repo_path in REPOS.items():
-        if update_readme(repo_name, repo_path):
-            success_count += 1
+    success_count = sum(1 for r in results if r['status'] in ('updated', 'unchanged'))
+    changed = [r['repo'] for r in results if r['status'] == 'updated']
     
     print(f"\n{'=' * 70}")
-    print(f"✅ Updated {success_count}/{len(REPOS)} repositories")
+    print(f"✅ Updated {success_count}/{len(repos)} repositories")
+    print(f"💾 {output_writer.summary()}")
     print(f"\n📋 Next steps:")
     print(f"1. Review changes in each repository")
     print(f"2. Commit and push:")
-    for repo_name in REPOS.keys():
-        print(f"   cd {REPOS[repo_name]}")
+    for repo_name in changed:
+        print(f"   cd {repos[repo_name]['path']}")
         print(f"   git add README.md")
         print(f"   git commit -m 'docs: add ecosystem section with new repos'")
         print(f"   git push origin main")
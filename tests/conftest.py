@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The pipeline modules live next to the scripts, which are not a package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
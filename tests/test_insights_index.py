@@ -0,0 +1,24 @@
+from insights_index import build_index, find_files, open_index
+
+def record(filename, tags):
+    return {'filename': filename, 'extraction_success': True, 'title': filename, 'tags': tags}
+
+def indexed_tags(db_path):
+    conn = open_index(db_path)
+    try:
+        return sorted(tag for (tag,) in conn.execute("SELECT tag FROM tags"))
+    finally:
+        conn.close()
+
+def test_legacy_string_tags_are_indexed_whole(tmp_path):
+    db_path = tmp_path / 'index.sqlite3'
+    counts = build_index([record('legacy.md', '[research, "deep dive"]'),
+                          record('current.md', ['research'])], db_path)
+    assert counts['tags'] == 3
+    assert indexed_tags(db_path) == ['deep dive', 'research', 'research']
+    
+    conn = open_index(db_path)
+    try:
+        assert [row['filename'] for row in find_files(conn, tag='deep dive')] == ['legacy.md']
+    finally:
+        conn.close()
@@ -0,0 +1,45 @@
+from pattern_index import PatternIndex
+
+FILE_A = [
+    {'category': 'Verify', 'pattern': 'cite a source for every claim'},
+    {'category': None, 'pattern': 'Rank ideas by value and effort'},
+]
+FILE_B = [
+    {'category': None, 'pattern': 'Cite a source for  every claim'},
+    {'category': 'Prioritize', 'pattern': 'rank ideas by value and effort'},
+    {'category': None, 'pattern': 'Summarize the thread in three bullets'},
+]
+
+def build(*files):
+    index = PatternIndex()
+    for filename, quick_wins in files:
+        index.merge_file(filename, quick_wins)
+    index.refresh_wordings()
+    return index
+
+def test_removing_a_file_matches_never_merging_it():
+    index = build(('a.md', FILE_A), ('b.md', FILE_B))
+    index.remove_file('a.md')
+    index.refresh_wordings()
+    only_b = build(('b.md', FILE_B))
+    assert index.patterns == only_b.patterns
+    assert index.files == only_b.files
+
+def test_wording_does_not_depend_on_merge_order():
+    assert build(('a.md', FILE_A), ('b.md', FILE_B)).patterns == build(('b.md', FILE_B), ('a.md', FILE_A)).patterns
+
+def test_categorized_wording_is_preferred():
+    patterns = {p['pattern']: p['category'] for p in build(('a.md', FILE_A), ('b.md', FILE_B)).unique_patterns()}
+    assert patterns['cite a source for every claim'] == 'Verify'
+    assert patterns['rank ideas by value and effort'] == 'Prioritize'
+
+def test_remerging_an_edited_file_replaces_its_wording():
+    index = build(('a.md', FILE_A))
+    index.merge_file('a.md', [{'category': None, 'pattern': 'Cite a source for every claim'}])
+    assert index.unique_patterns() == build(('a.md', [{'category': None, 'pattern': 'Cite a source for every claim'}])).unique_patterns()
+
+def test_prune_keeps_only_listed_files():
+    index = build(('a.md', FILE_A), ('b.md', FILE_B))
+    assert index.prune({'b.md'}) == ['a.md']
+    index.refresh_wordings()
+    assert index.patterns == build(('b.md', FILE_B)).patterns